@@ -179,6 +179,7 @@ class ImportSCS(bpy.types.Operator, ImportHelper):
         col.row().prop(scs_globals, "import_scale")
         col.row().separator()
         col.row().prop(scs_globals, "import_preserve_path_for_export")
+        col.row().prop(scs_globals, "import_use_parsed_cache")
         col.row().separator()
         col.row().prop(scs_globals, "import_pim_file", toggle=True, icon="FILE_TICK" if scs_globals.import_pim_file else "X")
         if scs_globals.import_pim_file:
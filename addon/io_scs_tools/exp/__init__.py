@@ -20,11 +20,14 @@
 
 import bpy
 import os
+import time
+from io_scs_tools.exp import manifest as _export_manifest
 from io_scs_tools.exp import pia
 from io_scs_tools.exp import pic
 from io_scs_tools.exp import pip
 from io_scs_tools.exp import pis
 from io_scs_tools.exp import pix
+from io_scs_tools.internals.containers import pix as _pix_container
 from io_scs_tools.utils import name as _name_utils
 from io_scs_tools.utils import object as _object_utils
 from io_scs_tools.utils import path as _path_utils
@@ -32,6 +35,27 @@ from io_scs_tools.utils import get_scs_globals as _get_scs_globals
 from io_scs_tools.utils.printout import lprint
 
 
+def _update_game_objects_scenes(game_objects_dict):
+    """Tags root objects of given game objects for update and updates all the scenes.
+    All scenes are updated on purpose, as game objects can depend on objects from other scenes
+    (e.g. through groups or dupli instances), which would be left outdated otherwise.
+    Each scene is updated only once, as exporters don't change any transforms,
+    so scenes don't need to be updated again between exports of game objects.
+
+    :param game_objects_dict: game objects dictionary of root objects and their children objects
+    :type game_objects_dict: dict[bpy.types.Object, list[bpy.types.Object]]
+    """
+    for root_object in game_objects_dict:
+        root_object.location = root_object.location
+
+    update_start_time = time.time()
+    for scene in bpy.data.scenes:
+        scene.update()
+
+    lprint("D Scene update called once for each of %s scene(s), taking %.3f seconds.",
+           (len(bpy.data.scenes), time.time() - update_start_time))
+
+
 def batch_export(operator_instance, init_obj_list, name_suffix="", menu_filepath=None):
     """This function calls other sorting functions and depending on the resulting output
     dictionary it exports all available 'SCS Game Objects' into specified locations.
@@ -58,67 +82,89 @@ def batch_export(operator_instance, init_obj_list, name_suffix="", menu_filepath
 
         global_filepath = _path_utils.get_global_export_path()
 
-        for root_object in game_objects_dict:
-
-            if not _name_utils.is_valid_scs_root_object_name(root_object.name):
-                lprint("E Rejecting Game Object with invalid SCS Root Object name: %r.\n\t   "
-                       "Only a-z, A-Z, 0-9 and \"._-\" characters can be used." % root_object.name)
-                scs_game_objects_rejected.append("> \"" + root_object.name + "\"")
-                continue
-
-            game_object_list = game_objects_dict[root_object]
-            if len(game_object_list) == 0:
-                lprint("E Rejecting empty Game Object with SCS Root Object name: %r\n\t   " +
-                       "Game Object has to have at least one mesh object or model locator!",
-                       (root_object.name,))
-                scs_game_objects_rejected.append("> \"" + root_object.name + "\"")
-                continue
-
-            # update root object location to invoke update tagging on it and
-            # then update scene to make sure all children objects will have all transforms up to date
-            # NOTE: needed because Blender doesn't update objects on invisible layers on it's own
-            root_object.location = root_object.location
-            for scene in bpy.data.scenes:
-                scene.update()
-
-            # GET CUSTOM FILE PATH
-            custom_filepath = _path_utils.get_custom_scs_root_export_path(root_object)
-
-            # MAKE FINAL FILEPATH
-            if menu_filepath:
-                filepath = _path_utils.readable_norm(menu_filepath)
-                filepath_message = "Export path selected in file browser:\n\t   \"" + filepath + "\""
-            elif custom_filepath:
-                filepath = _path_utils.readable_norm(custom_filepath)
-                filepath_message = "Custom export path used for \"" + root_object.name + "\" is:\n\t   \"" + filepath + "\""
-            else:
-                filepath = _path_utils.readable_norm(global_filepath)
-                filepath_message = "Default export path used for \"" + root_object.name + "\":\n\t   \"" + filepath + "\""
-
-            scs_project_path = _path_utils.readable_norm(_get_scs_globals().scs_project_path)
-            if os.path.isdir(filepath) and _path_utils.startswith(filepath, scs_project_path) and scs_project_path != "":
-
-                # EXPORT ENTRY POINT
-                export_success = pix.export(filepath, name_suffix, root_object, game_object_list)
-
-                if export_success:
-                    scs_game_objects_exported.append("> \"" + root_object.name + "\" exported to: '" + filepath + "'")
-                else:
+        # update location of root objects to invoke update tagging on them and
+        # then update all scenes to make sure all children objects will have all transforms up to date
+        # NOTE: needed because Blender doesn't update objects on invisible layers on it's own
+        _update_game_objects_scenes(game_objects_dict)
+
+        # on incremental export writing of files is deferred until whole game object is exported, so export manifest
+        # can skip writing of unchanged game objects; files are written right after each game object,
+        # so data of only one is kept in memory. Otherwise files are written immediately by exporters.
+        write_results = []
+        write_time = 0.0
+        if _get_scs_globals().export_incremental:
+            _pix_container.begin_deferred_writes()
+        try:
+            for root_object in game_objects_dict:
+
+                if not _name_utils.is_valid_scs_root_object_name(root_object.name):
+                    lprint("E Rejecting Game Object with invalid SCS Root Object name: %r.\n\t   "
+                           "Only a-z, A-Z, 0-9 and \"._-\" characters can be used." % root_object.name)
                     scs_game_objects_rejected.append("> \"" + root_object.name + "\"")
+                    continue
+
+                game_object_list = game_objects_dict[root_object]
+                if len(game_object_list) == 0:
+                    lprint("E Rejecting empty Game Object with SCS Root Object name: %r\n\t   " +
+                           "Game Object has to have at least one mesh object or model locator!",
+                           (root_object.name,))
+                    scs_game_objects_rejected.append("> \"" + root_object.name + "\"")
+                    continue
+
+                # GET CUSTOM FILE PATH
+                custom_filepath = _path_utils.get_custom_scs_root_export_path(root_object)
+
+                # MAKE FINAL FILEPATH
+                if menu_filepath:
+                    filepath = _path_utils.readable_norm(menu_filepath)
+                    filepath_message = "Export path selected in file browser:\n\t   \"" + filepath + "\""
+                elif custom_filepath:
+                    filepath = _path_utils.readable_norm(custom_filepath)
+                    filepath_message = "Custom export path used for \"" + root_object.name + "\" is:\n\t   \"" + filepath + "\""
+                else:
+                    filepath = _path_utils.readable_norm(global_filepath)
+                    filepath_message = "Default export path used for \"" + root_object.name + "\":\n\t   \"" + filepath + "\""
+
+                scs_project_path = _path_utils.readable_norm(_get_scs_globals().scs_project_path)
+                if os.path.isdir(filepath) and _path_utils.startswith(filepath, scs_project_path) and scs_project_path != "":
+
+                    # EXPORT ENTRY POINT
+                    export_success = pix.export(filepath, name_suffix, root_object, game_object_list)
+
+                    write_start_time = time.time()
+                    root_write_results = _pix_container.write_deferred_writes()
+                    write_time += time.time() - write_start_time
+                    write_results.extend(root_write_results)
+
+                    if export_success and all(write_result[1] for write_result in root_write_results):
+                        scs_game_objects_exported.append("> \"" + root_object.name + "\" exported to: '" + filepath + "'")
+                    else:
+                        scs_game_objects_rejected.append("> \"" + root_object.name + "\"")
 
-            else:
-                if filepath:
-                    message = (
-                        "No valid export path found!\n\t   " +
-                        "Export path does not exists or it's not inside SCS Project Base Path.\n\t   " +
-                        "SCS Project Base Path:\n\t   \"" + scs_project_path + "\"\n\t   " +
-                        filepath_message
-                    )
                 else:
-                    message = "No valid export path found! Please check 'SCS Project Base Path' first."
-                lprint('E ' + message)
-                operator_instance.report({'ERROR'}, message.replace("\t", "").replace("   ", ""))
-                return {'CANCELLED'}
+                    if filepath:
+                        message = (
+                            "No valid export path found!\n\t   " +
+                            "Export path does not exists or it's not inside SCS Project Base Path.\n\t   " +
+                            "SCS Project Base Path:\n\t   \"" + scs_project_path + "\"\n\t   " +
+                            filepath_message
+                        )
+                    else:
+                        message = "No valid export path found! Please check 'SCS Project Base Path' first."
+                    lprint('E ' + message)
+                    operator_instance.report({'ERROR'}, message.replace("\t", "").replace("   ", ""))
+                    return {'CANCELLED'}
+
+        finally:
+
+            write_start_time = time.time()
+            write_results.extend(_pix_container.end_deferred_writes())
+            write_time += time.time() - write_start_time
+            if write_results:
+                lprint("I Writing of %s deferred file(s) completed in %.3f seconds.", (len(write_results), write_time))
+
+            # update export manifests with written files of incrementally exported game objects
+            _export_manifest.finish(write_results)
 
         if not lprint("\nI Export procces completed, summaries are printed below!", report_errors=True, report_warnings=True):
             operator_instance.report({'INFO'}, "Export successfully completed, exported %s game object(s)!" % len(scs_game_objects_exported))
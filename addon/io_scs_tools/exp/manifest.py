@@ -0,0 +1,233 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Copyright (C) 2017: SCS Software
+
+import json
+import os
+import struct
+from hashlib import sha1
+from mathutils import Color, Euler, Matrix, Quaternion, Vector
+from io_scs_tools.internals.containers import pix as _pix_container
+from io_scs_tools.internals.structure import SectionData as _SectionData
+from io_scs_tools.internals.structure import StreamData as _StreamData
+from io_scs_tools.utils.printout import lprint
+
+MANIFEST_FILENAME = ".scs_export_manifest.json"
+"""Name of the export manifest file, written in export directory of SCS Root Objects."""
+
+_MANIFEST_VERSION = 2
+"""Version of manifest data. Increase it whenever structure of manifest or hashing of data changes, to invalidate old manifests."""
+
+_FLOAT_STRUCT = struct.Struct(">d")
+"""Structure for hashing floats with full precision."""
+
+_FLOAT_TYPES = frozenset((float,))
+"""Types of sequence items which can be hashed at once."""
+
+_SEQUENCE_TYPES = {list: b"[", tuple: b"(", Vector: b"V", Color: b"C", Euler: b"E", Quaternion: b"Q", Matrix: b"M"}
+"""Sequence types which items are hashed one by one, with their tags in hashed data."""
+
+_manifests = {}
+"""Loaded manifests per export directory path."""
+
+_pending_roots = []
+"""Exported roots waiting for their files to be written, as tuples of (export directory path, root name, hash, file paths)."""
+
+_skipped_roots = []
+"""Skipped roots as tuples of (root name, seconds previously spent for writing their files)."""
+
+
+def __update_hash(hasher, value):
+    """Updates hasher with canonical binary form of given container or it's part.
+    Each value is encoded together with it's exact type, so values which would be written differently
+    are never encoded the same, no matter how their "repr" looks like.
+
+    :return: True if value could be hashed; False if value is of unknown type or it's not repeatable,
+             eg. lazy iterable, which would be consumed
+    :rtype: bool
+    """
+    value_type = type(value)
+
+    if value_type is float:
+        hasher.update(b"f" + _FLOAT_STRUCT.pack(value))
+    elif value_type is int:
+        hasher.update(b"i" + str(value).encode("ascii") + b";")
+    elif value_type is str:
+        encoded_value = value.encode("utf8")
+        hasher.update(b"s" + str(len(encoded_value)).encode("ascii") + b";" + encoded_value)
+    elif value is None:
+        hasher.update(b"n")
+    elif value_type is bool:
+        hasher.update(b"T" if value else b"F")
+    elif value_type is _StreamData:
+        hasher.update(b"S")
+        if value.values is not None:
+            hasher.update((value.values.typecode + str(value.row_size) + ";").encode("ascii"))
+            hasher.update(value.values.tobytes())
+    elif value_type is _SectionData:
+        hasher.update(b"{")
+        for part in (value.type, value.props, value.data, value.sections):
+            if not __update_hash(hasher, part):
+                return False
+        hasher.update(b"}")
+    elif value_type in _SEQUENCE_TYPES:
+        hasher.update(_SEQUENCE_TYPES[value_type] + str(len(value)).encode("ascii") + b";")
+        if _FLOAT_TYPES.issuperset(map(type, value)):  # pack rows of floats at once
+            hasher.update(struct.pack(">%id" % len(value), *value))
+        else:
+            for item in value:
+                if not __update_hash(hasher, item):
+                    return False
+    else:
+        return False
+
+    return True
+
+
+def __get_files_state(filepaths):
+    """Gets state of given files as stored in the manifest.
+
+    :return: dictionary of (size, modification time) per file path; None if any of the files doesn't exist
+    :rtype: dict[str, list[int]] | None
+    """
+    files_state = {}
+    for filepath in filepaths:
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+
+        files_state[filepath] = [stat.st_size, stat.st_mtime_ns]
+
+    return files_state
+
+
+def __get_manifest(dirpath):
+    """Gets loaded manifest of given export directory.
+
+    :return: manifest roots entries per root name
+    :rtype: dict[str, dict]
+    """
+    if dirpath not in _manifests:
+
+        roots = {}
+        try:
+            with open(os.path.join(dirpath, MANIFEST_FILENAME), mode="r", encoding="utf8") as manifest_file:
+                manifest = json.load(manifest_file)
+
+            if manifest.get("version") == _MANIFEST_VERSION:
+                roots = manifest["roots"]
+        except FileNotFoundError:
+            pass
+        except Exception as e:  # any problem with manifest means it's unusable, so everything will be exported again
+            lprint("D Ignoring invalid export manifest in %r: %s", (dirpath, e))
+
+        _manifests[dirpath] = roots
+
+    return _manifests[dirpath]
+
+
+def skip_unchanged_root(dirpath, root_name, deferred_writes_start):
+    """Checks deferred writes of exported root against export manifest. If data of the root and it's
+    already written files didn't change since the last export, writes are canceled.
+    Otherwise root is remembered, so it's manifest entry is updated once files are written and "finish" is called.
+    NOTE: it's called once root data is already gathered, as hash has to cover everything exporters read from Blender,
+    so unchanged root still takes time of gathering it's data; only formatting and writing of it's files is skipped.
+
+    :param dirpath: export directory path of the root, where manifest is stored
+    :type dirpath: str
+    :param root_name: name of the SCS Root Object
+    :type root_name: str
+    :param deferred_writes_start: index of the first deferred write belonging to this root
+    :type deferred_writes_start: int
+    :return: True if writing of root files was skipped; False otherwise
+    :rtype: bool
+    """
+    deferred_writes = _pix_container.get_deferred_writes(deferred_writes_start)
+    if len(deferred_writes) == 0:
+        return False
+
+    hasher = sha1()
+    for container, filepath in deferred_writes:
+        if not __update_hash(hasher, filepath) or not __update_hash(hasher, container):
+            lprint("D Data of %r can't be hashed, incremental export not possible.", (root_name,))
+            return False
+
+    root_hash = hasher.hexdigest()
+    filepaths = [filepath for container, filepath in deferred_writes]
+
+    root_entry = __get_manifest(dirpath).get(root_name)
+    if root_entry and root_entry["hash"] == root_hash:
+
+        files_state = __get_files_state(filepaths)
+        if files_state is not None and all(files_state[filepath] == root_entry["files"][filepath][:2] for filepath in filepaths):
+
+            _pix_container.cancel_deferred_writes(deferred_writes_start)
+
+            saved_time = sum(root_entry["files"][filepath][2] for filepath in filepaths)
+            _skipped_roots.append((root_name, saved_time))
+
+            lprint("I Data and files of %r didn't change since last export, skipping writing of %s file(s).",
+                   (root_name, len(filepaths)))
+            return True
+
+    _pending_roots.append((dirpath, root_name, root_hash, filepaths))
+    return False
+
+
+def finish(write_results):
+    """Updates and saves manifests of written roots and reports skipped vs written roots.
+
+    :param write_results: write results of deferred writes as tuples of (filepath, is written, seconds spent for writing)
+    :type write_results: list[(str, bool, float)]
+    """
+    write_results = {filepath: (is_written, write_time) for filepath, is_written, write_time in write_results}
+
+    changed_dirpaths = set()
+    written_roots_count = 0
+    for dirpath, root_name, root_hash, filepaths in _pending_roots:
+
+        manifest = __get_manifest(dirpath)
+        changed_dirpaths.add(dirpath)
+
+        files_state = __get_files_state(filepaths)
+        if files_state is None or not all(write_results.get(filepath, (False,))[0] for filepath in filepaths):
+            manifest.pop(root_name, None)
+            continue
+
+        for filepath in filepaths:
+            files_state[filepath].append(write_results[filepath][1])
+
+        manifest[root_name] = {"hash": root_hash, "files": files_state}
+        written_roots_count += 1
+
+    for dirpath in changed_dirpaths:
+        try:
+            with open(os.path.join(dirpath, MANIFEST_FILENAME), mode="w", encoding="utf8") as manifest_file:
+                json.dump({"version": _MANIFEST_VERSION, "roots": _manifests[dirpath]}, manifest_file, indent=1, sort_keys=True)
+        except OSError as e:
+            lprint("W Export manifest in %r couldn't be saved: %s", (dirpath, e))
+
+    if _pending_roots or _skipped_roots:
+        lprint("I Incremental export: %s game object(s) written, %s skipped as unchanged, saved approx. %.3f seconds of writing.",
+               (written_roots_count, len(_skipped_roots), sum(saved_time for root_name, saved_time in _skipped_roots)))
+
+    _manifests.clear()
+    del _pending_roots[:]
+    del _skipped_roots[:]
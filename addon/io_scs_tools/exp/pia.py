@@ -341,4 +341,4 @@ def export(scs_root_obj, armature, scs_animation, dirpath, name_suffix, skeleton
     filepath = os.path.join(dirpath, scs_animation.name + ".pia" + name_suffix)
 
     # print("************************************")
-    return _pix_container.write_data_to_file(pia_container, filepath, ind)
+    return _pix_container.write_data_to_file(pia_container, filepath, ind, deferrable=True)
@@ -302,7 +302,7 @@ def export(collision_locator_list, filepath, name_suffix, filename, used_parts):
     # FILE EXPORT
     ind = "    "
     pic_filepath = str(filepath + ".pic" + name_suffix)
-    result = _pix_container.write_data_to_file(pic_container, pic_filepath, ind)
+    result = _pix_container.write_data_to_file(pic_container, pic_filepath, ind, deferrable=True)
 
     # print("************************************")
     return result
@@ -20,6 +20,7 @@
 
 import os
 import collections
+import numpy
 from re import match
 from mathutils import Matrix, Vector
 from io_scs_tools.consts import Mesh as _MESH_consts
@@ -39,7 +40,6 @@ from io_scs_tools.utils import mesh as _mesh_utils
 from io_scs_tools.utils import name as _name_utils
 from io_scs_tools.utils import object as _object_utils
 from io_scs_tools.utils import get_scs_globals as _get_scs_globals
-from io_scs_tools.utils.convert import change_to_scs_uv_coordinates as _change_to_scs_uv_coordinates
 from io_scs_tools.utils.convert import get_scs_transformation_components as _get_scs_transformation_components
 from io_scs_tools.utils.convert import scs_to_blend_matrix as _scs_to_blend_matrix
 from io_scs_tools.utils.convert import hookup_name_to_hookup_id as _hookup_name_to_hookup_id
@@ -143,6 +143,35 @@ def execute(dirpath, name_suffix, root_object, armature_object, skeleton_filepat
 
         vert_groups = mesh_obj.vertex_groups
 
+        # terrain points node index for each vertex group index of terrain points vertex groups
+        vert_groups_tp_node_indices = {}
+        for vert_group_i, vert_group in enumerate(vert_groups):
+
+            # if vertex group name doesn't match prescribed one ignore this vertex group
+            if not match(_OP_consts.TerrainPoints.vg_name_regex, vert_group.name):
+                continue
+
+            # if node index is not in bounds ignore this vertex group
+            node_index = int(vert_group.name[-1])
+            if node_index >= _PL_consts.PREFAB_NODE_COUNT_MAX:
+                continue
+
+            vert_groups_tp_node_indices[vert_group_i] = node_index
+
+        # include state of this object part for each variant, used for terrain points;
+        # NOTE: variant index is donated by direct order of variants in inventory
+        # so export in PIT has to use the same order otherwise variant
+        # indices will be misplaced
+        tp_variants_part_included = []
+        for variant in root_object.scs_object_variant_inventory:
+            is_included = False
+            for variant_part in variant.parts:
+                if variant_part.name == mesh_obj.scs_props.scs_part and variant_part.include:
+                    is_included = True
+                    break
+
+            tp_variants_part_included.append(is_included)
+
         # calculate faces flip state from all ancestors of current object
         scale_sign = 1
         parent = mesh_obj
@@ -189,11 +218,82 @@ def execute(dirpath, name_suffix, root_object, armature_object, skeleton_filepat
         faces_mapping = _mesh_utils.bm_prepare_mesh_for_export(mesh, mesh_transf_mat, triangulate=True)
         mesh_for_normals.calc_normals_split()
 
+        # gather mesh data at once instead of accessing it through Blender API for each loop
+        mesh_positions = _mesh_utils.get_vertices_positions(mesh, pos_transf_mat)
+        mesh_loops_vert_indices = _mesh_utils.get_loops_vertex_indices(mesh)
+
+        # map each loop to the normal of matching loop from mesh for normals,
+        # matched by vertex index as triangle will for sure have three unique vertices
+        normals_loops_normals = _mesh_utils.get_loops_normals(mesh_for_normals)
+        mesh_loops_normals = []  # transformed normals indexed by loop index; None where normal couldn't be found
+        for normals_loop_i in _mesh_utils.get_matching_loops(mesh, mesh_for_normals, faces_mapping).tolist():
+            if normals_loop_i < 0:
+                mesh_loops_normals.append(None)
+            else:
+                normal = nor_transf_mat * Vector(normals_loops_normals[normals_loop_i])
+                mesh_loops_normals.append(tuple(normal.normalized()))
+
+        mesh_loops_uvs = {}  # uvs in SCS coordinates per uv layer name, gathered only for uv layers used by materials
+        mesh_loops_uvs_hash = {}  # quantized uvs for vertex hashes per uv layer name
+
+        # vertex colors, where missing RGB or A component is exported as 1.0
+        vcol_multi = mesh_obj.data.scs_props.vertex_color_multiplier
+        mesh_loops_rgba = numpy.ones((len(mesh.loops), 4))
+        if _MESH_consts.default_vcol in mesh.vertex_colors:
+            mesh_loops_rgba[:, :3] = _mesh_utils.get_loops_vertex_colors(mesh, _MESH_consts.default_vcol) * 2 * vcol_multi
+        if _MESH_consts.default_vcol + _MESH_consts.vcol_a_suffix in mesh.vertex_colors:
+            alpha_colors = _mesh_utils.get_loops_vertex_colors(mesh, _MESH_consts.default_vcol + _MESH_consts.vcol_a_suffix)
+            mesh_loops_rgba[:, 3] = (alpha_colors[:, 0] + alpha_colors[:, 1] + alpha_colors[:, 2]) / 3.0 * 2 * vcol_multi  # take avg of colors
+
+        quantized_rgba = Piece.quantize_values(mesh_loops_rgba.ravel())
+        mesh_loops_rgba_hash = [tuple(quantized_rgba[i:i + 4]) for i in range(0, len(quantized_rgba), 4)]
+        mesh_loops_rgba = [tuple(rgba) for rgba in mesh_loops_rgba.tolist()]
+
         missing_uv_layers = {}  # stores missing uvs specified by materials of this object
-        missing_vcolor = False  # indicates if object is missing vertex color layer
-        missing_vcolor_a = False  # indicates if object is missing vertex color alpha layer
+        # indicates if object is missing vertex color layer
+        missing_vcolor = len(mesh.polygons) > 0 and _MESH_consts.default_vcol not in mesh.vertex_colors
+        # indicates if object is missing vertex color alpha layer
+        missing_vcolor_a = len(mesh.polygons) > 0 and _MESH_consts.default_vcol + _MESH_consts.vcol_a_suffix not in mesh.vertex_colors
         missing_skinned_verts = set()  # indicates if object is having only partial skin, which is not allowed in our models
         has_unnormalized_skin = False  # indicates if object has vertices which bones weight sum is smaller then one
+
+        # terrain points node indices per vertex index, only for vertices in terrain points vertex groups;
+        # NOTE: if current object doesn't have vertex group found in mesh data, then that group is ignored.
+        # This can happen if multiple objects are using same mesh and some of them have vertex groups, but others not.
+        mesh_verts_tp_node_indices = {}
+        if vert_groups_tp_node_indices:
+            for vert in mesh.vertices:
+                node_indices = [vert_groups_tp_node_indices[group.group] for group in vert.groups if group.group in vert_groups_tp_node_indices]
+                if node_indices:
+                    mesh_verts_tp_node_indices[vert.index] = node_indices
+
+        # skin weights table, bone weights and their sum per vertex index, so vertex groups are walked only once per vertex
+        mesh_verts_skin = []
+        mesh_verts_skin_entries = {}  # skin entries stored in skin stream per vertex index, so loops of the same vertex only add clones
+        if is_skin_used:
+
+            # bone index for each vertex group of this object; -1 for vertex groups not representing any bone from our armature
+            vert_groups_bone_indices = [bones.get_bone_index(vert_group.name) for vert_group in vert_groups]
+
+            for vert in mesh.vertices:
+                bone_weights = {}
+                bone_weights_sum = 0
+                for v_group_entry in vert.groups:
+
+                    # ignore vertex groups from mesh data which current object doesn't have
+                    if v_group_entry.group >= len(vert_groups_bone_indices):
+                        continue
+
+                    bone_indx = vert_groups_bone_indices[v_group_entry.group]
+                    bone_weight = v_group_entry.weight
+
+                    # proceed only if bone exists in our armature
+                    if bone_indx != -1:
+                        bone_weights[bone_indx] = bone_weight
+                        bone_weights_sum += bone_weight
+
+                mesh_verts_skin.append((bone_weights, bone_weights_sum))
+
         last_tangents_uv_layer = None  # stores uv layer for which tangents were calculated, so tangents won't be calculated all over again
 
         for poly in mesh.polygons:
@@ -262,45 +362,31 @@ def execute(dirpath, name_suffix, root_object, armature_object, skeleton_filepat
             mesh_piece = mesh_pieces[piece_key]
             """:type: Piece"""
 
-            # get polygon loop indices for normals depending on mapped triangulated face
-            if poly.index in faces_mapping:
-                normals_poly_loop_indices = list(mesh_for_normals.polygons[faces_mapping[poly.index]].loop_indices)
-            else:
-                normals_poly_loop_indices = list(mesh_for_normals.polygons[poly.index].loop_indices)
-
             # vertex data
             triangle_pvert_indices = []  # storing vertex indices for this polygon triangle
             for loop_i in poly.loop_indices:
 
-                loop = mesh.loops[loop_i]
-                """:type: bpy.types.MeshLoop"""
-                vert_i = loop.vertex_index
+                vert_i = mesh_loops_vert_indices[loop_i]
 
                 # get data of current vertex
                 # 1. position -> mesh.vertices[loop.vertex_index].co
-                position = tuple(pos_transf_mat * mesh.vertices[vert_i].co)
-
-                # 2. normal -> mesh_for_normals.loops[loop_i].normal -> calc_normals_split() has to be called before
-                normal = (0, 0, 0)
-                for i, normals_poly_loop_i in enumerate(normals_poly_loop_indices):
-                    normal_loop = mesh_for_normals.loops[normals_poly_loop_i]
-
-                    # match by vertex index as triangle will for sure have three unique vertices
-                    if vert_i == normal_loop.vertex_index:
-                        normal = nor_transf_mat * normal_loop.normal
-                        normal = tuple(Vector(normal).normalized())
-                        del normals_poly_loop_indices[i]
-                        break
-                else:
+                position = mesh_positions[vert_i]
+
+                # 2. normal -> mesh_for_normals.loops[matching_loop_i].normal -> calc_normals_split() has to be called before
+                normal = mesh_loops_normals[loop_i]
+                if normal is None:
+                    normal = (0, 0, 0)
                     lprint("E Normals data gathering went wrong, expect corrupted mesh! Shouldn't happen...")
 
                 # 3. uvs -> uv_lay = mesh.uv_layers[0].data; uv_lay[loop_i].uv
                 uvs = []
                 uvs_aliases = []
+                uvs_hash = ()
                 tex_coord_alias_map = pim_materials[pim_mat_name].get_tex_coord_map()
                 if len(tex_coord_alias_map) < 1:  # no textures or none uses uv mapping in current material effect
                     uvs.append((0.0, 0.0))
                     uvs_aliases.append(["_TEXCOORD0"])
+                    uvs_hash = (0, 0)
 
                     # report missing mappings only on actual materials with textures using uv mappings
                     if material and pim_materials[pim_mat_name].uses_textures_with_uv():
@@ -315,6 +401,7 @@ def execute(dirpath, name_suffix, root_object, armature_object, skeleton_filepat
 
                         if uv_lay_name not in mesh.uv_layers:
                             uvs.append((0.0, 0.0))
+                            uvs_hash += (0, 0)
 
                             # properly report missing uv layers where name of uv layout is key and materials that misses it are values
                             if uv_lay_name not in missing_uv_layers:
@@ -323,8 +410,16 @@ def execute(dirpath, name_suffix, root_object, armature_object, skeleton_filepat
                             if pim_mat_name not in missing_uv_layers[uv_lay_name]:  # add material if not already there
                                 missing_uv_layers[uv_lay_name].append(pim_mat_name)
                         else:
-                            uv_lay = mesh.uv_layers[uv_lay_name]
-                            uvs.append(_change_to_scs_uv_coordinates(uv_lay.data[loop_i].uv))
+                            if uv_lay_name not in mesh_loops_uvs:
+                                loops_uvs = _mesh_utils.get_loops_uvs(mesh, uv_lay_name)
+                                loops_uvs[:, 1] = -loops_uvs[:, 1] + 1  # same conversion as in change_to_scs_uv_coordinates
+                                mesh_loops_uvs[uv_lay_name] = [tuple(uv) for uv in loops_uvs.tolist()]
+
+                                quantized_uvs = Piece.quantize_values(loops_uvs.ravel())
+                                mesh_loops_uvs_hash[uv_lay_name] = list(zip(quantized_uvs[0::2], quantized_uvs[1::2]))
+
+                            uvs.append(mesh_loops_uvs[uv_lay_name][loop_i])
+                            uvs_hash += mesh_loops_uvs_hash[uv_lay_name][loop_i]
 
                         aliases = []
                         for alias_index in tex_coord_alias_map[uv_lay_name]:
@@ -333,23 +428,12 @@ def execute(dirpath, name_suffix, root_object, armature_object, skeleton_filepat
                         uvs_aliases.append(aliases)
 
                 # 4. vcol -> vcol_lay = mesh.vertex_colors[0].data; vcol_lay[loop_i].color
-                vcol_multi = mesh_obj.data.scs_props.vertex_color_multiplier
-                if _MESH_consts.default_vcol not in mesh.vertex_colors:  # get RGB component of RGBA
-                    vcol = (1.0,) * 3
-                    missing_vcolor = True
-                else:
-                    color = mesh.vertex_colors[_MESH_consts.default_vcol].data[loop_i].color
-                    vcol = (color[0] * 2 * vcol_multi, color[1] * 2 * vcol_multi, color[2] * 2 * vcol_multi)
-
-                if _MESH_consts.default_vcol + _MESH_consts.vcol_a_suffix not in mesh.vertex_colors:  # get A component of RGBA
-                    vcol += (1.0,)
-                    missing_vcolor_a = True
-                else:
-                    alpha = mesh.vertex_colors[_MESH_consts.default_vcol + _MESH_consts.vcol_a_suffix].data[loop_i].color
-                    vcol += ((alpha[0] + alpha[1] + alpha[2]) / 3.0 * 2 * vcol_multi,)  # take avg of colors for alpha
+                vcol = mesh_loops_rgba[loop_i]
 
                 # 5. tangent -> loop.tangent; loop.bitangent_sign -> calc_tangents() has to be called before
                 if pim_materials[pim_mat_name].get_nmap_uv_name():  # calculate tangents only if needed
+                    loop = mesh.loops[loop_i]
+                    """:type: bpy.types.MeshLoop"""
                     tangent = tuple(tangent_transf_mat * loop.tangent)
                     tangent = tuple(Vector(tangent).normalized())
                     tangent = (tangent[0], tangent[1], tangent[2], loop.bitangent_sign)
@@ -360,73 +444,48 @@ def execute(dirpath, name_suffix, root_object, armature_object, skeleton_filepat
                 # Construct unique vertex index - donated by mesh and vertex index, as we may export more mesh objects into same piece,
                 # thus only vertex index wouldn't be unique representation.
                 unique_vert_i = str(mesh_i) + "|" + str(vert_i)
-                piece_vert_index = mesh_piece.add_vertex(unique_vert_i, position, normal, uvs, uvs_aliases, vcol, tangent)
+                vertex_hash = (unique_vert_i,) + uvs_hash + mesh_loops_rgba_hash[loop_i]
+                if tangent:
+                    vertex_hash += (Piece.quantize_value(tangent[0]), Piece.quantize_value(tangent[1]),
+                                    Piece.quantize_value(tangent[2]), Piece.quantize_value(tangent[3]))
+
+                piece_vert_index = mesh_piece.add_vertex(unique_vert_i, position, normal, uvs, uvs_aliases, vcol, tangent, vertex_hash)
 
                 # 7. Add vertex to triangle creation list
                 triangle_pvert_indices.append(piece_vert_index)
 
                 # 8. Get skinning data for vertex and save it to skin stream
                 if is_skin_used:
-                    bone_weights = {}
-                    bone_weights_sum = 0
-                    for v_group_entry in mesh.vertices[vert_i].groups:
-                        bone_indx = bones.get_bone_index(vert_groups[v_group_entry.group].name)
-                        bone_weight = v_group_entry.weight
-
-                        # proceed only if bone exists in our armature
-                        if bone_indx != -1:
-                            bone_weights[bone_indx] = bone_weight
-                            bone_weights_sum += bone_weight
-
-                    skin_entry = SkinStream.Entry(mesh_piece.get_index(), piece_vert_index, position, bone_weights, bone_weights_sum)
-                    skin_stream.add_entry(skin_entry)
-
-                    # report un-skinned vertices (no bones or zero sum weight) or badly skinned model
-                    if bone_weights_sum <= 0:
-                        missing_skinned_verts.add(vert_i)
-                    elif bone_weights_sum < 1:
-                        has_unnormalized_skin = True
-
-                # 9. Terrain Points: save vertex to terrain points storage, if present in correct vertex group
-                for group in mesh.vertices[vert_i].groups:
+                    if vert_i in mesh_verts_skin_entries:
+                        skin_stream.add_entry_clone(mesh_verts_skin_entries[vert_i], mesh_piece.get_index(), piece_vert_index)
+                    else:
+                        bone_weights, bone_weights_sum = mesh_verts_skin[vert_i]
 
-                    # if current object doesn't have vertex group found in mesh data, then ignore that group
-                    # This can happen if multiple objects are using same mesh and
-                    # some of them have vertex groups, but others not.
-                    if group.group >= len(mesh_obj.vertex_groups):
-                        continue
+                        skin_entry = SkinStream.Entry(mesh_piece.get_index(), piece_vert_index, position, bone_weights, bone_weights_sum)
+                        mesh_verts_skin_entries[vert_i] = skin_stream.add_entry(skin_entry)
 
-                    curr_vg_name = mesh_obj.vertex_groups[group.group].name
+                        # report un-skinned vertices (no bones or zero sum weight) or badly skinned model
+                        if bone_weights_sum <= 0:
+                            missing_skinned_verts.add(vert_i)
+                        elif bone_weights_sum < 1:
+                            has_unnormalized_skin = True
 
-                    # if vertex group name doesn't match prescribed one ignore this vertex group
-                    if not match(_OP_consts.TerrainPoints.vg_name_regex, curr_vg_name):
-                        continue
-
-                    # if node index is not in bounds ignore this vertex group
-                    node_index = int(curr_vg_name[-1])
-                    if node_index >= _PL_consts.PREFAB_NODE_COUNT_MAX:
-                        continue
+                # 9. Terrain Points: save vertex to terrain points storage, if present in correct vertex group
+                for node_index in mesh_verts_tp_node_indices.get(vert_i, ()):
 
                     # if no variants defined add globally (without variant block)
-                    if len(root_object.scs_object_variant_inventory) == 0:
+                    if len(tp_variants_part_included) == 0:
                         used_terrain_points.add(-1, node_index, position, normal)
                         continue
 
-                    # finally iterate variant parts entries to find where this part is included
+                    # finally iterate variants to find where this part is included
                     # and add terrain points to transitional structure
-                    #
-                    # NOTE: variant index is donated by direct order of variants in inventory
-                    # so export in PIT has to use the same order otherwise variant
-                    # indices will be misplaced
-                    for variant_i, variant in enumerate(root_object.scs_object_variant_inventory):
+                    for variant_i, is_included in enumerate(tp_variants_part_included):
 
                         used_terrain_points.ensure_entry(variant_i, node_index)
 
-                        for variant_part in variant.parts:
-                            if variant_part.name == mesh_obj.scs_props.scs_part and variant_part.include:
-
-                                used_terrain_points.add(variant_i, node_index, position, normal)
-                                break
+                        if is_included:
+                            used_terrain_points.add(variant_i, node_index, position, normal)
 
             # triangles
             if face_flip:
@@ -470,6 +529,15 @@ def execute(dirpath, name_suffix, root_object, armature_object, skeleton_filepat
         pim_part = pim_parts[part_name]
         pim_part.add_piece(piece)
 
+    # reorder triangles and vertices of pieces for better vertex cache usage in game
+    if scs_globals.export_optimize_vertex_cache:
+        for pim_piece in pim_pieces:
+            vertices_map = pim_piece.optimize_vertex_cache()
+
+            # skin stream is referring to piece vertices, so it has to be updated with new vertex indices
+            if vertices_map and is_skin_used:
+                skin_stream.remap_piece_vertices(pim_piece.get_index(), vertices_map)
+
     # report missing data for whole model
     if len(missing_mappings_data) > 0:
         for material_name in missing_mappings_data:
@@ -547,4 +615,4 @@ def execute(dirpath, name_suffix, root_object, armature_object, skeleton_filepat
     # write to file
     ind = "    "
     pim_filepath = os.path.join(dirpath, root_object.name + ".pim" + name_suffix)
-    return _pix_container.write_data_to_file(pim_container, pim_filepath, ind)
+    return _pix_container.write_data_to_file(pim_container, pim_filepath, ind, deferrable=True)
@@ -18,9 +18,14 @@
 
 # Copyright (C) 2013-2014: SCS Software
 
+import numpy
+from array import array
 from collections import OrderedDict
+from math import copysign
 from io_scs_tools.exp.pim.piece_stream import Stream
 from io_scs_tools.internals.structure import SectionData as _SectionData
+from io_scs_tools.internals.structure import StreamData as _StreamData
+from io_scs_tools.utils import vertex_cache as _vertex_cache_utils
 from io_scs_tools.utils.printout import lprint
 
 
@@ -32,7 +37,7 @@ class Piece:
 
     __material = None  # save whole material reference to get index out of it when packing
     __streams = OrderedDict()  # dict of Stream class
-    __triangles = []  # list of Triangle class
+    __triangles = None  # stream data of triangles vertex indices
 
     __vertices_hash = {}
 
@@ -58,11 +63,67 @@ class Piece:
     def get_global_triangle_count():
         return Piece.__global_triangle_count
 
+    @staticmethod
+    def quantize_value(value):
+        """Quantizes given float value to be used in vertex hash. See "quantize_values" for details.
+        :param value: float value to be quantized
+        :type value: float
+        :return: quantized value
+        :rtype: int | str
+        """
+
+        scaled = value * 10000.0
+        try:
+            rounded = round(scaled)
+        except (ValueError, OverflowError):  # nan or infinite value, which can be compared only as string
+            return "%.4f" % value
+
+        if not -0.4999 < scaled - rounded < 0.4999:  # close to half, rounding of scaled value might be different
+            rounded = int(("%.4f" % value).replace(".", ""))
+
+        if rounded == 0 and copysign(1.0, value) < 0:
+            return "-0"
+
+        return rounded
+
+    @staticmethod
+    def quantize_values(values):
+        """Quantizes all given float values at once to integers of 4 decimals precision, to be used in vertex hash.
+        Two values get the same quantized value only if they are equal when formatted with "%.4f", so:
+        1. values which scaled value is too close to half are quantized from their formatted string,
+        2. negative values rounded to zero are quantized to "-0" string as formatting keeps the sign,
+        3. nan and infinite values are quantized to their formatted string.
+        NOTE: use it on big arrays of values, for single value use "quantize_value" instead.
+        :param values: float values to be quantized
+        :type values: numpy.ndarray | collections.Iterable[float]
+        :return: list of quantized values
+        :rtype: list[int | str]
+        """
+
+        values = numpy.asarray(values, dtype=numpy.float64)
+
+        scaled = values * 10000.0
+        rounded = numpy.rint(scaled)  # rounds half to even, same as python round
+
+        with numpy.errstate(invalid="ignore"):
+            diff = scaled - rounded
+            is_special = ~((diff > -0.4999) & (diff < 0.4999))  # also true for nan and infinite values
+            is_special |= ~(numpy.abs(rounded) < 2.0 ** 62)  # too big for 64 bit integers
+        is_special |= (rounded == 0) & numpy.signbit(values)
+
+        rounded[is_special] = 0
+        quantized = rounded.astype(numpy.int64).tolist()
+        for i in numpy.flatnonzero(is_special).tolist():
+            quantized[i] = Piece.quantize_value(float(values[i]))
+
+        return quantized
+
     @staticmethod
     def __calc_vertex_hash(index, uvs, rgba, tangent):
         """Calculates vertex hash from original vertex index, uvs components and vertex color.
+        Float values are compared with precision of 4 decimals.
         :param index: original index from Blender mesh
-        :type index: int
+        :type index: int | str
         :param uvs: list of uvs used on vertex (each uv must be in SCS coordinates)
         :type uvs: list of (tuple | mathutils.Vector)
         :param rgba: rgba representation of vertex color in SCS values
@@ -70,21 +131,22 @@ class Piece:
         :param tangent: vertex tangent in SCS coordinates or none, if piece doesn't have tangents
         :type tangent: tuple | None
         :return: calculated vertex hash
-        :rtype: str
+        :rtype: tuple
         """
 
-        frmt = "%.4f"
-
-        vertex_hash = str(index)
+        vertex_hash = [index]
         for uv in uvs:
-            vertex_hash = ''.join((vertex_hash, frmt % uv[0], frmt % uv[1]))
+            vertex_hash.append(Piece.quantize_value(uv[0]))
+            vertex_hash.append(Piece.quantize_value(uv[1]))
 
-        vertex_hash = ''.join((vertex_hash, frmt % rgba[0], frmt % rgba[1], frmt % rgba[2], frmt % rgba[3]))
+        for value in rgba[:4]:
+            vertex_hash.append(Piece.quantize_value(value))
 
         if tangent:
-            vertex_hash = ''.join((vertex_hash, frmt % tangent[0], frmt % tangent[1], frmt % tangent[2], frmt % tangent[3]))
+            for value in tangent[:4]:
+                vertex_hash.append(Piece.quantize_value(value))
 
-        return vertex_hash
+        return tuple(vertex_hash)
 
     def __init__(self, index, material):
         """Constructs empty piece.
@@ -98,7 +160,7 @@ class Piece:
         self.__triangle_count = 0
         self.__stream_count = 0
         self.__streams = OrderedDict()
-        self.__triangles = []
+        self.__triangles = _StreamData()
         self.__vertices_hash = {}
 
         self.__index = index
@@ -130,12 +192,12 @@ class Piece:
                 if vertex < 0 or vertex >= self.__vertex_count:
                     return False
 
-            self.__triangles.append(tuple(triangle))
+            self.__triangles.append([int(vertex) for vertex in triangle])
             Piece.__global_triangle_count += 1
 
         return True
 
-    def add_vertex(self, vert_index, position, normal, uvs, uvs_aliases, rgba, tangent):
+    def add_vertex(self, vert_index, position, normal, uvs, uvs_aliases, rgba, tangent, vertex_hash=None):
         """Adds new vertex to position and normal streams
         :param vert_index: original vertex index from Blender mesh
         :type vert_index: int | str
@@ -151,11 +213,15 @@ class Piece:
         :type rgba: tuple | mathutils.Color
         :param tangent: tuple representation of vertex tangent in SCS values or None if piece doesn't have tangents
         :type tangent: tuple | None
+        :param vertex_hash: precalculated vertex hash: tuple of vertex index followed by quantized uvs, rgba and tangent values
+        (values have to be quantized with "quantize_values"); if not given it's calculated from vertex data
+        :type vertex_hash: tuple | None
         :return: vertex index inside piece streams ( use it for adding triangles )
         :rtype: int
         """
 
-        vertex_hash = self.__calc_vertex_hash(vert_index, uvs, rgba, tangent)
+        if vertex_hash is None:
+            vertex_hash = self.__calc_vertex_hash(vert_index, uvs, rgba, tangent)
 
         # save vertex if the vertex with the same properties doesn't exists yet in streams
         if vertex_hash not in self.__vertices_hash:
@@ -207,6 +273,54 @@ class Piece:
     def get_vertex_count(self):
         return self.__streams[Stream.Types.POSITION].get_size()
 
+    def optimize_vertex_cache(self):
+        """Reorders triangles of piece for better usage of post-transform vertex cache in game
+        and reorders vertices in order of their first use by triangles.
+        NOTE: vertex indices previously returned by "add_vertex" are invalidated,
+        so any data referring to them has to be remapped with returned vertices map.
+
+        :return: new vertex indices indexed by old vertex index; None if piece was left untouched
+        :rtype: list[int] | None
+        """
+
+        if len(self.__triangles) == 0:
+            return None
+
+        vertex_count = self.get_vertex_count()
+        indices = self.__triangles.values.tolist()
+        acmr = _vertex_cache_utils.calc_acmr(indices)
+
+        triangles_order = _vertex_cache_utils.optimize_triangles_order(indices, vertex_count)
+        optimized_indices = []
+        for tri_i in triangles_order:
+            optimized_indices.extend(indices[tri_i * 3:tri_i * 3 + 3])
+
+        optimized_acmr = _vertex_cache_utils.calc_acmr(optimized_indices)
+
+        # in already well ordered pieces optimization can be even worse, so keep them as they are
+        if optimized_acmr >= acmr:
+            lprint("I Piece with index %s vertex cache ACMR: %.3f, keeping original triangles order (optimized ACMR: %.3f)",
+                   (self.__index, acmr, optimized_acmr))
+            return None
+
+        lprint("I Piece with index %s vertex cache ACMR: %.3f -> %.3f", (self.__index, acmr, optimized_acmr))
+
+        vertices_map = _vertex_cache_utils.get_vertices_first_use_map(optimized_indices, vertex_count)
+        vertices_order = [0] * vertex_count
+        for old_vert_i, new_vert_i in enumerate(vertices_map):
+            vertices_order[new_vert_i] = old_vert_i
+
+        for stream in self.__streams.values():
+            stream.reorder_entries(vertices_order)
+
+        self.__triangles.reorder(triangles_order)
+        self.__triangles.values = array(self.__triangles.values.typecode, [vertices_map[vert_i] for vert_i in self.__triangles.values])
+
+        for vertex_hash in self.__vertices_hash:
+            self.__vertices_hash[vertex_hash] = vertices_map[self.__vertices_hash[vertex_hash]]
+
+        return vertices_map
+
     def get_as_section(self):
         """Gets piece represented with SectionData structure class.
         :return: packed piece as section data
@@ -245,8 +359,7 @@ class Piece:
 
         # APPEND TRIANGLES
         triangle_section = _SectionData("Triangles")
-        for triangle in self.__triangles:
-            triangle_section.data.append(triangle)
+        triangle_section.data = self.__triangles
 
         section.sections.append(triangle_section)
 
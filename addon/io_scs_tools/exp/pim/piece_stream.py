@@ -20,6 +20,7 @@
 
 
 from io_scs_tools.internals.structure import SectionData as _SectionData
+from io_scs_tools.internals.structure import StreamData as _StreamData
 
 
 class Stream:
@@ -52,7 +53,7 @@ class Stream:
         """
 
         self.__aliases = {}
-        self.__data = []
+        self.__data = _StreamData()
 
         self.__tag = stream_type
 
@@ -95,9 +96,27 @@ class Stream:
         if self.__tag == Stream.Types.UV and len(value) != 2:
             return False
 
-        self.__data.append(tuple(value))
+        row = [float(val) for val in value]
+        if isinstance(self.__data, _StreamData) and not self.__data.append(row):
+            # values don't fit into typed storage (eg. out of single precision range), fallback to plain list
+            self.__data = self.__data.to_list()
+
+        if isinstance(self.__data, list):
+            self.__data.append(row)
+
         return True
 
+    def reorder_entries(self, order):
+        """Reorders entries of stream.
+
+        :param order: indices of current entries in new order; has to include each entry index exactly once
+        :type order: list[int]
+        """
+        if isinstance(self.__data, list):
+            self.__data = [self.__data[i] for i in order]
+        else:
+            self.__data.reorder(order)
+
     def add_alias(self, alias):
         """Adds alias to stream.
         NOTE: only unique aliases will be kept
@@ -154,6 +173,6 @@ class Stream:
             section.props.append(("AliasCount", len(aliases)))
             section.props.append(("Aliases", aliases))
 
-        section.data = self.__data
+        section.data = self.__data  # no copy, rows are formatted directly from typed storage while writing
 
         return section
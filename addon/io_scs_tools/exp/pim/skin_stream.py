@@ -87,6 +87,24 @@ class SkinStream:
 
             return False
 
+        def remap_clones(self, piece_index, vertices_map):
+            """Changes vertex indices of clones from given piece, used when vertices of piece were reordered.
+
+            :param piece_index: index of the piece inside SCS game object
+            :type piece_index: int
+            :param vertices_map: new vertex indices indexed by old vertex index
+            :type vertices_map: list[int]
+            """
+
+            clones = OrderedDict()
+            for clone_piece_index, clone_vertex_index in self.__clones.values():
+                if clone_piece_index == piece_index:
+                    clone_vertex_index = vertices_map[clone_vertex_index]
+
+                clones[str(clone_piece_index) + ":" + str(clone_vertex_index)] = (clone_piece_index, clone_vertex_index)
+
+            self.__clones = clones
+
         def get_original_piece_info(self):
             """Get piece data for origin of this skin entry.
 
@@ -167,6 +185,8 @@ class SkinStream:
         NOTE: same entries can be added as duplicates will be ignored!
         :param skin_entry: entry of the skin stream
         :type skin_entry: SkinStream.Entry
+        :return: entry stored in the stream; given entry or already existing entry with the same hash
+        :rtype: SkinStream.Entry
         """
 
         entry_hash = skin_entry.get_hash()
@@ -177,8 +197,37 @@ class SkinStream:
         else:
             # add clone and increment clone count if clone was added
             piece_index, vertex_index = skin_entry.get_original_piece_info()
-            if self._data[entry_hash].add_clone(piece_index, vertex_index):
-                self.__total_clone_count += 1
+            self.add_entry_clone(self._data[entry_hash], piece_index, vertex_index)
+
+        return self._data[entry_hash]
+
+    def add_entry_clone(self, skin_entry, piece_index, vertex_index):
+        """Adds clone with given piece and vertex index to the entry already stored in this stream.
+        Shall be used instead of adding new entry, when it's known that entry would be the same,
+        as creating entry and calculating it's hash is avoided.
+
+        :param skin_entry: entry of the skin stream previously returned by add_entry
+        :type skin_entry: SkinStream.Entry
+        :param piece_index: index of the piece inside SCS game object
+        :type piece_index: int
+        :param vertex_index: index of the vertex inside piece
+        :type vertex_index: int
+        """
+
+        if skin_entry.add_clone(piece_index, vertex_index):
+            self.__total_clone_count += 1
+
+    def remap_piece_vertices(self, piece_index, vertices_map):
+        """Changes vertex indices of all clones from given piece, used when vertices of piece were reordered.
+
+        :param piece_index: index of the piece inside SCS game object
+        :type piece_index: int
+        :param vertices_map: new vertex indices indexed by old vertex index
+        :type vertices_map: list[int]
+        """
+
+        for skin_entry in self._data.values():
+            skin_entry.remap_clones(piece_index, vertices_map)
 
     def get_tag(self):
         """Returns tag which represents type of this skin stream
@@ -477,4 +477,4 @@ def execute(dirpath, name_suffix, root_object, armature_object, skeleton_filepat
     # write to file
     ind = "    "
     pim_filepath = os.path.join(dirpath, root_object.name + ".pim" + name_suffix)
-    return _pix_container.write_data_to_file(pim_container, pim_filepath, ind)
+    return _pix_container.write_data_to_file(pim_container, pim_filepath, ind, deferrable=True)
@@ -525,5 +525,5 @@ def execute(dirpath, filename, name_suffix, prefab_locator_list, offset_matrix,
     # write to file
     ind = "    "
     pip_filepath = path.join(dirpath, str(filename + ".pip" + name_suffix))
-    result = _pix_container.write_data_to_file(pip_container, pip_filepath, ind)
+    result = _pix_container.write_data_to_file(pip_container, pip_filepath, ind, deferrable=True)
     return result
@@ -62,7 +62,7 @@ def _fill_bones_sections(scs_root_obj, armature_obj, used_bones, export_scale):
 
         bone_mat = (Matrix.Scale(export_scale, 4) * _convert_utils.scs_to_blend_matrix().inverted() *
                     armature_mat * bone.matrix_local)
-        section.data.append(("__bone__", bone.name, bone.parent, bone_mat.transposed()))
+        section.data.append(("__bone__", bone.name, bone.parent.name if bone.parent else None, bone_mat.transposed()))
     return section
 
 
@@ -84,7 +84,7 @@ def export(filepath, scs_root_obj, armature_object, used_bones):
 
     # FILE EXPORT
     ind = "    "
-    result = _pix_container.write_data_to_file(pis_container, filepath, ind)
+    result = _pix_container.write_data_to_file(pis_container, filepath, ind, deferrable=True)
 
     # print("************************************")
     return result
@@ -377,7 +377,7 @@ def export(root_object, filepath, name_suffix, used_parts, used_materials):
     # FILE EXPORT
     ind = "    "
     pit_filepath = str(filepath + ".pit" + name_suffix)
-    result = _pix_container.write_data_to_file(pit_container, pit_filepath, ind)
+    result = _pix_container.write_data_to_file(pit_container, pit_filepath, ind, deferrable=True)
 
     # print("************************************")
     return result
@@ -24,6 +24,7 @@ from io_scs_tools.utils import path as _path_utils
 from io_scs_tools.utils import object as _object_utils
 from io_scs_tools.utils import get_scs_globals as _get_scs_globals
 from io_scs_tools.utils.printout import lprint
+from io_scs_tools.exp import manifest as _export_manifest
 from io_scs_tools.exp import pia as _pia
 from io_scs_tools.exp import pic as _pic
 from io_scs_tools.exp import pis as _pis
@@ -36,6 +37,7 @@ from io_scs_tools.exp.transition_structs.bones import BonesTrans
 from io_scs_tools.exp.transition_structs.materials import MaterialsTrans
 from io_scs_tools.exp.transition_structs.parts import PartsTrans
 from io_scs_tools.exp.transition_structs.terrain_points import TerrainPntsTrans
+from io_scs_tools.internals.containers import pix as _pix_container
 
 
 def _get_objects_by_type(blender_objects, parts):
@@ -159,6 +161,7 @@ def export(dirpath, name_suffix, root_object, game_object_list):
     # EXPORT
     scs_globals = _get_scs_globals()
     export_success = True
+    deferred_writes_start = _pix_container.get_deferred_writes_count()
 
     # EXPORT PIM
     if scs_globals.export_pim_file:
@@ -248,6 +251,10 @@ def export(dirpath, name_suffix, root_object, game_object_list):
         lprint("W Armature and SCS Animations detected but not exported! If you are exporting animated model,\n\t   " +
                "make sure to switch SCS Root Object %r to 'Animated Model'!", (root_object.name,))
 
+    # INCREMENTAL EXPORT: skip writing files if gathered data and already written files didn't change
+    if scs_globals.export_incremental and export_success:
+        _export_manifest.skip_unchanged_root(dirpath, root_object.name, deferred_writes_start)
+
     # FINAL FEEDBACK
     context.window.cursor_modal_restore()
     if export_success:
@@ -43,7 +43,29 @@ class TerrainPntsTrans:
         """
 
         self.__storage = {}
-        """:type: dict[str, list[TerrainPntsTrans.Entry]]"""
+        """:type: dict[(int, int), list[TerrainPntsTrans.Entry]]"""
+
+        self.__grids = {}
+        """Uniform grid of stored entries per storage key, used to find close points only in neighbouring cells.
+        Cell size is the same as minimal terrain points distance.
+        :type: dict[(int, int), dict[(int, int, int), list[TerrainPntsTrans.Entry]]]"""
+
+    @staticmethod
+    def __get_grid_cell(position):
+        """Gets grid cell in which given position lies.
+
+        :param position: position of terrain point
+        :type position: Vector | tuple
+        :return: cell indices; None if position is not finite
+        :rtype: (int, int, int) | None
+        """
+        cell_size = _PL_consts.TERRAIN_POINTS_MIN_DISTANCE
+        try:
+            return (math.floor(position[0] / cell_size),
+                    math.floor(position[1] / cell_size),
+                    math.floor(position[2] / cell_size))
+        except (ValueError, OverflowError):
+            return None
 
     def add(self, variant_index, node_index, position, normal):
         """Adds new terrain point to storage.
@@ -58,14 +80,33 @@ class TerrainPntsTrans:
         :type normal: Vector
         """
 
-        key = str(variant_index) + ":" + str(node_index)
+        key = (variant_index, node_index)
         if key not in self.__storage:
             self.__storage[key] = []
+            self.__grids[key] = {}
 
-        # save only unique position points
         tp_entry = TerrainPntsTrans.Entry(position, normal)
-        if tp_entry not in self.__storage[key]:
+
+        # not finite positions are never close to any other point, so they can't be stored in the grid nor be duplicates
+        cell = self.__get_grid_cell(position)
+        if cell is None:
             self.__storage[key].append(tp_entry)
+            return
+
+        # save only unique position points; as cell size is the same as minimal distance,
+        # close points can only be in the same or neighbouring cells
+        grid = self.__grids[key]
+        for x in range(cell[0] - 1, cell[0] + 2):
+            for y in range(cell[1] - 1, cell[1] + 2):
+                for z in range(cell[2] - 1, cell[2] + 2):
+                    if tp_entry in grid.get((x, y, z), ()):
+                        return
+
+        self.__storage[key].append(tp_entry)
+        if cell in grid:
+            grid[cell].append(tp_entry)
+        else:
+            grid[cell] = [tp_entry]
 
     def ensure_entry(self, variant_index, node_index):
         """Ensures that variant in given node is present.
@@ -78,9 +119,10 @@ class TerrainPntsTrans:
         :rtype:
         """
 
-        key = str(variant_index) + ":" + str(node_index)
+        key = (variant_index, node_index)
         if key not in self.__storage:
             self.__storage[key] = []
+            self.__grids[key] = {}
 
     def get(self, node_index):
         """Get terrain point for given node index.
@@ -93,11 +135,10 @@ class TerrainPntsTrans:
 
         tp_dict = {}
 
-        for key in self.__storage:
+        for variant_i, node in self.__storage:
 
-            variant_i, node = key.split(":")
-            if int(node) == node_index:
+            if node == node_index:
 
-                tp_dict[int(variant_i)] = self.__storage[key]
+                tp_dict[variant_i] = self.__storage[(variant_i, node)]
 
         return tp_dict
@@ -170,8 +170,21 @@ def _create_fcurves(anim_action, anim_group, anim_curve, rot_euler=True, types='
     return pos_fcurves, rot_fcurves, sca_fcurves
 
 
-def _get_delta_matrix(bone_rest_matrix_scs, parent_bone_rest_matrix_scs, bone_animation_matrix_scs, import_scale):
-    """."""
+def _get_delta_matrices(bone_rest_matrix_scs, parent_bone_rest_matrix_scs, bone_animation_matrices_scs, import_scale):
+    """Gets delta matrices of all animation keyframes of one bone.
+    Part of the delta which is the same for all the keyframes is computed only once.
+
+    :param bone_rest_matrix_scs: rest matrix of the bone in SCS coordinates
+    :type bone_rest_matrix_scs: mathutils.Matrix
+    :param parent_bone_rest_matrix_scs: rest matrix of the parent bone in SCS coordinates
+    :type parent_bone_rest_matrix_scs: mathutils.Matrix
+    :param bone_animation_matrices_scs: animation matrices of the bone per keyframe in SCS coordinates
+    :type bone_animation_matrices_scs: collections.Iterable[mathutils.Matrix]
+    :param import_scale: import scale
+    :type import_scale: float
+    :return: list of delta matrices per keyframe
+    :rtype: list[mathutils.Matrix]
+    """
     scale_matrix = Matrix.Scale(import_scale, 4)
 
     # NOTE: apply scaling bone rest matrix, because it's subtracted by bone rest matrix inverse
@@ -181,11 +194,32 @@ def _get_delta_matrix(bone_rest_matrix_scs, parent_bone_rest_matrix_scs, bone_an
     scale[1] = (0, sca[1], 0, 0)
     scale[2] = (0, 0, sca[2], 0)
 
-    return (scale_matrix *
-            scale *
-            bone_rest_matrix_scs.inverted() *
-            parent_bone_rest_matrix_scs *
-            bone_animation_matrix_scs)
+    rest_delta_matrix = (scale_matrix *
+                         scale *
+                         bone_rest_matrix_scs.inverted() *
+                         parent_bone_rest_matrix_scs)
+
+    return [rest_delta_matrix * bone_animation_matrix_scs for bone_animation_matrix_scs in bone_animation_matrices_scs]
+
+
+def _set_keyframes(fcurve, keyframes_co):
+    """Adds all keyframes to given animation curve at once, sets their interpolation to linear
+    and updates the curve.
+
+    :param fcurve: animation curve without keyframes
+    :type fcurve: bpy.types.FCurve
+    :param keyframes_co: flat list of keyframes coordinates as pairs of frame and value
+    :type keyframes_co: list[float]
+    """
+    fcurve.keyframe_points.add(len(keyframes_co) // 2)
+    fcurve.keyframe_points.foreach_set("co", keyframes_co)
+    for keyframe in fcurve.keyframe_points:
+        keyframe.interpolation = 'LINEAR'
+
+    # euler filter is applied only on rotation curves, it has to be done before update, so that handles are calculated properly
+    _animation_utils.apply_euler_filter(fcurve)
+
+    fcurve.update()
 
 
 def load(root_object, pia_files, armature, pis_filepath=None, bones=None):
@@ -221,7 +255,8 @@ def load(root_object, pia_files, armature, pis_filepath=None, bones=None):
 
         if skeleton_match:
             lprint('I ++ "%s" IMPORTING animation data...', (os.path.basename(pia_filepath),))
-            pia_container = _pix_container.get_data_from_file(pia_filepath, ind)
+            pia_container = _pix_container.get_data_from_file(pia_filepath, ind, lazy=True,
+                                                               use_cache=scs_globals.import_use_parsed_cache)
             if not pia_container:
                 lprint('\nE File "%s" is empty!', (_path_utils.readable_norm(pia_filepath),))
                 continue
@@ -299,16 +334,23 @@ def load(root_object, pia_files, armature, pis_filepath=None, bones=None):
                             parent_bone_rest_matrix_scs = Matrix()
                             parent_bone_rest_matrix_scs.identity()
 
-                        for key_time_i, key_time in enumerate(streams[0]):
-                            keyframe = key_time_i + 1
-
-                            # GET BONE ANIMATION MATRIX
-                            bone_animation_matrix_scs = streams[1][key_time_i].transposed()
+                        # NOTE: this scaling rotation switch came from UK variants which had scale -1
+                        loc, rot, sca = bone_rest_matrix_scs.decompose()
+                        flip_rotation_y = sca.y < 0
+                        flip_rotation_z = sca.z < 0
 
-                            # CREATE DELTA MATRIX
-                            delta_matrix = _get_delta_matrix(bone_rest_matrix_scs, parent_bone_rest_matrix_scs, bone_animation_matrix_scs,
+                        # CREATE DELTA MATRICES
+                        keyframe_count = len(streams[0])
+                        delta_matrices = _get_delta_matrices(bone_rest_matrix_scs, parent_bone_rest_matrix_scs,
+                                                             (streams[1][i].transposed() for i in range(keyframe_count)),
                                                              import_scale)
 
+                        pos_keyframes_co = ([], [], [])
+                        rot_keyframes_co = ([], [], [])
+                        sca_keyframes_co = ([], [], [])
+                        for key_time_i, delta_matrix in enumerate(delta_matrices):
+                            keyframe = float(key_time_i + 1)
+
                             # DECOMPOSE ANIMATION MATRIX
                             location, rotation, scale = delta_matrix.decompose()
 
@@ -320,38 +362,27 @@ def load(root_object, pia_files, armature, pis_filepath=None, bones=None):
                                             1 + scale[1] - init_scale[1],
                                             1 + scale[2] - init_scale[2]))
 
-                            # NOTE: this scaling rotation switch came from UK variants which had scale -1
-                            loc, rot, sca = bone_rest_matrix_scs.decompose()
-                            if sca.y < 0:
+                            if flip_rotation_y:
                                 rotation.y *= -1
-                            if sca.z < 0:
+                            if flip_rotation_z:
                                 rotation.z *= -1
 
                             rotation = rotation.to_euler('XYZ')
 
-                            # BUILD TRANSFORMATION CURVES
+                            # COLLECT TRANSFORMATION KEYFRAMES
                             for i in range(0, 3):
-                                pos_fcurves[i].keyframe_points.insert(frame=float(keyframe), value=location[i], options={'FAST'})
-                                rot_fcurves[i].keyframe_points.insert(frame=float(keyframe), value=rotation[i], options={'FAST'})
-                                sca_fcurves[i].keyframe_points.insert(frame=float(keyframe), value=scale[i], options={'FAST'})
+                                pos_keyframes_co[i].extend((keyframe, location[i]))
+                                rot_keyframes_co[i].extend((keyframe, rotation[i]))
+                                sca_keyframes_co[i].extend((keyframe, scale[i]))
 
-                        # SET LINEAR INTERPOLATION FOR ALL CURVES
+                        # BUILD TRANSFORMATION CURVES
                         color_mode = 'AUTO_RAINBOW'  # Or better 'AUTO_RGB'?
-                        for curve in pos_fcurves:
-                            curve.color_mode = color_mode
-                            for keyframe in curve.keyframe_points:
-                                keyframe.interpolation = 'LINEAR'
-                        for curve in rot_fcurves:
-                            curve.color_mode = color_mode
-                            for keyframe in curve.keyframe_points:
-                                keyframe.interpolation = 'LINEAR'
-                        for curve in sca_fcurves:
-                            curve.color_mode = color_mode
-                            for keyframe in curve.keyframe_points:
-                                keyframe.interpolation = 'LINEAR'
-
-                        for curve in rot_fcurves:
-                            _animation_utils.apply_euler_filter(curve)
+                        for fcurves, keyframes_co in ((pos_fcurves, pos_keyframes_co),
+                                                      (rot_fcurves, rot_keyframes_co),
+                                                      (sca_fcurves, sca_keyframes_co)):
+                            for i, curve in enumerate(fcurves):
+                                curve.color_mode = color_mode
+                                _set_keyframes(curve, keyframes_co[i])
 
             # LOAD CUSTOM CHANNELS (ARMATURE OFFSET ANIMATION)
             custom_channels = _get_anim_channels(pia_container, section_name="CustomChannel")
@@ -387,10 +418,11 @@ def load(root_object, pia_files, armature, pis_filepath=None, bones=None):
                         pos_fcurves = (fcurve_pos_x, fcurve_pos_y, fcurve_pos_z)
 
                         location = None
+                        pos_keyframes_co = ([], [], [])
                         for key_time_i, key_time in enumerate(streams[0]):
                             # print(' key_time: %s' % str(key_time[0]))
                             # keyframe = key_time_i * (key_time[0] * 10) ## TODO: Do proper timing...
-                            keyframe = key_time_i + 1
+                            keyframe = float(key_time_i + 1)
                             scs_offset = _convert_utils.change_to_scs_xyz_coordinates(custom_channels[channel_name][2][1][key_time_i], import_scale)
                             offset = Vector(scs_offset)
                             if location is None:
@@ -399,15 +431,13 @@ def load(root_object, pia_files, armature, pis_filepath=None, bones=None):
                                 location = location + offset
                             # print(' > location: %s' % str(location))
 
-                            # BUILD TRANSLATION CURVES
-                            pos_fcurves[0].keyframe_points.insert(frame=float(keyframe), value=location[0], options={'FAST'})
-                            pos_fcurves[1].keyframe_points.insert(frame=float(keyframe), value=location[1], options={'FAST'})
-                            pos_fcurves[2].keyframe_points.insert(frame=float(keyframe), value=location[2], options={'FAST'})
+                            # COLLECT TRANSLATION KEYFRAMES
+                            for i in range(0, 3):
+                                pos_keyframes_co[i].extend((keyframe, location[i]))
 
-                        # SET LINEAR INTERPOLATION FOR ALL CURVES
-                        for curve in pos_fcurves:
-                            for keyframe in curve.keyframe_points:
-                                keyframe.interpolation = 'LINEAR'
+                        # BUILD TRANSLATION CURVES
+                        for i, curve in enumerate(pos_fcurves):
+                            _set_keyframes(curve, pos_keyframes_co[i])
                     else:
                         lprint('W Unknown channel %r in "%s" file.', (channel_name, os.path.basename(pia_filepath)))
 
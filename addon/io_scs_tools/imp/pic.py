@@ -241,7 +241,7 @@ def load(filepath):
     print("************************************\n")
 
     ind = '    '
-    pic_container = _pix_container.get_data_from_file(filepath, ind)
+    pic_container = _pix_container.get_data_from_file(filepath, ind, use_cache=scs_globals.import_use_parsed_cache)
 
     # TEST PRINTOUTS
     # ind = '  '
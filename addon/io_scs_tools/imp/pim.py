@@ -19,8 +19,7 @@
 # Copyright (C) 2013-2014: SCS Software
 
 import bpy
-import bmesh
-import array
+from collections import OrderedDict
 from re import match
 from mathutils import Vector
 from bpy_extras import object_utils as bpy_object_utils
@@ -167,10 +166,7 @@ def _get_piece_streams(section):
                         stream_aliases = prop[1].replace("\"", "").replace("  ", " ").split(" ")
                 else:
                     lprint('\nW Unknown property in "Stream" data: "%s"!', prop[0])
-            data_block = []
-            for data_line in sec.data:
-                data_block.append(data_line)
-            # print('data_line: %s' % data_line)
+            data_block = sec.data  # stream rows are already in typed storage, no need to copy them
             # print('stream_format: %s' % stream_format)
             # print('stream_tag: %s' % stream_tag)
 
@@ -349,9 +345,8 @@ def _create_piece(
         mesh_tuv,
         mesh_triangles,
         materials_data,
-        points_to_weld_list,
-        terrain_points_trans,
-        ignore_backfaces=False
+        vertices_weld_map,
+        terrain_points_trans
 ):
     handle_unused_arg(__file__, _create_piece.__name__, "mesh_tangents", mesh_tangents)
     handle_unused_arg(__file__, _create_piece.__name__, "mesh_scalars", mesh_scalars)
@@ -372,21 +367,25 @@ def _create_piece(
     # VISUALISE IMPORTED NORMALS (DEBUG)
     # visualise_normals(name, transformed_mesh_vertices, mesh_normals, import_scale)
 
-    # MESH CREATION
-    bm = bmesh.new()
+    # FACES
+    mesh_triangles, back_triangles = _mesh_utils.get_faces_and_back_faces(mesh_triangles, vertices_weld_map)
 
-    # VERTICES
-    _mesh_utils.bm_make_vertices(bm, transformed_mesh_vertices)
+    # back triangles get their own vertices, so they are checked only against each other
+    back_triangles = _mesh_utils.get_faces_and_back_faces(back_triangles, vertices_weld_map)[0]
     context.window_manager.progress_update(0.2)
 
-    # FACES
-    mesh_triangles, back_triangles = _mesh_utils.bm_make_faces(bm, mesh_triangles, points_to_weld_list)
+    # MESH CREATION
+    vertices_map, back_vertices_map = _mesh_utils.make_geometry(mesh, transformed_mesh_vertices, mesh_triangles, vertices_weld_map,
+                                                                back_triangles)
+
+    # from now on back triangles are handled as all the others, as they are already part of the mesh
+    mesh_triangles = mesh_triangles + back_triangles
     context.window_manager.progress_update(0.3)
 
     # UV LAYERS
     if mesh_uv:
         for uv_layer_name in mesh_uv:
-            _mesh_utils.bm_make_uv_layer(5, bm, mesh_triangles, uv_layer_name, mesh_uv[uv_layer_name]["data"])
+            _mesh_utils.make_uv_layer(mesh, mesh_triangles, uv_layer_name, mesh_uv[uv_layer_name]["data"])
     context.window_manager.progress_update(0.4)
 
     # VERTEX COLOR
@@ -398,45 +397,33 @@ def _create_piece(
         mesh_rgb_final = []
 
     for vc_layer_name in mesh_rgb_final:
-        max_value = mesh_rgb_final[vc_layer_name][0][0] / 2
-
-        for vc_entry in mesh_rgb_final[vc_layer_name]:
-            for i, value in enumerate(vc_entry):
-                if max_value < value / 2:
-                    max_value = value / 2
+        max_value = max(max(vc_entry) for vc_entry in mesh_rgb_final[vc_layer_name]) / 2
 
         if max_value > mesh.scs_props.vertex_color_multiplier:
             mesh.scs_props.vertex_color_multiplier = max_value
 
-        _mesh_utils.bm_make_vc_layer(5, bm, vc_layer_name, mesh_rgb_final[vc_layer_name], mesh.scs_props.vertex_color_multiplier)
+        _mesh_utils.make_vc_layer(mesh, mesh_triangles, vc_layer_name, mesh_rgb_final[vc_layer_name],
+                                  mesh.scs_props.vertex_color_multiplier, vertices_weld_map)
 
     context.window_manager.progress_update(0.5)
 
-    bm.to_mesh(mesh)
     mesh.update()
-    bm.free()
 
-    # NORMALS - has to be applied after bmesh creation as they are set directly to mesh
+    # NORMALS - has to be applied after geometry creation as they are set directly to mesh
     if _get_scs_globals().import_use_normals:
 
         mesh.create_normals_split()
 
-        # first set normals directly to loops
-        for loop in mesh.loops:
-            curr_n = _convert_utils.scs_to_blend_matrix() * Vector(mesh_normals[loop.vertex_index])
-            loop.normal[:] = curr_n
-
-        # then we have to go trough very important step they say,
+        # first we have to go trough very important step they say,
         # as without validation we get wrong result for some normals
         mesh.validate(clean_customdata=False)  # *Very* important to not remove lnors here!
 
         # set polygons to use smooth representation
         mesh.polygons.foreach_set("use_smooth", [True] * len(mesh.polygons))
 
-        # finally fill clnors from loops normals and apply them (taken from official Blenders scripts)
-        clnors = array.array('f', [0.0] * (len(mesh.loops) * 3))
-        mesh.loops.foreach_get("normal", clnors)
-        mesh.normals_split_custom_set(tuple(zip(*(iter(clnors),) * 3)))
+        # finally fill clnors from vertices normals and apply them
+        _mesh_utils.set_custom_normals(mesh, mesh_normals, _convert_utils.scs_to_blend_matrix(), vertices_map, back_vertices_map,
+                                       vertices_weld_map)
         mesh.use_auto_smooth = True
 
         mesh.free_normals_split()
@@ -452,13 +439,22 @@ def _create_piece(
     bpy.context.scene.objects.active = obj
     bpy.ops.object.shade_smooth()
 
+    if len(back_triangles) > 0:
+        lprint("W Found %s back face(s) without it's own vertices on object %r, additional vertices were added!",
+               (len(back_triangles), obj.name))
+
     context.window_manager.progress_update(0.7)
 
     context.window_manager.progress_update(0.8)
 
     # TERRAIN POINTS (VERTEX GROUPS)
+    tp_vertex_groups = OrderedDict()  # mesh vertex indices per vertex group name, so each vertex group is filled at once
     for vertex_i, vertex_pos in enumerate(mesh_vertices):
 
+        # welded vertices were not created, their weld vertex gets terrain points by it's own position
+        if vertices_weld_map and vertices_weld_map[vertex_i] != vertex_i:
+            continue
+
         tp_entries = terrain_points_trans.get(vertex_pos)
 
         # add current vertex to all combinations of variants/nodes
@@ -470,51 +466,41 @@ def _create_piece(
             # cleanup if this vertex will be set to multiple variants
             vg_name = str(tp_entry.variant_i).zfill(6) + _OP_consts.TerrainPoints.vg_name_prefix + str(tp_entry.node_i)
 
-            if vg_name not in obj.vertex_groups:
-                obj.vertex_groups.new(vg_name)
+            vertex_indices = tp_vertex_groups.setdefault(vg_name, [])
+            vertex_indices.append(vertices_map[vertex_i])
+            if back_vertices_map[vertex_i] != -1:
+                vertex_indices.append(back_vertices_map[vertex_i])
+
+    for vg_name in tp_vertex_groups:
 
-            vertex_group = obj.vertex_groups[vg_name]
-            vertex_group.add([vertex_i], 1.0, "REPLACE")
+        if vg_name not in obj.vertex_groups:
+            obj.vertex_groups.new(vg_name)
+
+        obj.vertex_groups[vg_name].add(tp_vertex_groups[vg_name], 1.0, "REPLACE")
 
     # SKINNING (VERTEX GROUPS)
     if object_skinning:
         if name in object_skinning:
             for vertex_group_name in object_skinning[name]:
                 vertex_group = obj.vertex_groups.new(vertex_group_name)
-                for vertex_i, vertex in enumerate(object_skinning[name][vertex_group_name]):
-                    weight = object_skinning[name][vertex_group_name][vertex]
+
+                # bucket vertices by weight, so all vertices with the same weight are added at once
+                weight_buckets = OrderedDict()
+                vertices_weights = object_skinning[name][vertex_group_name]
+                for vertex in vertices_weights:
+                    weight = vertices_weights[vertex]
                     if weight != 0.0:
-                        for rec in points_to_weld_list:
-                            for vert in rec:
-                                if vert == vertex:
-                                    vertex = rec[0]
-                                    break
-                        vertex_group.add([vertex], weight, "ADD")
+                        vertex_indices = weight_buckets.setdefault(weight, [])
+                        vertex_indices.append(vertices_map[vertex])
+
+                for weight in weight_buckets:
+                    vertex_group.add(weight_buckets[weight], weight, "ADD")
         else:
             lprint('\nE Missing skin group %r! Skipping...', name)
 
-    context.window_manager.progress_update(0.9)
-
-    # DELETE ORPHAN VERTICES (LEFT IN THE GEOMETRY FROM SMOOTHING RECONSTRUCTION)
-    bpy.ops.object.mode_set(mode='EDIT')
-    bm = bmesh.from_edit_mesh(mesh)
-
-    bm.verts.ensure_lookup_table()
-    for rec in points_to_weld_list:
-        for vert_i, vert in enumerate(rec):
-            if vert_i != 0:
-                bm.verts[vert].select = True
-
-    verts = [v for v in bm.verts if v.select]
-    if verts:
-        bmesh.ops.delete(bm, geom=verts, context=1)
-
-    # APPLYING BMESH TO MESH
-    # bm.to_mesh(mesh)
-    bmesh.update_edit_mesh(mesh, tessface=True, destructive=True)
-    bpy.ops.object.mode_set(mode='OBJECT')
-    mesh.update()
-    # bm.free()
+        # back faces vertices were never skinned, as back faces used to be imported as separate object without skin group
+        if len(back_triangles) > 0:
+            lprint('\nE Missing skin group %r! Skipping...', "back_" + name)
 
     context.window_manager.progress_update(1.0)
 
@@ -546,43 +532,6 @@ def _create_piece(
 
     context.window_manager.progress_end()
 
-    # if back triangles are present, then create new object with
-    # back triangles and merge it to original
-    if len(back_triangles) > 0 and not ignore_backfaces:
-
-        back_obj = _create_piece(context, preview_model, "back_" + name,
-                                 ob_material,
-                                 mesh_vertices,
-                                 mesh_normals,
-                                 mesh_tangents,
-                                 mesh_rgb,
-                                 mesh_rgba,
-                                 mesh_scalars,
-                                 object_skinning,
-                                 mesh_uv,
-                                 mesh_tuv,
-                                 back_triangles,
-                                 materials_data,
-                                 points_to_weld_list,
-                                 terrain_points_trans,
-                                 ignore_backfaces=True)
-
-        lprint("W Found %s back face(s) without it's own vertices on object %r, additional vertices were added!",
-               (len(back_obj.data.polygons), obj.name))
-
-        # creation of back face object used all original vertices
-        # for proper index accessing during binding all of the data blocks to vertices.
-        # Because of that we have to remove vertices which are not really used
-        # in back faces mesh, so called "loose" vertices
-        back_obj.data = _mesh_utils.bm_delete_loose(back_obj.data)
-
-        # finally join back object with original
-        bpy.ops.object.select_all(action="DESELECT")
-        obj.select = True
-        back_obj.select = True
-        bpy.context.scene.objects.active = obj
-        bpy.ops.object.join()
-
     return obj
 
 
@@ -651,7 +600,7 @@ def load_pim_file(context, filepath, terrain_points_trans=None, preview_model=Fa
     lprint("I Reading data from PIM file...")
 
     ind = '    '
-    pim_container = _pix_container.get_data_from_file(filepath, ind)
+    pim_container = _pix_container.get_data_from_file(filepath, ind, lazy=True, use_cache=scs_globals.import_use_parsed_cache)
 
     lprint("I Assembling data...")
 
@@ -709,15 +658,15 @@ def load_pim_file(context, filepath, terrain_points_trans=None, preview_model=Fa
                  mesh_uv,
                  mesh_tuv,
                  mesh_triangles) = _get_piece_streams(section)
-                points_to_weld_list = []
+                vertices_weld_map = None
                 if mesh_normals:
                     # print('Piece %i going to "make_posnorm_list"...' % ob_index)
                     if scs_globals.import_use_welding:
-                        points_to_weld_list = _mesh_utils.make_points_to_weld_list(mesh_vertices,
-                                                                                   mesh_normals,
-                                                                                   mesh_rgb,
-                                                                                   mesh_rgba,
-                                                                                   scs_globals.import_welding_precision)
+                        vertices_weld_map = _mesh_utils.make_vertices_weld_map(mesh_vertices,
+                                                                               mesh_normals,
+                                                                               mesh_rgb,
+                                                                               mesh_rgba,
+                                                                               scs_globals.import_welding_precision)
 
                 objects_data[ob_index] = (
                     context,
@@ -732,7 +681,7 @@ def load_pim_file(context, filepath, terrain_points_trans=None, preview_model=Fa
                     mesh_uv,
                     mesh_tuv,
                     mesh_triangles,
-                    points_to_weld_list,
+                    vertices_weld_map,
                 )
 
                 # print('piece_name: %s' % piece_name)
@@ -868,7 +817,7 @@ def load_pim_file(context, filepath, terrain_points_trans=None, preview_model=Fa
             objects_data[obj_i][10],  # mesh_tuv
             objects_data[obj_i][11],  # mesh_triangles
             materials_data,
-            objects_data[obj_i][12],  # points_to_weld_list
+            objects_data[obj_i][12],  # vertices_weld_map
             terrain_points_trans,
         )
 
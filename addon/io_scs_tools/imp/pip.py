@@ -150,9 +150,7 @@ def _get_node_properties(section):
                 else:
                     lprint('\nW Unknown property in "Stream" data: "%s"!', prop[0])
 
-            data_block = []
-            for data_line in sec.data:
-                data_block.append(data_line)
+            data_block = sec.data
 
             if stream_tag == '_POSITION' and stream_format == 'FLOAT3':
                 tp_positions = data_block
@@ -638,7 +636,7 @@ def load(filepath, terrain_points_trans):
 
     # scene = context.scene
     ind = '    '
-    pip_container = _pix_container.get_data_from_file(filepath, ind)
+    pip_container = _pix_container.get_data_from_file(filepath, ind, use_cache=scs_globals.import_use_parsed_cache)
 
     # LOAD HEADER
     '''
@@ -95,7 +95,7 @@ def load(filepath, armature, get_only=False):
 
     # scene = context.scene
     ind = '    '
-    pis_container = _pix_container.get_data_from_file(filepath, ind)
+    pis_container = _pix_container.get_data_from_file(filepath, ind, use_cache=scs_globals.import_use_parsed_cache)
 
     # TEST PRINTOUTS
     # ind = '  '
@@ -20,6 +20,7 @@
 
 from io_scs_tools.internals.containers import pix as _pix_container
 from io_scs_tools.utils import name as _name_utils
+from io_scs_tools.utils import get_scs_globals as _get_scs_globals
 from io_scs_tools.utils.printout import lprint
 
 
@@ -257,7 +258,7 @@ def load(filepath):
     print("************************************\n")
 
     ind = '    '
-    pit_container = _pix_container.get_data_from_file(filepath, ind)
+    pit_container = _pix_container.get_data_from_file(filepath, ind, use_cache=_get_scs_globals().import_use_parsed_cache)
 
     # TEST PRINTOUTS
     # ind = '  '
@@ -30,6 +30,7 @@ from io_scs_tools.imp import pis as _pis
 from io_scs_tools.imp import pit as _pit
 from io_scs_tools.imp.transition_structs.terrain_points import TerrainPntsTrans
 from io_scs_tools.internals import inventory as _inventory
+from io_scs_tools.internals.containers import pix_cache as _pix_cache
 from io_scs_tools.utils import get_scs_globals as _get_scs_globals
 from io_scs_tools.utils import material as _material_utils
 from io_scs_tools.utils import name as _name_utils
@@ -523,6 +524,8 @@ def load(context, filepath, name_suffix="", suppress_reports=False):
 
     # FINAL FEEDBACK
     bpy.context.window.cursor_modal_restore()
+    if scs_globals.import_use_parsed_cache:
+        lprint('D Parsed PIX cache hits: %s, misses: %s', _pix_cache.get_stats())
     if suppress_reports:
         lprint('\nI Import compleeted in %.3f sec.', time.time() - t)
     else:
@@ -576,6 +576,7 @@ def gather_default():
         section = _SectionData("Import")
         section.props.append(("ImportScale", _property_utils.get_by_type(bpy.types.GlobalSCSProps.import_scale)))
         section.props.append(("PreservePathForExport", int(_property_utils.get_by_type(bpy.types.GlobalSCSProps.import_preserve_path_for_export))))
+        section.props.append(("UseParsedCache", int(_property_utils.get_by_type(bpy.types.GlobalSCSProps.import_use_parsed_cache))))
         section.props.append(("ImportPimFile", int(_property_utils.get_by_type(bpy.types.GlobalSCSProps.import_pim_file))))
         section.props.append(("UseWelding", int(_property_utils.get_by_type(bpy.types.GlobalSCSProps.import_use_welding))))
         section.props.append(("WeldingPrecision", int(_property_utils.get_by_type(bpy.types.GlobalSCSProps.import_welding_precision))))
@@ -610,6 +611,8 @@ def gather_default():
         section.props.append(("ExportPicFile", int(_property_utils.get_by_type(bpy.types.GlobalSCSProps.export_pic_file))))
         section.props.append(("ExportPipFile", int(_property_utils.get_by_type(bpy.types.GlobalSCSProps.export_pip_file))))
         section.props.append(("SignExport", int(_property_utils.get_by_type(bpy.types.GlobalSCSProps.export_write_signature))))
+        section.props.append(("OptimizeVertexCache", int(_property_utils.get_by_type(bpy.types.GlobalSCSProps.export_optimize_vertex_cache))))
+        section.props.append(("Incremental", int(_property_utils.get_by_type(bpy.types.GlobalSCSProps.export_incremental))))
         return section
 
     def fill_global_display_section():
@@ -815,6 +818,8 @@ def apply_settings():
                             scs_globals.import_scale = float(prop[1])
                         elif prop[0] == "PreservePathForExport":
                             scs_globals.import_preserve_path_for_export = prop[1]
+                        elif prop[0] == "UseParsedCache":
+                            scs_globals.import_use_parsed_cache = prop[1]
                         elif prop[0] == "ImportPimFile":
                             scs_globals.import_pim_file = prop[1]
                         elif prop[0] == "UseWelding":
@@ -875,6 +880,10 @@ def apply_settings():
                             scs_globals.export_pip_file = prop[1]
                         elif prop[0] == "SignExport":
                             scs_globals.export_write_signature = prop[1]
+                        elif prop[0] == "OptimizeVertexCache":
+                            scs_globals.export_optimize_vertex_cache = prop[1]
+                        elif prop[0] == "Incremental":
+                            scs_globals.export_incremental = prop[1]
                 elif section.type == "GlobalDisplay":
                     for prop in section.props:
                         if prop[0] in ("", "#"):
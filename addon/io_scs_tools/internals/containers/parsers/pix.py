@@ -18,11 +18,23 @@
 
 # Copyright (C) 2013-2014: SCS Software
 
+import io
 import re
 from mathutils import Matrix
 from io_scs_tools.utils.printout import print_section
 from io_scs_tools.internals.structure import SectionData as _SectionData
+from io_scs_tools.internals.structure import StreamData as _StreamData
 from io_scs_tools.utils.convert import hex_string_to_float
+from io_scs_tools.utils.convert import hex_strings_to_floats
+
+# precompiled patterns used by line classification and data parsing
+_FIRST_TOKEN_RE = re.compile(r'[^ :(]*')
+_PROP_SPLIT_RE = re.compile(r'[:\(\r\n]+')
+_LIST_SPLIT_RE = re.compile(r'[, ]+')
+_SPACES_SPLIT_RE = re.compile(r'[ ]+')
+_BRACKETS_SPLIT_RE = re.compile(r'[()]+')
+# most common data line: index followed by single bracketed list of numbers, e.g. "0     ( &3f800000  &00000000 )"
+_SIMPLE_DATA_RE = re.compile(r' *([0-9]+) *\( *([&0-9a-fA-F.+\- ]*[&0-9a-fA-F.]) *\)$')
 
 
 def _get_prop(line):
@@ -33,7 +45,7 @@ def _get_prop(line):
     :return: Data property value in appropriate data type
     :rtype: various
     """
-    prop_split = re.split(r'[:\(\r\n]+', line, 1)
+    prop_split = _PROP_SPLIT_RE.split(line, 1)
     prop = []
     if len(prop_split) == 2:
         # print('-prop_split: "%s"' % str(prop_split))
@@ -68,7 +80,7 @@ def _get_prop(line):
                                 if prop_value.endswith(")"):
                                     val_list = []
                                     prop_values_only = prop_value[1:-1]
-                                    for string in re.split(r'[, ]+', prop_values_only):
+                                    for string in _LIST_SPLIT_RE.split(prop_values_only):
                                         if string:
                                             val = "<error>"
                                             if string.startswith("&"):
@@ -94,7 +106,7 @@ def _get_prop(line):
                                     # LIST OF HEX NUMBERS
                                     prop_value = tuple(val_list)
                                 else:
-                                    prop_values = re.split(r'[ ]+', prop_value)
+                                    prop_values = _SPACES_SPLIT_RE.split(prop_value)
                                     prop_value = []
                                     for val in prop_values:
                                         # SEQUENCE OF INTS (without brackets)
@@ -123,21 +135,56 @@ def _get_prop(line):
     return prop
 
 
-def _read_matrix(file, line_split):
+def _read_matrix(tokens, line_split):
     """Reads the other lines to make a matrix."""
     matrix = Matrix()
     for row in range(4):
-        for col in range(4):
-            matrix[row][col] = hex_string_to_float(line_split[col])
+        matrix[row] = hex_strings_to_floats(line_split[:4])
         if row < 3:
-            data_type, line = next_line(file)
-            line_split = re.split(' +', line.strip())
+            data_type, line = next(tokens)
+            line_split = _SPACES_SPLIT_RE.split(line.strip())
     return matrix
 
 
-def _get_data(file, line):
+def _get_values(data_str_values):
+    """Takes list of number strings and returns list of its values.
+
+    :param data_str_values: hexadecimal, float or integer number strings
+    :type data_str_values: list of str
+    :return: list of converted values
+    :rtype: list of float | int
+    """
+    # whole row of hexadecimal values can be converted at once
+    if data_str_values[0][0] == '&':
+        try:
+            return list(hex_strings_to_floats(data_str_values))
+        except ValueError:
+            pass
+
+    data = []
+    for data_str in data_str_values:
+        if data_str[0] == '&':
+            val = hex_string_to_float(data_str)
+        elif "." in data_str:
+            val = float(data_str)
+        else:
+            val = int(data_str)
+        data.append(val)
+    return data
+
+
+def _get_data(tokens, line):
     """Takes single data line and returns data index and list of its values."""
-    data_split = re.split(r'[()]+', line)
+
+    # SIMPLE DATA - fast path for the most common lines, anything unusual is left for the full parsing below
+    match = _SIMPLE_DATA_RE.match(line)
+    if match:
+        try:
+            return int(match.group(1)), _get_values(match.group(2).split())
+        except (ValueError, IndexError):
+            pass
+
+    data_split = _BRACKETS_SPLIT_RE.split(line)
     # print('data_split: "%s"' % data_split)
 
     # SKINNING DATA
@@ -145,14 +192,14 @@ def _get_data(file, line):
         try:
             data_index = int(data_split[0].strip())
             data_gap = data_split[1].strip()
-            data_vec = re.split(' +', data_split[2].strip())  # This value is not used anymore.
+            data_vec = _SPACES_SPLIT_RE.split(data_split[2].strip())  # This value is not used anymore.
             data = {}
             if data_gap == "" and len(data_vec) == 3:
                 # print('  %i - %r - %s' % (data_index, data_gap, data_vec))
 
                 # WEIGHTS
-                data_type, line = next_line(file)
-                line_split = re.split(' +', line.strip())
+                data_type, line = next(tokens)
+                line_split = _SPACES_SPLIT_RE.split(line.strip())
                 if line_split[0] == "Weights:":
                     # print('%s  =-> "%s"' % (data_type, line_split))
                     data['weights'] = []
@@ -163,8 +210,8 @@ def _get_data(file, line):
                         data['weights'].append((w_index, w_value))
 
                 # CLONES
-                data_type, line = next_line(file)
-                line_split = re.split(' +', line.strip())
+                data_type, line = next(tokens)
+                line_split = _SPACES_SPLIT_RE.split(line.strip())
                 if line_split[0] == "Clones:":
                     # print('%s  =-> "%s"' % (data_type, line_split))
                     data['clones'] = []
@@ -175,7 +222,7 @@ def _get_data(file, line):
                         data['clones'].append((c_piece, c_vertex))
 
                 # CLOSING BRACKET
-                data_type, line = next_line(file)
+                data_type, line = next(tokens)
                 # line_split = re.split(' +', line.strip())
                 # print('%s  =-> "%s"' % (data_type, line_split))
         except:
@@ -184,7 +231,7 @@ def _get_data(file, line):
     else:
         try:
             data_index = int(data_split[0].strip())
-            data_str_values = re.split(r'[ ]+', data_split[1].strip())
+            data_str_values = _SPACES_SPLIT_RE.split(data_split[1].strip())
             # print('data_str_values: "%s"' % data_str_values)
 
             # BONE LIST
@@ -200,7 +247,7 @@ def _get_data(file, line):
                 except:
                     print('WARNING - Unhandled case in "Animation Matrices" line "%s"! Skipped...' % line)
                     return None, []
-                data = _read_matrix(file, data_str_values)
+                data = _read_matrix(tokens, data_str_values)
 
             # BONE STRUCTURE
             elif data_str_values[0] == "Name:":
@@ -211,48 +258,41 @@ def _get_data(file, line):
                     # print('    data_str_values: "%s"' % data_str_values)
 
                     # PARENT
-                    data_type, line = next_line(file)
-                    line_split = re.split(' +', line.strip())
+                    data_type, line = next(tokens)
+                    line_split = _SPACES_SPLIT_RE.split(line.strip())
                     if line_split[0] == "Parent:":
                         parent = line_split[1][1:-1]
                         data['parent'] = parent
                     # print('%s  =-> "%s"' % (data_type, line_split))
 
                     # MATRIX - LINE 1
-                    data_type, line = next_line(file)
-                    line_split = re.split(' +', line.strip())
+                    data_type, line = next(tokens)
+                    line_split = _SPACES_SPLIT_RE.split(line.strip())
                     if line_split[0] == "Matrix:":
-                        matrix = _read_matrix(file, line_split[2:])
+                        matrix = _read_matrix(tokens, line_split[2:])
 
                         # CLOSING BRACKET
-                        data_type, line = next_line(file)
+                        data_type, line = next(tokens)
                         data['matrix'] = matrix
             else:
-                data = []
-                for data_str in data_str_values:
-                    if data_str[0] == '&':
-                        val = hex_string_to_float(data_str)
-                    elif "." in data_str:
-                        val = float(data_str)
-                    else:
-                        val = int(data_str)
-                    data.append(val)
+                data = _get_values(data_str_values)
         except:
             print('WARNING - Unhandled case in "Data" line "%s"! Skipped...' % line)
             return None, []
     return data_index, data
 
 
-def _read_section(file, section_ids, pix_container):
+def _read_section(tokens, section_ids, pix_container):
     """This function reads the nested sections. It recursively
     calls itself to read all levels of data hierarchy."""
     data_type = ''
     props = []
-    data = []
+    # stream rows are decoded straight into typed storage, other data stays in plain list
+    data = _StreamData() if section_ids.type == "Stream" else []
     data_index = 0
     section_type = ''
     while data_type != 'SE_E':
-        data_type, line = next_line(file)
+        data_type, line = next(tokens)
         if data_type in ('EOF', 'ERR'):
             break
         # print('%s  =-> "%s"' % (type, line))
@@ -264,11 +304,18 @@ def _read_section(file, section_ids, pix_container):
                 props.append(prop)
         elif data_type == 'data':
             # print('line: "%s"' % line)
-            dat_index, dat = _get_data(file, line)
+            dat_index, dat = _get_data(tokens, line)
             if dat_index == data_index:
                 # print('dat: %s' % dat)
                 data_index += 1
-                if dat != []:
+                if dat == []:
+                    pass
+                elif isinstance(data, _StreamData):
+                    if not data.append(dat):
+                        # row doesn't fit into typed storage, fallback to plain list
+                        data = data.to_list()
+                        data.append(dat)
+                else:
                     data.append(dat)
             else:
                 print('WARNING - Inconsistent data indexing in line: "%s"! Skipping...' % line)
@@ -282,28 +329,89 @@ def _read_section(file, section_ids, pix_container):
             print('comment section: "%s"' % line)
         elif data_type == 'SE_S':
             # section_type = re.split(r'[ ]+', line)[0]
-            type_line = re.split(r'[ ]+', line)
+            type_line = _SPACES_SPLIT_RE.split(line)
             for rec in type_line:
                 if rec != '':
                     try:
-                        section_type = re.split(r'[ ]+', line)[1]
+                        section_type = type_line[1]
                     except:
                         section_type = ''
                         print('WARNING - Unknown data in line: "%s"! Skipping...' % line)
                     break
             new_section_ids = _SectionData(section_type)
-            new_section, pix_container = _read_section(file, new_section_ids, pix_container)
+            new_section, pix_container = _read_section(tokens, new_section_ids, pix_container)
             section_ids.sections.append(new_section)
             # pix_container.append(new_section)
         if data_type != 'SE_E':
             section_ids.props = props
-            section_ids.data = data
+            section_ids.data = data if len(data) > 0 else []
     return section_ids, pix_container
 
 
+def _classify_line(line):
+    """Takes single line without line ending and returns its data type
+    together with the line itself (property lines get cut off comments).
+
+    :param line: A single line from a file
+    :type line: str
+    :return: (data type, line)
+    :rtype: tuple of (str, str)
+    """
+    if _SIMPLE_DATA_RE.match(line):
+        return 'data', line
+
+    stripped_line = line.strip()
+    if stripped_line.startswith("#"):
+        # NOTE: comment sections are not recognized, lines starting with "#" are always comment lines
+        return 'line_C', line
+    elif line == "":
+        return 'empty_line', line
+    elif "{" in line:
+        return 'SE_S', line
+    elif "}" in line:
+        return 'SE_E', line
+
+    try:
+        int(_FIRST_TOKEN_RE.match(stripped_line).group())
+    except ValueError:
+        if "#" in stripped_line:  # Cut off the comments in property lines
+            line = stripped_line.split("#", 1)[0]
+        return 'Prop', line
+
+    return 'data', line
+
+
+def _tokenize(file):
+    """Generator classifying lines of given file one by one in a single pass.
+    Once the end of file or undecodable line is reached it keeps yielding
+    'EOF' or 'ERR' data type, so readers can ask for next token without checking for the end.
+
+    :param file: opened file
+    :type file: io.TextIOWrapper
+    :return: generator of (data type, line) tuples
+    :rtype: collections.Iterable[tuple of (str, str)]
+    """
+    data_type = 'EOF'
+    try:
+        for line in file:
+            if line[-1] in '\r\n':
+                line = line[:-1]
+            yield _classify_line(line)
+    except UnicodeDecodeError:
+        data_type = 'ERR'
+
+    while True:
+        yield data_type, ''
+
+
 def next_line(file):
-    """Takes a file..."""
-    data_type = ''
+    """Takes a file, reads next line from it and returns its data type together with the line.
+
+    :param file: opened file
+    :type file: io.TextIOWrapper
+    :return: (data type, line)
+    :rtype: tuple of (str, str)
+    """
     try:
         line = file.readline()
     except UnicodeDecodeError:
@@ -312,36 +420,68 @@ def next_line(file):
         return 'EOF', ''
     if line[-1] in '\r\n':
         line = line[:-1]
-    if line.startswith("#"):
-        # print('  comment section "%s"' % line.strip())
-        # type = 'SE_C'  # TODO: Parsing of Comment Sections isn't finished!
-        data_type = 'line_C'
-    elif line.strip().startswith("#"):
-        # print('  comment line "%s"' % line.strip())
-        data_type = 'line_C'
-    elif line == "":
-        data_type = 'empty_line'
-    elif "{" in line:
-        data_type = 'SE_S'
-    elif "}" in line:
-        data_type = 'SE_E'
-    else:
-        line_split = re.split(r'[ :\(]+', line.strip(), 1)
-        try:
-            line_index = int(line_split[0])
-            # print('line_index: %s' % line_index)
-        except:
-            if "#" in line.strip():  # Cut off the comments in property lines
-                line_split = re.split(r'#', line.strip(), 1)
-                line = line_split[0]
-            # print(' +--+ line: %s' % line)
-            data_type = 'Prop'
-        else:
-            data_type = 'data'
-            # if line_index == 0:
-            # print(' xOx line: %s' % str(line))
-            # print('"%s" - line_split: %s' % (type, line_split))
-    return data_type, line
+    return _classify_line(line)
+
+
+def scan_section(file):
+    """Scans binary file from its current position up to the end of next top level section,
+    without parsing any of the section content.
+
+    :param file: file opened in binary mode
+    :type file: io.BufferedReader
+    :return: (section type, start byte offset, end byte offset) or None if there is no more sections
+    :rtype: tuple of (str, int, int) | None
+    """
+    section_type = start = None
+    depth = 0
+    offset = file.tell()
+    for line in iter(file.readline, b''):
+        line_start = offset
+        offset += len(line)
+
+        if line.strip().startswith(b"#"):
+            continue
+        elif b"{" in line:
+            if depth == 0:
+                line = line.decode("utf8", errors="replace").rstrip("\n").rstrip("\r")
+                section_type = _SPACES_SPLIT_RE.split(line)[0]
+                start = line_start
+            depth += 1
+        elif b"}" in line and depth > 0:
+            depth -= 1
+            if depth == 0:
+                return section_type, start, offset
+
+    # unclosed section is running till the end of file, same as in full parsing
+    if depth > 0:
+        return section_type, start, offset
+
+    return None
+
+
+def read_section(filepath, section_type, start, end):
+    """Reads and parses single top level section from given byte range of the file.
+
+    :param filepath: File path to be read
+    :type filepath: str
+    :param section_type: type of the section
+    :type section_type: str
+    :param start: byte offset of the section opening line
+    :type start: int
+    :param end: byte offset right after the section closing line
+    :type end: int
+    :return: parsed section
+    :rtype: io_scs_tools.internals.structure.SectionData
+    """
+    with open(filepath, mode="rb") as file:
+        file.seek(start)
+        section_bytes = file.read(end - start)
+
+    tokens = _tokenize(io.TextIOWrapper(io.BytesIO(section_bytes), encoding="utf8"))
+    next(tokens)  # skip opening line of the section
+
+    section, pix_container = _read_section(tokens, _SectionData(section_type), [])
+    return section
 
 
 def read_data(filepath, ind, print_info=False):
@@ -362,17 +502,17 @@ def read_data(filepath, ind, print_info=False):
         print('   filepath: %r' % str(filepath))
     pix_container = []
 
-    # if filepath:
     file = open(filepath, mode="r", encoding="utf8")
+    tokens = _tokenize(file)
     while 1:
-        data_type, line = next_line(file)
+        data_type, line = next(tokens)
         if data_type in ('EOF', 'ERR'):
             break
         # print('%s  ==> "%s"' % (data_type, line))
         if data_type == 'SE_S':
-            section_type = re.split(r'[ ]+', line)[0]
+            section_type = _SPACES_SPLIT_RE.split(line)[0]
             section_ids = _SectionData(section_type)
-            section, pix_container = _read_section(file, section_ids, pix_container)
+            section, pix_container = _read_section(tokens, section_ids, pix_container)
             pix_container.append(section)
     file.close()
 
@@ -386,4 +526,4 @@ def read_data(filepath, ind, print_info=False):
             for sec in section.sections:
                 print_section(sec, ind)
         print('** PIx Parser END')
-    return pix_container, data_type
\ No newline at end of file
+    return pix_container, data_type
@@ -20,38 +20,155 @@
 
 import os
 import re
+import time
 from mathutils import Vector
+from io_scs_tools.internals.containers import pix_cache as _pix_cache
 from io_scs_tools.internals.containers.parsers import pix as _pix_parser
 from io_scs_tools.internals.containers.writers import pix as _pix_writer
 from io_scs_tools.internals.structure import SectionData as _SectionData
 from io_scs_tools.utils import path as _path_utils
 from io_scs_tools.utils.printout import lprint
 
+_deferred_writes = None
+"""Deferred writes as list of tuples (container, filepath, ind, print_info); None when writes are not being deferred."""
+
+
+class LazySectionData(_SectionData):
+    """Top level PIX section which is parsed from the file only when its content is accessed.
+    Type of the section is known from the section index, so it's available without parsing.
+    """
+    __slots__ = ("__filepath", "__start", "__end", "__section")
+
+    def __init__(self, filepath, data_type, start, end):
+        self.type = data_type
+        self.__filepath = filepath
+        self.__start = start
+        self.__end = end
+        self.__section = None
+
+    def __get_section(self):
+        if self.__section is None:
+            self.__section = _pix_parser.read_section(self.__filepath, self.type, self.__start, self.__end)
+        return self.__section
+
+    @property
+    def props(self):
+        return self.__get_section().props
+
+    @props.setter
+    def props(self, value):
+        self.__get_section().props = value
+
+    @property
+    def data(self):
+        return self.__get_section().data
+
+    @data.setter
+    def data(self, value):
+        self.__get_section().data = value
+
+    @property
+    def sections(self):
+        return self.__get_section().sections
+
+    @sections.setter
+    def sections(self, value):
+        self.__get_section().sections = value
+
+    def get_prop(self, prop_key):
+        return self.__get_section().get_prop(prop_key)
+
+    def get_section(self, key):
+        return self.__get_section().get_section(key)
+
+    def get_sections(self, key):
+        return self.__get_section().get_sections(key)
+
+
+class LazyContainer(object):
+    """Read only list like container of top level sections from PIX file.
+    Byte offsets of the sections are indexed incrementally as far as the container is being read
+    and sections content is parsed only on access, so reading just first sections
+    (like "Header" or "Global") doesn't depend on the size of the file.
+    """
+
+    def __init__(self, filepath):
+        self.__filepath = filepath
+        self.__sections = []
+        """:type: list[LazySectionData]"""
+        self.__scan_offset = 0  # byte offset from where next section should be searched for, None once whole file is indexed
+
+    def __index_next(self):
+        """Indexes next top level section of the file.
+
+        :return: True if new section was indexed; False if whole file is already indexed
+        :rtype: bool
+        """
+        if self.__scan_offset is None:
+            return False
+
+        with open(self.__filepath, mode="rb") as file:
+            file.seek(self.__scan_offset)
+            section_entry = _pix_parser.scan_section(file)
+
+        if section_entry is None:
+            self.__scan_offset = None
+            return False
+
+        section_type, start, end = section_entry
+        self.__sections.append(LazySectionData(self.__filepath, section_type, start, end))
+        self.__scan_offset = end
+        return True
+
+    def __iter__(self):
+        i = 0
+        while i < len(self.__sections) or self.__index_next():
+            yield self.__sections[i]
+            i += 1
+
+    def __len__(self):
+        while self.__index_next():
+            pass
+        return len(self.__sections)
+
+    def __bool__(self):
+        return len(self.__sections) > 0 or self.__index_next()
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        while index >= len(self.__sections) and self.__index_next():
+            pass
+        return self.__sections[index]
+
+    def get_section(self, key):
+        """Returns firstly found top level section of given name, indexing file only up to it.
+
+        :param key: Name of the section
+        :type key: str
+        :return: PIX section data
+        :rtype: LazySectionData | None
+        """
+        for section in self:
+            if section.type == key:
+                return section
+        return None
+
 
 def fast_check_for_pia_skeleton(pia_filepath, skeleton):
     """Check for the skeleton record in PIA file without parsing the whole file.
     It takes filepath and skeleton name (string) and returns True if the skeleton
     record in the file is the same as skeleton name provided, otherwise False."""
-    file = open(pia_filepath, mode="r", encoding="utf8")
-    while 1:
-        data_type, line = _pix_parser.next_line(file)
-        if data_type in ('EOF', 'ERR'):
-            break
-        # print('%s  ==> "%s"' % (data_type, line))
-        if data_type == 'SE_S':
-            section_type = re.split(r'[ ]+', line)[0]
-            if section_type == "Global":
-                # print('  %s' % section_type)
-                data_type, line = _pix_parser.next_line(file)
-                ske = re.split(r'"', line)[1]
-                # print('  %r | %r' % (ske, skeleton))
-                pia_skeleton = os.path.join(os.path.dirname(pia_filepath), ske)
-                if os.path.isfile(pia_skeleton) and os.path.samefile(pia_skeleton, skeleton):
-                    file.close()
-                    return True
-                break
-    file.close()
-    return False
+    global_section = LazyContainer(pia_filepath).get_section("Global")
+    if global_section is None:
+        return False
+
+    ske = global_section.get_prop_value("Skeleton")
+    if not isinstance(ske, str):
+        return False
+
+    pia_skeleton = os.path.join(os.path.dirname(pia_filepath), ske)
+    return os.path.isfile(pia_skeleton) and os.path.samefile(pia_skeleton, skeleton)
 
 
 def utter_check_for_pia_skeleton(pia_filepath, armature):
@@ -178,8 +295,9 @@ def make_vertex_stream(stream_raw, name=''):
     return stream
 
 
-def get_data_from_file(filepath, ind, print_info=False):
+def get_data_from_file(filepath, ind, print_info=False, lazy=False, use_cache=False):
     """Returns entire data in data container from specified PIX file.
+    NOTE: when cache is used, lazy is ignored as containers are always cached whole.
 
     :param filepath: File path to be read
     :type filepath: str
@@ -187,28 +305,50 @@ def get_data_from_file(filepath, ind, print_info=False):
     :type ind: str
     :param print_info: Whether to print the debug printouts
     :type print_info: bool
+    :param lazy: should lazy container be returned, which parses sections only once they are accessed
+    :type lazy: bool
+    :param use_cache: should parsed container be taken from or stored into the cache of parsed PIX files
+    :type use_cache: bool
     :return: PIX Section Object Data
-    :rtype: list of SectionData
+    :rtype: list of SectionData | LazyContainer
     """
 
     if filepath is None:
         lprint("D Aborting PIX file read, 'None' file!")
         return None
 
+    if use_cache:
+        container = _pix_cache.load(filepath)
+        if container is not None:
+            return container
+
+    elif lazy:
+        container = LazyContainer(filepath)
+        if not container:
+            lprint('\nE File "%s" is empty!', (_path_utils.readable_norm(filepath),))
+            return None
+
+        return container
+
     # print('    filepath: "%s"\n' % filepath)
     container, state = _pix_parser.read_data(filepath, ind, print_info)
     if len(container) < 1:
         lprint('\nE File "%s" is empty!', (_path_utils.readable_norm(filepath),))
         return None
 
+    if use_cache:
+        _pix_cache.store(filepath, container)
+
     # print_container(container)  # TEST PRINTOUTS
     # write_config_file(container, filepath, ind, "_reex")  # TEST REEXPORT
 
     return container
 
 
-def write_data_to_file(container, filepath, ind, print_info=False):
+def write_data_to_file(container, filepath, ind, print_info=False, deferrable=False):
     """Exports given container in given filepath.
+    NOTE: if writes are being deferred and write is deferrable, container is only queued
+    and written to the file once "write_deferred_writes" or "end_deferred_writes" is called.
 
     :param container:
     :type container:
@@ -218,7 +358,9 @@ def write_data_to_file(container, filepath, ind, print_info=False):
     :type ind: str
     :param print_info: should infos be printed
     :type print_info: bool
-    :return: True if export was successfull, otherwise False
+    :param deferrable: can write be deferred; container must not be changed after this call in that case
+    :type deferrable: bool
+    :return: True if export was successfull or write was deferred, otherwise False
     :rtype: bool
     """
 
@@ -226,10 +368,102 @@ def write_data_to_file(container, filepath, ind, print_info=False):
     # path will be properly readable even on windows. Without mixed back and forward slashes.
     filepath = _path_utils.readable_norm(filepath)
 
+    if deferrable and _deferred_writes is not None:
+        _deferred_writes.append((container, filepath, ind, print_info))
+        lprint("D Writing of file deferred:\n\t   %r", (filepath,))
+        return True
+
     result = _pix_writer.write_data(container, filepath, ind, print_info=print_info)
+    return __report_write_result(filepath, result)
+
+
+def __report_write_result(filepath, result):
     if result != {'FINISHED'}:
         lprint("E Unable to export data into file:\n\t   %r\n\t   For details check printouts above.", (filepath,))
         return False
     else:
         lprint("I File created!")
         return True
+
+
+def begin_deferred_writes():
+    """Starts deferring of deferrable writes. Deferred containers are written once "write_deferred_writes"
+    or "end_deferred_writes" is called, so all the files of exported game object can be checked before they are written.
+    """
+    global _deferred_writes
+    _deferred_writes = []
+
+
+def get_deferred_writes_count():
+    """Gets number of currently deferred writes.
+
+    :return: number of deferred writes; 0 if writes are not being deferred
+    :rtype: int
+    """
+    if _deferred_writes is None:
+        return 0
+
+    return len(_deferred_writes)
+
+
+def get_deferred_writes(start=0):
+    """Gets currently deferred writes.
+
+    :param start: index of the first deferred write to be returned
+    :type start: int
+    :return: deferred writes as tuples of (container, filepath) in the order as they were deferred
+    :rtype: list[(list[io_scs_tools.internals.structure.SectionData], str)]
+    """
+    if _deferred_writes is None:
+        return []
+
+    return [(container, filepath) for container, filepath, ind, print_info in _deferred_writes[start:]]
+
+
+def cancel_deferred_writes(start):
+    """Cancels deferred writes, so their files won't be written.
+
+    :param start: index of the first deferred write to be canceled, all the writes deferred after it are canceled too
+    :type start: int
+    """
+    if _deferred_writes is not None:
+        del _deferred_writes[start:]
+
+
+def write_deferred_writes():
+    """Writes all currently deferred containers to files and removes them from deferred writes,
+    so they don't have to be kept in memory anymore. Writes stay deferred after this call.
+
+    :return: write results in the same order as writes were deferred as tuples of
+    (filepath, True if file was written or False otherwise, seconds spent for writing)
+    :rtype: list[(str, bool, float)]
+    """
+    if not _deferred_writes:
+        return []
+
+    deferred_writes = list(_deferred_writes)
+    del _deferred_writes[:]
+
+    results = []
+    while deferred_writes:
+        container, filepath, ind, print_info = deferred_writes.pop(0)  # pop, so container is released once written
+
+        start_time = time.time()
+        result = _pix_writer.write_data(container, filepath, ind, print_info=print_info)
+        results.append((filepath, __report_write_result(filepath, result), time.time() - start_time))
+
+    return results
+
+
+def end_deferred_writes():
+    """Stops deferring of writes and writes all remaining deferred containers to files.
+
+    :return: write results in the same order as writes were deferred as tuples of
+    (filepath, True if file was written or False otherwise, seconds spent for writing)
+    :rtype: list[(str, bool, float)]
+    """
+    global _deferred_writes
+    try:
+        return write_deferred_writes()
+    finally:
+        _deferred_writes = None
@@ -0,0 +1,246 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Copyright (C) 2017: SCS Software
+
+import copyreg
+import io
+import os
+import pickle
+from hashlib import sha1
+from mathutils import Matrix
+from io_scs_tools.utils import path as _path_utils
+from io_scs_tools.utils.printout import lprint
+
+_CACHE_VERSION = 1
+"""Version of cached data. Increase it whenever structure of parsed containers changes, to invalidate old cache files."""
+
+_CACHE_FILE_EXT = ".pixcache"
+"""Extension of cache files."""
+
+_CACHE_TMP_FILE_EXT = _CACHE_FILE_EXT + ".tmp"
+"""Extension of temporary cache files, which are being written."""
+
+_CACHE_SIZE_LIMIT = 512 * 1024 * 1024
+"""Maximum size of all cache files in bytes. Once exceeded, least recently used files are deleted."""
+
+_stats = {"hits": 0, "misses": 0}
+"""Number of cache hits and misses since Blender start or last stats reset."""
+
+
+def _make_matrix(rows):
+    """Makes matrix from given rows when unpickling.
+
+    :param rows: rows of the matrix
+    :type rows: tuple[tuple[float]]
+    :return: matrix
+    :rtype: mathutils.Matrix
+    """
+    return Matrix(rows)
+
+
+def _reduce_matrix(matrix):
+    """Reduces matrix for pickling, as Blender matrices can't be pickled on their own.
+
+    :param matrix: matrix to be pickled
+    :type matrix: mathutils.Matrix
+    :return: matrix making function and tuple of matrix rows as its arguments
+    :rtype: (function, tuple)
+    """
+    return _make_matrix, (tuple(tuple(row) for row in matrix),)
+
+
+class _Pickler(pickle.Pickler):
+    """Pickler of parsed containers, which knows how to pickle Blender matrices.
+    NOTE: parsed PIS and PIA containers hold bone matrices, so they have to be picklable for storing into the cache.
+    Reducer is registered only in dispatch table of this pickler, so pickling of matrices elsewhere in Blender isn't changed.
+    """
+    dispatch_table = copyreg.dispatch_table.copy()
+    dispatch_table[Matrix] = _reduce_matrix
+
+
+def dumps(container):
+    """Pickles given parsed container the same way as it's stored into the cache.
+    Pickled container can be unpickled with plain "pickle.loads".
+
+    :param container: parsed PIX container
+    :type container: list[io_scs_tools.internals.structure.SectionData]
+    :return: pickled container
+    :rtype: bytes
+    """
+    data = io.BytesIO()
+    _Pickler(data, pickle.HIGHEST_PROTOCOL).dump(container)
+    return data.getvalue()
+
+
+def _get_cache_key(filepath):
+    """Gets cache key of given PIX file.
+
+    :param filepath: path of the PIX file
+    :type filepath: str
+    :return: tuple of cache version, absolute path, size and modification time of the file
+    :rtype: tuple
+    """
+    abs_path = os.path.normcase(os.path.abspath(filepath))
+    stat = os.stat(abs_path)
+    return _CACHE_VERSION, abs_path, stat.st_size, stat.st_mtime_ns
+
+
+def _get_cache_filepath(abs_path):
+    """Gets path of the cache file for given absolute path of PIX file.
+
+    :param abs_path: normalized absolute path of the PIX file
+    :type abs_path: str
+    :return: path of the cache file
+    :rtype: str
+    """
+    return os.path.join(_path_utils.get_parsed_cache_dirpath(), sha1(abs_path.encode("utf8")).hexdigest() + _CACHE_FILE_EXT)
+
+
+def _remove_file(filepath):
+    try:
+        os.remove(filepath)
+    except OSError:
+        pass
+
+
+def _evict():
+    """Deletes least recently used cache files until size of the cache is within the limit.
+    """
+    cache_dir = _path_utils.get_parsed_cache_dirpath()
+
+    cache_files = []
+    cache_size = 0
+    for filename in os.listdir(cache_dir):
+        # temporary files are counted as well, so that ones left behind by interrupted writes get evicted too
+        if not filename.endswith((_CACHE_FILE_EXT, _CACHE_TMP_FILE_EXT)):
+            continue
+
+        filepath = os.path.join(cache_dir, filename)
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            continue
+
+        cache_files.append((stat.st_mtime, stat.st_size, filepath))
+        cache_size += stat.st_size
+
+    cache_files.sort()
+    for mtime, size, filepath in cache_files:
+        if cache_size <= _CACHE_SIZE_LIMIT:
+            break
+
+        lprint("D Evicting parsed PIX cache file: %r", (filepath,))
+        _remove_file(filepath)
+        cache_size -= size
+
+
+def load(filepath):
+    """Loads parsed container of given PIX file from cache.
+    Container is returned only if file didn't change since it was cached.
+
+    :param filepath: path of the PIX file
+    :type filepath: str
+    :return: parsed PIX container if found in cache; None otherwise
+    :rtype: list[io_scs_tools.internals.structure.SectionData] | None
+    """
+    try:
+        cache_key = _get_cache_key(filepath)
+    except OSError:
+        _stats["misses"] += 1
+        return None
+
+    cache_filepath = _get_cache_filepath(cache_key[1])
+    container = None
+    try:
+        with open(cache_filepath, mode="rb") as cache_file:
+            if pickle.load(cache_file) == cache_key:
+                container = pickle.load(cache_file)
+    except FileNotFoundError:
+        pass
+    except Exception as e:  # any problem with cache file means it's unusable, so it's simply ignored
+        lprint("D Ignoring invalid parsed PIX cache file %r: %s", (cache_filepath, e))
+
+    if container is None:
+        _stats["misses"] += 1
+        return None
+
+    # update access time, so that recently used files are evicted last
+    try:
+        os.utime(cache_filepath)
+    except OSError:
+        pass
+
+    _stats["hits"] += 1
+    return container
+
+
+def store(filepath, container):
+    """Stores parsed container of given PIX file into cache and evicts least recently used
+    cache files, if cache grows over the limit.
+
+    :param filepath: path of the PIX file
+    :type filepath: str
+    :param container: parsed PIX container
+    :type container: list[io_scs_tools.internals.structure.SectionData]
+    :return: True if container was stored; False otherwise
+    :rtype: bool
+    """
+    tmp_cache_filepath = None
+    try:
+        cache_key = _get_cache_key(filepath)
+        cache_filepath = _get_cache_filepath(cache_key[1])
+
+        # write into temporary file first, so that cache file is never left half written
+        tmp_cache_filepath = cache_filepath[:-len(_CACHE_FILE_EXT)] + _CACHE_TMP_FILE_EXT
+        with open(tmp_cache_filepath, mode="wb") as cache_file:
+            pickler = _Pickler(cache_file, pickle.HIGHEST_PROTOCOL)
+            pickler.dump(cache_key)
+            pickler.clear_memo()  # key and container are loaded separately, so container can't reference objects from key
+            pickler.dump(container)
+
+        if os.path.getsize(tmp_cache_filepath) > _CACHE_SIZE_LIMIT:
+            _remove_file(tmp_cache_filepath)
+            return False
+
+        os.replace(tmp_cache_filepath, cache_filepath)
+        _evict()
+    except Exception as e:
+        if tmp_cache_filepath:
+            _remove_file(tmp_cache_filepath)
+
+        lprint("W Parsed PIX container of %r couldn't be cached: %s", (filepath, e))
+        return False
+
+    return True
+
+
+def get_stats():
+    """Gets number of cache hits and misses since Blender start or last reset.
+
+    :return: tuple of hits and misses count
+    :rtype: (int, int)
+    """
+    return _stats["hits"], _stats["misses"]
+
+
+def reset_stats():
+    """Resets cache hits and misses counters.
+    """
+    _stats["hits"] = 0
+    _stats["misses"] = 0
@@ -19,67 +19,104 @@
 # Copyright (C) 2013-2014: SCS Software
 
 from io_scs_tools.utils.convert import float_to_hex_string
+from io_scs_tools.utils.convert import floats_to_hex_strings
 from io_scs_tools.utils.printout import lprint
 
+_WRITE_BUFFER_SIZE = 16384
+"""Number of formatted strings collected in write buffer before they are written into the file at once."""
+
+_NON_QUOTED_PROP_VALUES = ("FLOAT", "FLOAT2", "FLOAT3", "FLOAT4", "FLOAT5", "FLOAT6", "FLOAT7", "FLOAT8", "FLOAT9", "FLOAT4x4",
+                           "INT", "INT2", "STRING")
+"""String property values which are written without quotes."""
+
+_DATA_LINE_TAGS = ("__bone__", "__string__", "__skin__", "__matrix__", "__time__")
+"""Tags of data lines which have their own formatting."""
+
+
+class _WriteBuffer(object):
+    """Write buffer collecting formatted strings and writing them into the file in big chunks,
+    instead of writing each line separately.
+    """
+
+    def __init__(self, file, size=_WRITE_BUFFER_SIZE):
+        self.__file = file
+        self.__size = size
+        self.__parts = []
+        self.write = self.__parts.append
+
+    def flush(self, force=False):
+        """Writes collected strings into the file once buffer is full.
+
+        :param force: write collected strings even if buffer is not full yet
+        :type force: bool
+        """
+        if force or len(self.__parts) >= self.__size:
+            self.__file.write("".join(self.__parts))
+            self.__parts.clear()
+
 
 def _format_matrix(mat, ind, offset):
-    str_mat = ""
-    for line in mat:
-        str_line = ""
-        for val in line:
-            str_line = str_line + " " + float_to_hex_string(val) + " "
-        if str_mat == "":
-            str_mat = str_line
-        else:
-            str_mat = str_mat + "\n" + ind + offset + str_line[:-1]
-    return str_mat
+    str_rows = [" " + "  ".join(floats_to_hex_strings(line)) for line in mat]
+    str_rows[0] += " "
+    return ("\n" + ind + offset).join(str_rows)
 
 
 def _format_bone(data_line, ind):
     """Takes a list or tuple of float numbers and return
     formatted line of hexadecimal values in a string."""
-    line_start = str(ind + (8 * " "))
+    line_start = ind + (8 * " ")
     bone_name = data_line[1]
-    if data_line[2]:
-        bone_parent = str(data_line[2].name)
-    else:
+    if not data_line[2]:
         bone_parent = ""
-    bone_matrix = _format_matrix(data_line[3], ind, str(17 * " "))
-    data = str('Name:  "' + bone_name + '"\n' + line_start + 'Parent: "' + bone_parent + '"\n' + line_start + 'Matrix: (' + bone_matrix + ' )')
-    return data
+    elif isinstance(data_line[2], str):
+        bone_parent = data_line[2]
+    else:
+        bone_parent = str(data_line[2].name)
+    bone_matrix = _format_matrix(data_line[3], ind, 17 * " ")
+    return "".join(('Name:  "', bone_name, '"\n', line_start, 'Parent: "', bone_parent, '"\n', line_start, 'Matrix: (', bone_matrix, ' )'))
 
 
 def _format_data(data_line, spaces=5, data_hex=True):
     """Takes a list or tuple of float numbers and return
     formatted line of hexadecimal values in a string."""
-    data = ''
     if isinstance(data_line[0], float):
         if data_hex:
-            for val in data_line:
-                data = data + float_to_hex_string(val) + '  '
+            return "  ".join(floats_to_hex_strings(data_line))
         else:
-            for val in data_line:
-                data = data + str(val) + ' '
-        data = data.rstrip()
+            return " ".join([str(val) for val in data_line]).rstrip()
     elif isinstance(data_line[0], str):
-        for val in data_line:
-            data = data + '"' + val + '" '
-        data = data.rstrip()
+        return " ".join(['"' + val + '"' for val in data_line])
     else:
         if spaces == 0:
-            for val in data_line:
-                data = data + str(val) + ' '
+            return " ".join([str(val) for val in data_line]).rstrip()
         else:
-            for val in data_line:
-                data = data + str(val).ljust(spaces, ' ') + ' '
-        data = data.rstrip()
+            return " ".join([str(val).ljust(spaces, ' ') for val in data_line]).rstrip()
 
-    return data
 
+def _format_skin(data_line, ind):
+    """Takes skin data line and returns its formatted lines (position, weights and clones) in a string."""
+    position = "  ".join(floats_to_hex_strings(data_line[1][0][:3]))
 
-def _write_properties_and_data(fw, section, ind, print_info):
+    weight_string = "   ".join([str(i[0]).ljust(5, ' ') + float_to_hex_string(i[1]) for i in data_line[1][1]])
+
+    clones = data_line[1][2]
+    clones_string = "".join([str(i[0]).ljust(5, ' ') + str(i[1]).ljust(7, ' ') for i in clones[:-1]])
+    if clones:
+        clones_string += str(clones[-1][0]).ljust(5, ' ') + str(clones[-1][1])
+
+    line_start = ind + 8 * " "
+    return "".join(("( ( ", position, " )\n",
+                    line_start, "Weights: ", str(len(data_line[1][1])).ljust(7, ' '), weight_string, "\n",
+                    line_start, "Clones: ", str(len(clones)).ljust(7, ' '), clones_string, "\n",
+                    ind, 6 * " ", ")"))
+
+
+def _write_properties_and_data(buffer, section, ind, print_info):
     """Takes a single section data and writes all its "properties"
-    and "data" to the file."""
+    and "data" to the file.
+    NOTE: "data" can be any iterable (list, stream data or generator); rows are consumed only once
+    and formatted one by one, so they don't have to exist in memory all at once."""
+    fw = buffer.write
     for prop in section.props:
         # if type(prop[1]) == type(None):
         if prop[1] is None:
@@ -102,8 +139,7 @@ def _write_properties_and_data(fw, section, ind, print_info):
             else:
                 fw('%s%s: %s\n' % (ind, prop[0], str(prop[1])[1:-1].replace(",", "").replace("'", "\"")))
         # elif type(prop[1]) == type("") and prop[1] not in (
-        elif isinstance(prop[1], type("")) and prop[1] not in (
-                "FLOAT", "FLOAT2", "FLOAT3", "FLOAT4", "FLOAT5", "FLOAT6", "FLOAT7", "FLOAT8", "FLOAT9", "FLOAT4x4", "INT", "INT2", "STRING"):
+        elif isinstance(prop[1], type("")) and prop[1] not in _NON_QUOTED_PROP_VALUES:
             if prop[0] == '#':
                 fw('%s# %s\n' % (ind, prop[1]))
             elif prop[0] == '':
@@ -118,72 +154,60 @@ def _write_properties_and_data(fw, section, ind, print_info):
     for data_line_i, data_line in enumerate(section.data):
         # print('-- data_line: %s' % str(data_line))
         formated_data_line = None
+        str_data_line_i = str(data_line_i)
+        data_tag = data_line[0]
         # if len(data_line) > 1:
-        if data_line[0] == "__bone__":
+        if not isinstance(data_tag, str) or data_tag not in _DATA_LINE_TAGS:
+            formated_data_line = _format_data(data_line)
+            fw("".join((ind, str_data_line_i.ljust(5, ' '), "( ", formated_data_line, " )\n")))
+        elif data_tag == "__bone__":
             formated_data_line = _format_bone(data_line, ind)
-            fw('%s%s( %s\n%s   )\n' % (ind, str(data_line_i).ljust(6, ' '), formated_data_line, ind))
-        elif data_line[0] == "__string__":
-            fw('%s%s( "%s" )\n' % (ind, str(data_line_i).ljust(5, ' '), data_line[1]))
-        elif data_line[0] == "__skin__":
-            fw('%s%s( ( %s  %s  %s )\n' % (
-                ind, str(data_line_i).ljust(6, ' '), float_to_hex_string(data_line[1][0][0]), float_to_hex_string(data_line[1][0][1]),
-                float_to_hex_string(data_line[1][0][2])))
-
-            weight_string = ""
-            for i_i, i in enumerate(data_line[1][1]):
-                if i_i == 0:
-                    weight_string = weight_string + str(i[0]).ljust(5, ' ') + float_to_hex_string(i[1])
-                else:
-                    weight_string = weight_string + "   " + str(i[0]).ljust(5, ' ') + float_to_hex_string(i[1])
-
-            clones_string = ""
-            for i_i, i in enumerate(data_line[1][2]):
-                if i_i + 1 == len(data_line[1][2]):
-                    clones_string = clones_string + str(i[0]).ljust(5, ' ') + str(i[1])
-                else:
-                    clones_string = clones_string + str(i[0]).ljust(5, ' ') + str(i[1]).ljust(7, ' ')
-
-            fw('%s%sWeights: %s%s\n' % (ind, 8 * " ", str(len(data_line[1][1])).ljust(7, ' '), weight_string))
-            fw('%s%sClones: %s%s\n' % (ind, 8 * " ", str(len(data_line[1][2])).ljust(7, ' '), clones_string))
-            fw('%s%s)\n' % (ind, 6 * " "))
-        elif data_line[0] == "__matrix__":
+            fw("".join((ind, str_data_line_i.ljust(6, ' '), "( ", formated_data_line, "\n", ind, "   )\n")))
+        elif data_tag == "__string__":
+            fw('%s%s( "%s" )\n' % (ind, str_data_line_i.ljust(5, ' '), data_line[1]))
+        elif data_tag == "__skin__":
+            fw("".join((ind, str_data_line_i.ljust(6, ' '), _format_skin(data_line, ind), "\n")))
+        elif data_tag == "__matrix__":
             # print('MATRIX - data_line: %s' % str(data_line))
-            anim_matrix = _format_matrix(data_line[1], ind, str(7 * " "))
-            fw('%s%s( %s )\n' % (ind, str(data_line_i).ljust(5, ' '), anim_matrix))
-        elif data_line[0] == "__time__":
+            anim_matrix = _format_matrix(data_line[1], ind, 7 * " ")
+            fw("".join((ind, str_data_line_i.ljust(5, ' '), "( ", anim_matrix, " )\n")))
+        elif data_tag == "__time__":
             # print('TIME - data_line: %s' % str(data_line))
-            fw('%s%s( %s )\n' % (ind, str(data_line_i).ljust(5, ' '), float_to_hex_string(data_line[1])))
-        else:
-            formated_data_line = _format_data(data_line)
-            fw('%s%s( %s )\n' % (ind, str(data_line_i).ljust(5, ' '), formated_data_line))
+            fw('%s%s( %s )\n' % (ind, str_data_line_i.ljust(5, ' '), float_to_hex_string(data_line[1])))
         if print_info:
             print('%sdata: %s' % (ind, formated_data_line))
 
+        if data_line_i % 1024 == 0:
+            buffer.flush()
+
 
-def _write_section(fw, section, ind, orig_ind, print_info):
+def _write_section(buffer, section, ind, orig_ind, print_info):
     """This function writes the nested sections. It recursively
     calls itself to write all levels in data hierarchy."""
-    fw('%s%s {\n' % (ind, section.type))
+    buffer.write('%s%s {\n' % (ind, section.type))
     if print_info:
         print('%sSEC.: "%s"' % (ind, section.type))
     in_ind = ind
     ind = ind + orig_ind
-    _write_properties_and_data(fw, section, ind, print_info)
+    _write_properties_and_data(buffer, section, ind, print_info)
     for sec in section.sections:
-        _write_section(fw, sec, ind, orig_ind, print_info)
-    fw('%s}\n' % in_ind)
+        _write_section(buffer, sec, ind, orig_ind, print_info)
+    buffer.write('%s}\n' % in_ind)
 
 
 def write_data(container, filepath, ind='    ', print_on_success=True, print_info=0):
     """This function is called from outside of this script. It takes
     data container, file path and string of indentation characters
-    and it saves all data to the file."""
+    and it saves all data to the file.
+    Data of the sections can also be lazy iterables or generators, in that case rows
+    are produced, formatted and flushed to the file in bounded chunks while writing."""
     # print_info = 0 ## Debug printouts
     orig_ind = ind
 
     # WRITE TO FILE
     file = open(filepath, mode="w", encoding="utf8", newline="\n")
-    fw = file.write
+    buffer = _WriteBuffer(file)
+    fw = buffer.write
     if print_on_success:
         lprint('I WRITTING PIX FILE to: %r', (filepath,))
 
@@ -192,14 +216,16 @@ def write_data(container, filepath, ind='    ', print_on_success=True, print_inf
             fw('%s {\n' % section.type)
             if print_info:
                 print('SEC.: "%s"' % section.type)
-            _write_properties_and_data(fw, section, ind, print_info)
+            _write_properties_and_data(buffer, section, ind, print_info)
             for sec in section.sections:
-                _write_section(fw, sec, ind, orig_ind, print_info)
+                _write_section(buffer, sec, ind, orig_ind, print_info)
             fw('}\n')
         else:
             for comment in section.props:
                 fw('%s\n' % comment[1])
+        buffer.flush()
     fw('\n')
+    buffer.flush(force=True)
     file.close()
 
-    return {'FINISHED'}
\ No newline at end of file
+    return {'FINISHED'}
@@ -18,17 +18,65 @@
 
 # Copyright (C) 2013-2017: SCS Software
 
+import math
+import numpy
+from array import array
 from collections import OrderedDict
 from io_scs_tools.utils import convert as _convert_utils
 
 
+_INDEXED_LOOKUP_MIN_SIZE = 16
+"""Minimal number of props or sections in section for which lookups are done with name to indices map.
+Smaller lists are faster to be scanned directly."""
+
+
+def _get_prop_key(prop):
+    return prop[0]
+
+
+def _get_section_key(section):
+    return section.type
+
+
+def _update_name_index(index, items, get_key):
+    """Gets up to date name to indices map of given list. If the same list only grew since
+    given index was made, only new items are added to the map, otherwise map is built from scratch.
+
+    :param index: previous index as tuple of (list, indexed length, map) or None if not yet built
+    :type index: tuple | None
+    :param items: list of props or sections to be indexed
+    :type items: list
+    :param get_key: function returning name of the item
+    :type get_key: function
+    :return: index as tuple of (list, indexed length, map)
+    :rtype: tuple
+    """
+    if index is not None and index[0] is items and index[1] <= len(items):
+        start, name_map = index[1], index[2]
+    else:
+        start, name_map = 0, {}
+
+    for i in range(start, len(items)):
+        key = get_key(items[i])
+        if key in name_map:
+            name_map[key].append(i)
+        else:
+            name_map[key] = [i]
+
+    return items, len(items), name_map
+
+
 class SectionData(object):
     """SCS Section data structure (PIX files):
     type (str)\t- Type of the Section (mandatory)\n
     props (list)\t- Properties of the Section (optional)\n
     data (list)\t- Data of the Section (optional)\n
     sections (list)\t- Other Sections within the Section (optional)
+    NOTE: name to index maps of props and sections are built lazily on first lookup
+    and extended when lists grow, so lookups in big sections don't scan lists over and over.
+    Lists are expected to be only appended to; assigning new list rebuilds the map.
     """
+    __slots__ = ("type", "props", "data", "sections", "__props_index", "__sections_index")
     _type_ = "section_data"
 
     def __init__(self, data_type):
@@ -36,12 +84,39 @@ class SectionData(object):
         self.props = []
         self.data = []
         self.sections = []
+        self.__props_index = None
+        self.__sections_index = None
+
+    def __get_props_map(self):
+        index = self.__props_index
+        if index is None or index[0] is not self.props or index[1] != len(self.props):
+            index = self.__props_index = _update_name_index(index, self.props, _get_prop_key)
+        return index[2]
+
+    def __get_sections_map(self):
+        index = self.__sections_index
+        if index is None or index[0] is not self.sections or index[1] != len(self.sections):
+            index = self.__sections_index = _update_name_index(index, self.sections, _get_section_key)
+        return index[2]
 
     def get_prop(self, prop_key):
-        for prop in self.props:
-            if prop[0] == prop_key:
-                return prop
-        return None
+        props = self.props
+        if len(props) < _INDEXED_LOOKUP_MIN_SIZE:
+            for prop in props:
+                if prop[0] == prop_key:
+                    return prop
+            return None
+
+        indices = self.__get_props_map().get(prop_key)
+        if indices is None:
+            return None
+
+        prop = props[indices[0]]
+        if prop[0] != prop_key:  # prop was replaced in place since it was indexed, rebuild the map
+            self.__props_index = None
+            return self.get_prop(prop_key)
+
+        return prop
 
     def get_section(self, key):
         """Returns firstly found section of given name.
@@ -51,10 +126,23 @@ class SectionData(object):
         :return: PIX section data
         :rtype: SectionData
         """
-        for section in self.sections:
-            if section.type == key:
-                return section
-        return None
+        sections = self.sections
+        if len(sections) < _INDEXED_LOOKUP_MIN_SIZE:
+            for section in sections:
+                if section.type == key:
+                    return section
+            return None
+
+        indices = self.__get_sections_map().get(key)
+        if indices is None:
+            return None
+
+        section = sections[indices[0]]
+        if section.type != key:  # section was replaced in place since it was indexed, rebuild the map
+            self.__sections_index = None
+            return self.get_section(key)
+
+        return section
 
     def get_sections(self, key):
         """Returns a list of sections of given name.
@@ -64,11 +152,17 @@ class SectionData(object):
         :return: list of PIX section data
         :rtype: list of SectionData
         """
-        sections = []
-        for section in self.sections:
-            if section.type == key:
-                sections.append(section)
-        return sections
+        sections = self.sections
+        if len(sections) < _INDEXED_LOOKUP_MIN_SIZE:
+            return [section for section in sections if section.type == key]
+
+        found_sections = [sections[i] for i in self.__get_sections_map().get(key, ())]
+        for section in found_sections:
+            if section.type != key:  # section was replaced in place since it was indexed, rebuild the map
+                self.__sections_index = None
+                return self.get_sections(key)
+
+        return found_sections
 
     def get_prop_value(self, prop_key):
         prop = self.get_prop(prop_key)
@@ -86,18 +180,145 @@ class SectionData(object):
         :return: True if property was found, value types matches; False otherwise
         :rtype: bool
         """
-        for prop_i, prop in enumerate(self.props):
-            if prop[0] == prop_key:
+        prop = self.get_prop(prop_key)
+        if prop is not None:
 
-                if isinstance(value, type(prop[1])):
-                    self.props[prop_i][1] = value
-                    return True
-                else:
-                    return False
+            if isinstance(value, type(prop[1])):
+                prop[1] = value
+                return True
+            else:
+                return False
 
         return False
 
 
+class StreamData(object):
+    """Typed storage of stream data rows (PIX files):
+    values (array)\t- All values of the stream in one contiguous array ('f' for floats, 'i' for integers)\n
+    row_size (int)\t- Number of values in each row\n
+    Behaves as read only sequence of rows, where each row is returned as an array slice.
+    NOTE: floats are stored in single precision, same as they are used by the game. Hexadecimal
+    values from PIX files are single precision already, but decimal values are rounded to it on parse,
+    so they can differ from values parsed into plain lists of Python floats.
+    NOTE: appending while numpy view from "as_numpy" is alive moves values into new array,
+    so the view stays valid, but it won't see appended rows.
+    NOTE: rows with finite floats out of single precision range are not appended, as they would be stored as infinity.
+    """
+    _type_ = "stream_data"
+    __typecodes = {float: "f", int: "i"}
+    __float_max = 3.4028234663852886e+38  # maximum finite single precision float
+
+    def __init__(self):
+        self.values = None
+        self.row_size = 0
+
+    def __len__(self):
+        if self.row_size == 0:
+            return 0
+        return len(self.values) // self.row_size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        row_count = len(self)
+        if index < 0:
+            index += row_count
+        if not 0 <= index < row_count:
+            raise IndexError("stream data index out of range")
+
+        start = index * self.row_size
+        return self.values[start:start + self.row_size]
+
+    def __iter__(self):
+        if self.row_size == 0:
+            return
+
+        values = self.values
+        row_size = self.row_size
+        for start in range(0, len(values), row_size):
+            yield values[start:start + row_size]
+
+    def append(self, row):
+        """Appends given row of values to the stream. First appended row defines
+        type and size of all the rows, so only rows of the same type and size can be appended later.
+
+        :param row: list of floats or list of integers
+        :type row: list[float] | list[int]
+        :return: True if row was appended; False if row doesn't fit into this stream or its values are out of stored type range
+        :rtype: bool
+        """
+        if not isinstance(row, list) or len(row) == 0:
+            return False
+
+        if self.values is None:
+            val_type = type(row[0])
+            if val_type not in self.__typecodes:
+                return False
+        elif len(row) == self.row_size:
+            val_type = float if self.values.typecode == "f" else int
+        else:
+            return False
+
+        for val in row:
+            if type(val) is not val_type:
+                return False
+
+        # min and max are quick check for all the values being in single precision range,
+        # only if they are not (or are NaN), values have to be checked one by one
+        if val_type is float and not -self.__float_max <= min(row) <= max(row) <= self.__float_max:
+            for val in row:
+                if self.__float_max < abs(val) < math.inf:
+                    return False
+
+        if self.values is None:
+            self.values = array(self.__typecodes[val_type])
+            self.row_size = len(row)
+
+        try:
+            self.values.fromlist(row)
+        except BufferError:  # array can't be resized while numpy view of it exists, so continue in a copy
+            self.values = array(self.values.typecode, self.values)
+            return self.append(row)
+        except OverflowError:
+            return False
+
+        return True
+
+    def reorder(self, order):
+        """Reorders rows of stream data in place.
+
+        :param order: indices of current rows in new order; has to include each row index exactly once
+        :type order: list[int]
+        """
+        if self.values is None:
+            return
+
+        values = array(self.values.typecode)
+        values.frombytes(self.as_numpy()[numpy.asarray(order, dtype=numpy.int64)].tobytes())
+        self.values = values
+
+    def to_list(self):
+        """Converts stream data to list of rows, where each row is list of values.
+
+        :return: list of rows
+        :rtype: list[list[float | int]]
+        """
+        return [row.tolist() for row in self]
+
+    def as_numpy(self):
+        """Gets numpy view on the stream data without copying values.
+        View is shaped as (row count, row size) and doesn't include rows appended after it was made.
+
+        :return: two dimensional numpy array sharing memory with this stream data
+        :rtype: numpy.ndarray
+        """
+        if self.values is None:
+            return numpy.empty((0, 0), dtype=numpy.float32)
+
+        return numpy.frombuffer(self.values, dtype=numpy.dtype(self.values.typecode)).reshape(-1, self.row_size)
+
+
 class UnitData(object):
     """Unit data structure (SII files):
     type (str)\t- Type of the Unit (mandatory)\n
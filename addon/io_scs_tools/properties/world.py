@@ -719,6 +719,10 @@ class GlobalSCSProps(bpy.types.PropertyGroup):
         _config_container.update_item_in_file('Import.PreservePathForExport', int(self.import_preserve_path_for_export))
         return None
 
+    def import_use_parsed_cache_update(self, context):
+        _config_container.update_item_in_file('Import.UseParsedCache', int(self.import_use_parsed_cache))
+        return None
+
     def import_pim_file_update(self, context):
         _config_container.update_item_in_file('Import.ImportPimFile', int(self.import_pim_file))
         return None
@@ -851,6 +855,14 @@ class GlobalSCSProps(bpy.types.PropertyGroup):
         _config_container.update_item_in_file('Export.SignExport', int(self.export_write_signature))
         return None
 
+    def export_optimize_vertex_cache_update(self, context):
+        _config_container.update_item_in_file('Export.OptimizeVertexCache', int(self.export_optimize_vertex_cache))
+        return None
+
+    def export_incremental_update(self, context):
+        _config_container.update_item_in_file('Export.Incremental', int(self.export_incremental))
+        return None
+
     # IMPORT OPTIONS
     import_scale = FloatProperty(
         name="Scale",
@@ -866,6 +878,13 @@ class GlobalSCSProps(bpy.types.PropertyGroup):
         default=False,
         update=import_preserve_path_for_export_update,
     )
+    import_use_parsed_cache = BoolProperty(
+        name="Cache Parsed Files",
+        description="Keep parsed PIX files in cache inside Blender user configuration directory, "
+                    "so importing of unchanged files again doesn't have to parse them anymore",
+        default=False,
+        update=import_use_parsed_cache_update,
+    )
     import_pim_file = BoolProperty(
         name="Import Model (PIM)",
         description="Import Model data from PIM file",
@@ -1080,6 +1099,21 @@ class GlobalSCSProps(bpy.types.PropertyGroup):
         default=False,
         update=export_write_signature_update,
     )
+    export_optimize_vertex_cache = BoolProperty(
+        name="Optimize Vertex Cache",
+        description="Reorder triangles and vertices of exported model pieces for better vertex cache usage in game "
+                    "(export takes longer)",
+        default=False,
+        update=export_optimize_vertex_cache_update,
+    )
+    export_incremental = BoolProperty(
+        name="Incremental Export",
+        description="Skip writing files of SCS Game Objects which exported data and files didn't change since last export; "
+                    "data of all SCS Game Objects is still gathered, only formatting and writing of files is skipped "
+                    "(state is stored in export manifest file inside export directory)",
+        default=False,
+        update=export_incremental_update,
+    )
 
     # COMMON SETTINGS - SAVED IN CONFIG
     def dump_level_update(self, context):
@@ -130,6 +130,11 @@ def draw_export_panel(layout, ignore_extra_boxes=False):
     '''
     # row = box1.row()
     # row.prop(_get_scs_globals(), 'export_anim_file', expand=True)
+    if not _get_scs_globals().export_output_type.startswith('EF'):
+        row = box1.row()
+        row.prop(_get_scs_globals(), 'export_optimize_vertex_cache')
+    row = box1.row()
+    row.prop(_get_scs_globals(), 'export_incremental')
     box2 = layout.box() if not ignore_extra_boxes else layout
     box2.prop(_get_scs_globals(), 'export_output_type')
     '''
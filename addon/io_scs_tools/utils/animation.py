@@ -95,29 +95,25 @@ def apply_euler_filter(fcv):
     if not fcv.data_path.endswith("rotation_euler"):
         return
 
-    keys = []
-
-    for k in fcv.keyframe_points:
-        keys.append(k.co.copy())
-
-    for i in range(len(keys)):
-        curr_key = keys[i]
-        prev_key = keys[i - 1] if i > 0 else None
-
-        if prev_key is None:
-            continue
-
-        th = pi
-        if abs(prev_key[1] - curr_key[1]) >= th:  # more than 180 degree jump
-            fac = pi * 2
-            if prev_key[1] > curr_key[1]:
-                while abs(curr_key[1] - prev_key[1]) >= th:
-                    curr_key[1] += fac
-            elif prev_key[1] < curr_key[1]:
-                while abs(curr_key[1] - prev_key[1]) >= th:
-                    curr_key[1] -= fac
+    # get coordinates of all keys at once as flat list of frame and value pairs
+    keys_co = [0.0] * (len(fcv.keyframe_points) * 2)
+    fcv.keyframe_points.foreach_get("co", keys_co)
+
+    th = pi
+    fac = pi * 2
+    for i in range(3, len(keys_co), 2):
+        prev_value = keys_co[i - 2]
+        curr_value = keys_co[i]
+
+        if abs(prev_value - curr_value) >= th:  # more than 180 degree jump
+            if prev_value > curr_value:
+                while abs(curr_value - prev_value) >= th:
+                    curr_value += fac
+            elif prev_value < curr_value:
+                while abs(curr_value - prev_value) >= th:
+                    curr_value -= fac
+
+            keys_co[i] = curr_value
 
     # copy keys back to curve
-    for i in range(len(keys)):
-        for x in range(2):
-            fcv.keyframe_points[i].co[x] = keys[i][x]
\ No newline at end of file
+    fcv.keyframe_points.foreach_set("co", keys_co)
\ No newline at end of file
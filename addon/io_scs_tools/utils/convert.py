@@ -27,6 +27,27 @@ from io_scs_tools.utils import math as _math_utils
 from io_scs_tools.utils import get_scs_globals as _get_scs_globals
 
 
+_FLOATS_STRUCTS = {}
+"""Cache of precompiled big endian float structures per number of floats."""
+
+_FLOAT_TYPES = frozenset((float,))
+"""Types of values which can be packed at once, anything else is converted value by value."""
+
+
+def _get_floats_struct(count):
+    """Gets precompiled structure for packing/unpacking given number of big endian floats.
+
+    :param count: number of floats
+    :type count: int
+    :return: precompiled structure
+    :rtype: struct.Struct
+    """
+    floats_struct = _FLOATS_STRUCTS.get(count)
+    if floats_struct is None:
+        floats_struct = _FLOATS_STRUCTS[count] = struct.Struct(">%if" % count)
+    return floats_struct
+
+
 def linear_to_srgb(value):
     """Converts linear color to srgb colorspace. Function can convert single float or list of floats.
     NOTE: taken from game code
@@ -145,6 +166,24 @@ def float_to_hex_string(value):
     return "Value Error"
 
 
+def floats_to_hex_strings(values):
+    """Takes a list of floats and returns them as hexadecimal numbers in string format,
+    packing all of them at once.
+    NOTE: if any of the values is not a float (eg. int, bool or numpy scalar), values are converted one by one
+    with "float_to_hex_string", so invalid values are reported and written as "Value Error" as before.
+
+    :param values: float values
+    :type values: collections.Sequence[float]
+    :return: list of hexadecimal values
+    :rtype: list[str]
+    """
+    if not _FLOAT_TYPES.issuperset(map(type, values)):
+        return [float_to_hex_string(value) for value in values]
+
+    hex_string = _get_floats_struct(len(values)).pack(*values).hex()
+    return ["&" + hex_string[i:i + 8] for i in range(0, len(hex_string), 8)]
+
+
 def string_to_number(string):
     """Converts string to number. It accepts hex interpretation or decimal.
     NOTE: no safety checks if string is really a number string
@@ -189,6 +228,30 @@ def hex_string_to_float(string):
     return "Value Error"
 
 
+def hex_strings_to_floats(strings):
+    """Takes a list of hexadecimal number strings and returns them as float numbers,
+    unpacking all of them at once.
+
+    :param strings: hexadecimal values, each of them in format "&xxxxxxxx"
+    :type strings: collections.Sequence[str]
+    :return: float values
+    :rtype: tuple[float]
+    :raises ValueError: if any of the strings is not valid hexadecimal value
+    """
+    count = len(strings)
+    hex_string = "".join(strings)
+
+    # each of the strings has to be exactly 9 characters long and start with "&"
+    if len(hex_string) != count * 9 or hex_string.count("&") != count or hex_string[::9] != "&" * count:
+        raise ValueError("Invalid hexadecimal values: %r" % (strings,))
+
+    data_bytes = bytes.fromhex(hex_string.replace("&", ""))
+    if len(data_bytes) != count * 4:
+        raise ValueError("Invalid hexadecimal values: %r" % (strings,))
+
+    return _get_floats_struct(count).unpack(data_bytes)
+
+
 def scs_to_blend_matrix():
     """Transformation matrix for space conversion from SCS coordinate system to Blender's.
 
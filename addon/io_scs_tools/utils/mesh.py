@@ -20,9 +20,12 @@
 
 import bpy
 import bmesh
+import numpy
 from collections import deque
+from itertools import chain
 from io_scs_tools.consts import Mesh as _MESH_consts
 from io_scs_tools.consts import VertexColorTools as _VCT_consts
+from io_scs_tools.internals.structure import StreamData as _StreamData
 from io_scs_tools.utils.printout import lprint
 from io_scs_tools.utils import convert as _convert
 
@@ -112,8 +115,23 @@ def make_per_face_rgb_layer(mesh, rgb_layer, layer_name):
     return {'FINISHED'}
 
 
-def make_points_to_weld_list(mesh_vertices, mesh_normals, mesh_rgb, mesh_rgba, equal_decimals_count):
-    """Makes a list of duplicated vertices indices. Each item in lists represents indices of vertices with same position and normal."""
+def make_vertices_weld_map(mesh_vertices, mesh_normals, mesh_rgb, mesh_rgba, equal_decimals_count):
+    """Makes a map of duplicated vertices. Each vertex index is mapped to the index of the first vertex
+    with same position, normal and vertex colors, rounded to given number of decimals.
+
+    :param mesh_vertices: vertices positions
+    :type mesh_vertices: list[tuple[float]]
+    :param mesh_normals: vertices normals
+    :type mesh_normals: list[tuple[float]]
+    :param mesh_rgb: RGB vertex colors per layer name
+    :type mesh_rgb: dict[str, list[tuple[float]]]
+    :param mesh_rgba: RGBA vertex colors per layer name, used only if there is no RGB vertex colors
+    :type mesh_rgba: dict[str, list[tuple[float]]]
+    :param equal_decimals_count: number of decimals which have to be equal for vertices to be welded
+    :type equal_decimals_count: int
+    :return: list of weld vertex indices indexed by vertex index; vertices without duplicates are mapped to themselves
+    :rtype: list[int]
+    """
 
     # take first present vertex color data
     if mesh_rgb:
@@ -123,26 +141,24 @@ def make_points_to_weld_list(mesh_vertices, mesh_normals, mesh_rgb, mesh_rgba, e
     else:
         mesh_final_rgba = {}
 
-    posnorm_dict_tmp = {}
+    vc_layers = [mesh_final_rgba[vc_layer_name] for vc_layer_name in mesh_final_rgba]
+
     posnorm_dict = {}
+    vertices_weld_map = []
     perc = 10 ** equal_decimals_count  # represent precision for duplicates
     for val_i, val in enumerate(mesh_vertices):
 
-        key = (str(int(val[0] * perc)) + str(int(val[1] * perc)) + str(int(val[2] * perc)) +
-               str(int(mesh_normals[val_i][0] * perc)) + str(int(mesh_normals[val_i][1] * perc)) + str(int(mesh_normals[val_i][2] * perc)))
+        normal = mesh_normals[val_i]
+        key = (int(val[0] * perc), int(val[1] * perc), int(val[2] * perc),
+               int(normal[0] * perc), int(normal[1] * perc), int(normal[2] * perc))
 
         # also include vertex colors in key if present
-        for vc_layer_name in mesh_final_rgba:
-            for col_channel in mesh_final_rgba[vc_layer_name][val_i]:
-                key += str(int(col_channel * perc))
+        for vc_layer in vc_layers:
+            key += tuple(int(col_channel * perc) for col_channel in vc_layer[val_i])
 
-        if key not in posnorm_dict_tmp:
-            posnorm_dict_tmp[key] = [val_i]
-        else:
-            posnorm_dict_tmp[key].append(val_i)
-            posnorm_dict[key] = posnorm_dict_tmp[key]
+        vertices_weld_map.append(posnorm_dict.setdefault(key, val_i))
 
-    return posnorm_dict.values()
+    return vertices_weld_map
 
 
 def set_sharp_edges(mesh, mesh_edges):
@@ -285,9 +301,9 @@ def bm_make_vertices(bm, vertices):
             vert.index = v_co_i
 
 
-def bm_make_faces(bm, faces, points_to_weld_list):
+def bm_make_faces(bm, faces, vertices_weld_map=None):
     """
-    Takes BMesh object, list of faces as vertex indices, list of vertices for elimination (smoothing).
+    Takes BMesh object, list of faces as vertex indices, map of vertices for elimination (smoothing).
     Makes faces in provided BMesh object while separating
     back faces data and creating new faces list with fixed vertices indicies.
 
@@ -295,7 +311,8 @@ def bm_make_faces(bm, faces, points_to_weld_list):
     :type bm: bmesh.types.BMesh
     :param faces: faces which should be created, tuples of vertex indices
     :type faces: list[tuple[float]]
-    :param points_to_weld_list:
+    :param vertices_weld_map: weld vertex indices indexed by vertex index (see "make_vertices_weld_map"); None for no welding
+    :type vertices_weld_map: list[int] | None
     :return: new faces with correct indices without back faces and back faces
     :rtype: tuple[list[tuple[int]], list[tuple[int]]]
     """
@@ -307,40 +324,93 @@ def bm_make_faces(bm, faces, points_to_weld_list):
     back_faces_dict = {}
 
     if faces:
+        bm.verts.ensure_lookup_table()
         for f_idx_i, f_idx in enumerate(faces):
 
-            new_f_idx = []
-            for v_idx in f_idx:
-                new_v_idx = v_idx
-                for rec in points_to_weld_list:
-                    if v_idx in rec:
-                        new_v_idx = rec[0]
-                        break
-                new_f_idx.append(new_v_idx)
+            if vertices_weld_map:
+                new_f_idx = [vertices_weld_map[v_idx] for v_idx in f_idx]
+            else:
+                new_f_idx = list(f_idx)
 
             try:
 
-                bm.verts.ensure_lookup_table()
                 bm.faces.new([bm.verts[i] for i in new_f_idx])
                 new_faces.append(f_idx)
-                new_faces_dict[str(f_idx)] = True
+                new_faces_dict[tuple(f_idx)] = True
 
             except ValueError:
                 lprint('D Face #%i vertex indices already used: %s', (f_idx_i, str(new_f_idx)))
+                _add_back_face(f_idx_i, f_idx, new_faces_dict, back_faces, back_faces_dict)
+
+    return new_faces, back_faces
+
+
+def _add_back_face(f_idx_i, f_idx, new_faces_dict, back_faces, back_faces_dict):
+    """Adds face which couldn't be created to back faces, if it's reverse face of already created face.
+    """
+    # with deque rotation we can determinate if current face
+    # is really reverse face of already existing,
+    # then we can add it as back face; otherwise we have to ignore it
+    f_idx_deque = deque(reversed(f_idx))
+    f_idx_deque.rotate(-1)
+
+    for _ in range(len(f_idx)):
+        f_idx_deque.rotate()
+        f_idx_key = tuple(f_idx_deque)
+        if f_idx_key in new_faces_dict and f_idx_key not in back_faces_dict:
+            back_faces.append(f_idx)
+            back_faces_dict[f_idx_key] = True
+            lprint('D Face #%i is a reverse face, it will be added to extra back object.', (f_idx_i,))
+
+
+def _get_face_key(face):
+    """Gets key of the face, which is the same for all faces using the same vertices in the same or reversed cyclic order.
+    """
+    if len(face) == 3:  # any order of triangle vertices is the same or reversed cyclic order
+        return frozenset(face)
+
+    first_i = face.index(min(face))
+    forward = face[first_i:] + face[:first_i]
+    backward = forward[:1] + forward[:0:-1]
+    return min(forward, backward)
 
-                # with deque rotation we can determinate if current face
-                # is really reverse face of already existing,
-                # then we can add it as back face; otherwise we have to ignore it
-                f_idx_deque = deque(reversed(f_idx))
-                f_idx_deque.rotate(-1)
 
-                for _ in range(len(f_idx)):
-                    f_idx_deque.rotate()
-                    f_idx_str = str(list(f_idx_deque))
-                    if f_idx_str in new_faces_dict and f_idx_str not in back_faces_dict:
-                        back_faces.append(f_idx)
-                        back_faces_dict[f_idx_str] = True
-                        lprint('D Face #%i is a reverse face, it will be added to extra back object.', (f_idx_i,))
+def get_faces_and_back_faces(faces, vertices_weld_map=None):
+    """
+    Takes list of faces as vertex indices and map of vertices for elimination (smoothing) and
+    separates faces which can be created in the mesh from back faces.
+    Faces are checked the same way as in "bm_make_faces": face can't be created if it uses the same vertex
+    more times or if face with the same vertices already exists. Such face is back face, if it's reverse of already created face.
+
+    :param faces: faces which should be created, tuples of vertex indices
+    :type faces: list[tuple[int]]
+    :param vertices_weld_map: weld vertex indices indexed by vertex index (see "make_vertices_weld_map"); None for no welding
+    :type vertices_weld_map: list[int] | None
+    :return: new faces with original indices without back faces and back faces
+    :rtype: tuple[list[tuple[int]], list[tuple[int]]]
+    """
+    back_faces = []
+    new_faces = []
+
+    # dictionaries only for quick search access
+    created_faces_dict = {}
+    new_faces_dict = {}
+    back_faces_dict = {}
+
+    weld_vertex = vertices_weld_map.__getitem__ if vertices_weld_map else int
+
+    for f_idx_i, f_idx in enumerate(faces):
+
+        new_f_idx = tuple(map(weld_vertex, f_idx))
+
+        face_key = _get_face_key(new_f_idx)
+        if face_key not in created_faces_dict and len(set(new_f_idx)) == len(new_f_idx):
+            created_faces_dict[face_key] = True
+            new_faces.append(f_idx)
+            new_faces_dict[tuple(f_idx)] = True
+        else:
+            lprint('D Face #%i vertex indices already used: %s', (f_idx_i, str(list(new_f_idx))))
+            _add_back_face(f_idx_i, f_idx, new_faces_dict, back_faces, back_faces_dict)
 
     return new_faces, back_faces
 
@@ -438,6 +508,183 @@ def bm_make_vc_layer(pim_version, bm, vc_layer_name, vc_layer_data, multiplier=1
                 loop[color_a_lay] = vcol_a
 
 
+def _get_rows_array(rows):
+    """Gets rows of values, eg. stream data, as two dimensional numpy array of doubles.
+    """
+    if isinstance(rows, _StreamData):
+        return rows.as_numpy().astype(numpy.float64)
+
+    return numpy.array(rows, dtype=numpy.float64).reshape(len(rows), -1)
+
+
+def _get_faces_loops_vertex_indices(faces):
+    """Gets vertex indices of all the faces as they will be ordered in mesh loops.
+    """
+    return numpy.fromiter(chain.from_iterable(faces), dtype=numpy.int32, count=sum(len(face) for face in faces))
+
+
+def _get_faces_loops_data_indices(faces, vertices_weld_map):
+    """Gets indices of vertices data for all the faces loops, which are original indices of vertices left in the mesh after welding.
+    """
+    loops_vert_indices = _get_faces_loops_vertex_indices(faces)
+    if vertices_weld_map:
+        loops_vert_indices = numpy.array(vertices_weld_map, dtype=numpy.int32)[loops_vert_indices]
+
+    return loops_vert_indices
+
+
+def make_geometry(mesh, vertices, faces, vertices_weld_map=None, back_faces=()):
+    """Fills empty mesh with vertices and faces at once. Vertices which are welded away are not created,
+    so returned vertices map has to be used to get mesh vertex index of original vertex index.
+    Back faces are created after faces, using their own copies of vertices, as they can't share vertices with faces they are reverse of.
+
+    :param mesh: empty mesh to fill
+    :type mesh: bpy.types.Mesh
+    :param vertices: vertices positions
+    :type vertices: list[tuple[float]]
+    :param faces: faces as vertex indices, which can be created (see "get_faces_and_back_faces")
+    :type faces: list[tuple[int]]
+    :param vertices_weld_map: weld vertex indices indexed by vertex index (see "make_vertices_weld_map"); None for no welding
+    :type vertices_weld_map: list[int] | None
+    :param back_faces: back faces as vertex indices, which can be created (see "get_faces_and_back_faces")
+    :type back_faces: list[tuple[int]]
+    :return: mesh vertex indices and mesh back vertex indices indexed by original vertex index;
+             welded vertices are mapped to mesh index of their weld vertex and vertices not used by back faces to -1
+    :rtype: tuple[list[int], list[int]]
+    """
+    vert_count = len(vertices)
+
+    if vertices_weld_map:
+        weld_map = numpy.array(vertices_weld_map, dtype=numpy.int32)
+    else:
+        weld_map = numpy.arange(vert_count, dtype=numpy.int32)
+
+    is_weld_vert = weld_map == numpy.arange(vert_count, dtype=numpy.int32)
+    created_vert_indices = numpy.flatnonzero(is_weld_vert)
+    vertices_map = (numpy.cumsum(is_weld_vert, dtype=numpy.int32) - 1)[weld_map]
+
+    # back vertices are created in order of original vertices, after all the other vertices
+    back_loops_data_indices = _get_faces_loops_data_indices(back_faces, vertices_weld_map)
+    created_back_vert_indices = numpy.unique(back_loops_data_indices)
+    back_vertices_map = numpy.full(vert_count, -1, dtype=numpy.int32)
+    back_vertices_map[created_back_vert_indices] = numpy.arange(len(created_back_vert_indices), dtype=numpy.int32)
+    back_vertices_map[created_back_vert_indices] += len(created_vert_indices)
+    back_vertices_map = back_vertices_map[weld_map]
+
+    loops_vert_indices = numpy.concatenate((vertices_map[_get_faces_loops_vertex_indices(faces)],
+                                            back_vertices_map[back_loops_data_indices]))
+
+    loop_totals = numpy.fromiter((len(face) for face in chain(faces, back_faces)), dtype=numpy.int32, count=len(faces) + len(back_faces))
+    loop_starts = numpy.cumsum(loop_totals, dtype=numpy.int32) - loop_totals
+
+    created_vert_indices = numpy.concatenate((created_vert_indices, created_back_vert_indices))
+    mesh.vertices.add(len(created_vert_indices))
+    mesh.vertices.foreach_set("co", _get_rows_array(vertices)[created_vert_indices].astype(numpy.float32).ravel())
+
+    mesh.loops.add(len(loops_vert_indices))
+    mesh.loops.foreach_set("vertex_index", loops_vert_indices)
+
+    mesh.polygons.add(len(loop_totals))
+    mesh.polygons.foreach_set("loop_start", loop_starts)
+    mesh.polygons.foreach_set("loop_total", loop_totals)
+
+    mesh.update(calc_edges=True)
+
+    return vertices_map.tolist(), back_vertices_map.tolist()
+
+
+def make_uv_layer(mesh, faces, uv_layer_name, uv_layer_data):
+    """Add UV Layer with per vertex UV data to the mesh. Faces has to be the same as used for mesh geometry creation,
+    as UVs are taken by original, not welded vertex indices.
+
+    :param mesh: Mesh to add UV Layer to
+    :type mesh: bpy.types.Mesh
+    :param faces: Faces as Vertex indices
+    :type faces: list
+    :param uv_layer_name: Name for the layer
+    :type uv_layer_name: str
+    :param uv_layer_data: UV Layer data indexed by vertex index
+    :type uv_layer_data: list
+    """
+    uvs = _get_rows_array(uv_layer_data)[_get_faces_loops_vertex_indices(faces)]
+    uvs[:, 1] = -uvs[:, 1] + 1  # see "change_to_scs_uv_coordinates"
+
+    uv_texture = mesh.uv_textures.new(name=uv_layer_name)
+    mesh.uv_layers[uv_texture.name].data.foreach_set("uv", uvs.astype(numpy.float32).ravel())
+
+
+def make_vc_layer(mesh, faces, vc_layer_name, vc_layer_data, multiplier=1.0, vertices_weld_map=None):
+    """Add Vertex Color Layer with per vertex color data to the mesh. If colors have alpha,
+    additional layer is created for it. Faces and weld map has to be the same as used for mesh geometry creation,
+    as colors are taken by welded vertex indices.
+
+    :param mesh: Mesh to add Vertex Color Layer to
+    :type mesh: bpy.types.Mesh
+    :param faces: Faces as Vertex indices
+    :type faces: list
+    :param vc_layer_name: Name for the layer
+    :type vc_layer_name: str
+    :param vc_layer_data: Vertex Color Layer data indexed by vertex index
+    :type vc_layer_data: list
+    :param multiplier: multiplier with which colors are divided
+    :type multiplier: float
+    :param vertices_weld_map: weld vertex indices indexed by vertex index (see "make_vertices_weld_map"); None for no welding
+    :type vertices_weld_map: list[int] | None
+    """
+    vcols = _get_rows_array(vc_layer_data)[_get_faces_loops_data_indices(faces, vertices_weld_map)] / 2 / multiplier
+
+    color_lay = mesh.vertex_colors.new(name=vc_layer_name)
+    color_lay.data.foreach_set("color", vcols[:, :3].astype(numpy.float32).ravel())
+
+    if vcols.shape[1] == 4:
+        color_a_lay = mesh.vertex_colors.new(name=vc_layer_name + _MESH_consts.vcol_a_suffix)
+        color_a_lay.data.foreach_set("color", numpy.repeat(vcols[:, 3:], 3, axis=1).astype(numpy.float32).ravel())
+
+
+def set_custom_normals(mesh, vertices_normals, transformation_matrix, vertices_map, back_vertices_map=(), vertices_weld_map=None):
+    """Sets custom split normals of all the mesh loops at once, from normals of their vertices.
+    "create_normals_split()" and "validate()" have to be called before. Loops are taken from the mesh itself,
+    as validation can remove some of the faces, so normals are taken by vertex index of each loop left in the mesh.
+    Vertices maps and weld map has to be the same as used and returned by mesh geometry creation (see "make_geometry").
+
+    :param mesh: mesh to set custom normals to
+    :type mesh: bpy.types.Mesh
+    :param vertices_normals: normals indexed by vertex index
+    :type vertices_normals: list[tuple[float]]
+    :param transformation_matrix: transformation matrix which should be applied to normals
+    :type transformation_matrix: mathutils.Matrix
+    :param vertices_map: mesh vertex indices indexed by original vertex index
+    :type vertices_map: list[int]
+    :param back_vertices_map: mesh back vertex indices indexed by original vertex index; -1 for vertices not used by back faces
+    :type back_vertices_map: list[int]
+    :param vertices_weld_map: weld vertex indices indexed by vertex index (see "make_vertices_weld_map"); None for no welding
+    :type vertices_weld_map: list[int] | None
+    """
+    matrix = numpy.array([tuple(row)[:3] for row in transformation_matrix][:3], dtype=numpy.float64)
+
+    vertices_map = numpy.array(vertices_map, dtype=numpy.int32)
+    if vertices_weld_map:
+        weld_map = numpy.array(vertices_weld_map, dtype=numpy.int32)
+    else:
+        weld_map = numpy.arange(len(vertices_map), dtype=numpy.int32)
+
+    # data index of each mesh vertex, welded vertices are using data of their weld vertex
+    verts_data_indices = numpy.zeros(len(mesh.vertices), dtype=numpy.int32)
+    verts_data_indices[vertices_map] = weld_map
+
+    if len(back_vertices_map) > 0:
+        back_vertices_map = numpy.array(back_vertices_map, dtype=numpy.int32)
+        is_back_vert = back_vertices_map >= 0
+        verts_data_indices[back_vertices_map[is_back_vert]] = weld_map[is_back_vert]
+
+    loops_vert_indices = numpy.empty(len(mesh.loops), dtype=numpy.int32)
+    mesh.loops.foreach_get("vertex_index", loops_vert_indices)
+
+    normals = _get_rows_array(vertices_normals)[verts_data_indices[loops_vert_indices]].dot(matrix.T)
+
+    mesh.normals_split_custom_set(normals.astype(numpy.float32).tolist())
+
+
 def bm_delete_loose(mesh):
     """Deletes loose vertices in the mesh.
 
@@ -464,6 +711,147 @@ def bm_delete_loose(mesh):
     bm.free()
 
 
+def get_vertices_positions(mesh, transformation_matrix):
+    """Gets positions of all the mesh vertices transformed with given matrix at once.
+    NOTE: multiplication is done the same way as in mathutils (single precision products summed in double precision),
+    so positions are bit by bit the same as if they would be calculated as "transformation_matrix * vertex.co".
+
+    :param mesh: mesh from which vertices positions should be taken
+    :type mesh: bpy.types.Mesh
+    :param transformation_matrix: 4x4 transformation matrix which should be applied to positions
+    :type transformation_matrix: mathutils.Matrix
+    :return: list of transformed positions indexed by vertex index
+    :rtype: list[tuple[float]]
+    """
+    vert_count = len(mesh.vertices)
+
+    coords = numpy.ones((vert_count, 4), dtype=numpy.float32)
+    flat_coords = numpy.empty(vert_count * 3, dtype=numpy.float32)
+    mesh.vertices.foreach_get("co", flat_coords)
+    coords[:, :3] = flat_coords.reshape(vert_count, 3)
+
+    matrix = numpy.array([tuple(row) for row in transformation_matrix], dtype=numpy.float32)
+
+    positions = numpy.zeros((vert_count, 3), dtype=numpy.float64)
+    for col in range(4):
+        positions += (coords[:, col, numpy.newaxis] * matrix[numpy.newaxis, :3, col]).astype(numpy.float64)
+
+    return [tuple(position) for position in positions.astype(numpy.float32).tolist()]
+
+
+def get_loops_vertex_indices(mesh):
+    """Gets vertex indices of all the mesh loops at once.
+
+    :param mesh: mesh from which loops vertex indices should be taken
+    :type mesh: bpy.types.Mesh
+    :return: list of vertex indices indexed by loop index
+    :rtype: list[int]
+    """
+    return _get_loops_vertex_indices_array(mesh).tolist()
+
+
+def _get_loops_vertex_indices_array(mesh):
+    vert_indices = numpy.empty(len(mesh.loops), dtype=numpy.int64)
+    mesh.loops.foreach_get("vertex_index", vert_indices)
+    return vert_indices
+
+
+def get_loops_normals(mesh):
+    """Gets split normals of all the mesh loops at once. "calc_normals_split()" has to be called before.
+
+    :param mesh: mesh from which loops normals should be taken
+    :type mesh: bpy.types.Mesh
+    :return: list of normals indexed by loop index
+    :rtype: list[list[float]]
+    """
+    normals = numpy.empty(len(mesh.loops) * 3, dtype=numpy.float32)
+    mesh.loops.foreach_get("normal", normals)
+    return normals.reshape(-1, 3).tolist()
+
+
+def get_loops_polygon_indices(mesh):
+    """Gets indices of polygons to which mesh loops belong.
+
+    :param mesh: mesh from which loops polygon indices should be taken
+    :type mesh: bpy.types.Mesh
+    :return: polygon indices as numpy array indexed by loop index
+    :rtype: numpy.ndarray
+    """
+    poly_count = len(mesh.polygons)
+    loop_starts = numpy.empty(poly_count, dtype=numpy.int64)
+    loop_totals = numpy.empty(poly_count, dtype=numpy.int64)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+
+    # polygons loops are continuous blocks, so repeating polygon indices sorted by their loop start covers all the loops
+    poly_order = numpy.argsort(loop_starts, kind="mergesort")
+    return numpy.repeat(poly_order, loop_totals[poly_order])
+
+
+def get_matching_loops(mesh, src_mesh, polygons_mapping):
+    """For each loop of the mesh finds loop of source mesh, which uses the same vertex
+    and belongs to source polygon from which loop polygon was created.
+    Usually used to get data of source mesh loops, after mesh was triangulated.
+
+    :param mesh: mesh for which loops matching loops should be found
+    :type mesh: bpy.types.Mesh
+    :param src_mesh: source mesh, which has to have the same vertices as mesh
+    :type src_mesh: bpy.types.Mesh
+    :param polygons_mapping: mapping of mesh polygon indices to source polygon indices, not mapped polygons use the same index
+    :type polygons_mapping: dict[int, int]
+    :return: source loop indices as numpy array indexed by loop index; -1 where there is no matching loop
+    :rtype: numpy.ndarray
+    """
+    vert_count = max(len(mesh.vertices), len(src_mesh.vertices))
+
+    poly_map = numpy.arange(len(mesh.polygons), dtype=numpy.int64)
+    if polygons_mapping:
+        poly_map[numpy.fromiter(polygons_mapping.keys(), dtype=numpy.int64)] = numpy.fromiter(polygons_mapping.values(), dtype=numpy.int64)
+
+    # each loop is represented by unique key made of its polygon and vertex index
+    loop_keys = poly_map[get_loops_polygon_indices(mesh)] * vert_count + _get_loops_vertex_indices_array(mesh)
+    src_loop_keys = get_loops_polygon_indices(src_mesh) * vert_count + _get_loops_vertex_indices_array(src_mesh)
+
+    src_order = numpy.argsort(src_loop_keys, kind="mergesort")
+    sorted_src_loop_keys = src_loop_keys[src_order]
+
+    if len(sorted_src_loop_keys) == 0:
+        return numpy.full(len(loop_keys), -1, dtype=numpy.int64)
+
+    positions = numpy.searchsorted(sorted_src_loop_keys, loop_keys).clip(0, len(sorted_src_loop_keys) - 1)
+    return numpy.where(sorted_src_loop_keys[positions] == loop_keys, src_order[positions], -1)
+
+
+def get_loops_uvs(mesh, uv_layer_name):
+    """Gets UVs of all the mesh loops from given UV layer at once.
+
+    :param mesh: mesh from which UVs should be taken
+    :type mesh: bpy.types.Mesh
+    :param uv_layer_name: name of UV layer
+    :type uv_layer_name: str
+    :return: UVs as numpy array of shape (loops count, 2) in double precision
+    :rtype: numpy.ndarray
+    """
+    uvs = numpy.empty(len(mesh.loops) * 2, dtype=numpy.float32)
+    mesh.uv_layers[uv_layer_name].data.foreach_get("uv", uvs)
+    return uvs.reshape(-1, 2).astype(numpy.float64)
+
+
+def get_loops_vertex_colors(mesh, vcolor_layer_name):
+    """Gets vertex colors of all the mesh loops from given vertex color layer at once.
+
+    :param mesh: mesh from which vertex colors should be taken
+    :type mesh: bpy.types.Mesh
+    :param vcolor_layer_name: name of vertex color layer
+    :type vcolor_layer_name: str
+    :return: colors as numpy array of shape (loops count, 3) in double precision
+    :rtype: numpy.ndarray
+    """
+    colors = numpy.empty(len(mesh.loops) * 3, dtype=numpy.float32)
+    mesh.vertex_colors[vcolor_layer_name].data.foreach_get("color", colors)
+    return colors.reshape(-1, 3).astype(numpy.float64)
+
+
 def bm_prepare_mesh_for_export(mesh, transformation_matrix, triangulate=False, flip=False):
     """Triangulates given mesh with bmesh module. Data are then saved back into original mesh!
 
@@ -356,6 +356,12 @@ def get_addon_installation_paths():
     return scs_installation_dirs
 
 
+def get_parsed_cache_dirpath():
+    """Returns path to the directory inside Blender user configuration directory,
+    where parsed PIX files are cached. If the directory doesn't exists it's created."""
+    return bpy.utils.user_resource('CONFIG', path=os.path.join("io_scs_tools", "parsed_pix_cache"), create=True)
+
+
 def get_shader_presets_filepath():
     """Returns a valid filepath to "shader_presets.txt" file. If the file doesn't exists,
     the empty string is returned and Shader Presets won't be available."""
@@ -0,0 +1,165 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Copyright (C) 2017: SCS Software
+
+from collections import deque
+
+CACHE_SIZE = 32
+"""Size of simulated post-transform vertex cache."""
+
+
+def calc_acmr(indices, cache_size=CACHE_SIZE):
+    """Calculates average cache miss ratio of given triangles with simulated FIFO vertex cache.
+
+    :param indices: flat list of triangles vertex indices
+    :type indices: list[int]
+    :param cache_size: number of vertices in the cache
+    :type cache_size: int
+    :return: number of cache misses per triangle; 0 for no triangles
+    :rtype: float
+    """
+    if len(indices) < 3:
+        return 0.0
+
+    cache = deque()
+    cached = set()
+    misses = 0
+    for vert_i in indices:
+        if vert_i in cached:
+            continue
+
+        misses += 1
+        cache.append(vert_i)
+        cached.add(vert_i)
+        if len(cache) > cache_size:
+            cached.remove(cache.popleft())
+
+    return misses / (len(indices) // 3)
+
+
+def optimize_triangles_order(indices, vertex_count, cache_size=CACHE_SIZE):
+    """Gets order of triangles optimized for post-transform vertex cache with Tipsify algorithm
+    (Sander, Nehab, Barczak: "Fast Triangle Reordering for Vertex Locality and Reduced Overdraw").
+
+    :param indices: flat list of triangles vertex indices
+    :type indices: list[int]
+    :param vertex_count: number of vertices used by triangles
+    :type vertex_count: int
+    :param cache_size: number of vertices in the cache
+    :type cache_size: int
+    :return: list of triangle indices in optimized order
+    :rtype: list[int]
+    """
+    triangle_count = len(indices) // 3
+
+    # vertex -> triangles adjacency, stored as one list with starting offsets per vertex
+    live_counts = [0] * vertex_count
+    for vert_i in indices:
+        live_counts[vert_i] += 1
+
+    adjacency_starts = [0] * (vertex_count + 1)
+    for vert_i in range(vertex_count):
+        adjacency_starts[vert_i + 1] = adjacency_starts[vert_i] + live_counts[vert_i]
+
+    adjacency = [0] * len(indices)
+    adjacency_fill = adjacency_starts[:-1]
+    for i, vert_i in enumerate(indices):
+        adjacency[adjacency_fill[vert_i]] = i // 3
+        adjacency_fill[vert_i] += 1
+
+    timestamps = [0] * vertex_count
+    emitted = [False] * triangle_count
+    dead_end = []
+    triangles_order = []
+
+    time = cache_size + 1
+    cursor = 0
+    fanning_vert_i = 0 if triangle_count > 0 else -1
+    while fanning_vert_i >= 0:
+
+        # emit all not yet emitted triangles around fanning vertex
+        candidates = []
+        for tri_i in adjacency[adjacency_starts[fanning_vert_i]:adjacency_starts[fanning_vert_i + 1]]:
+            if emitted[tri_i]:
+                continue
+
+            emitted[tri_i] = True
+            triangles_order.append(tri_i)
+
+            for vert_i in indices[tri_i * 3:tri_i * 3 + 3]:
+                dead_end.append(vert_i)
+                candidates.append(vert_i)
+                live_counts[vert_i] -= 1
+
+                # vertex is not in cache anymore, so it gets transformed again
+                if time - timestamps[vert_i] > cache_size:
+                    timestamps[vert_i] = time
+                    time += 1
+
+        # next fanning vertex is the one which will still be in the cache after all it's triangles are emitted
+        fanning_vert_i = -1
+        best_priority = -1
+        for vert_i in candidates:
+            if live_counts[vert_i] > 0:
+                priority = 0
+                if time - timestamps[vert_i] + 2 * live_counts[vert_i] <= cache_size:
+                    priority = time - timestamps[vert_i]
+
+                if priority > best_priority:
+                    best_priority = priority
+                    fanning_vert_i = vert_i
+
+        # no candidate, take most recently used vertex with remaining triangles or continue with next vertex in input order
+        while fanning_vert_i == -1 and dead_end:
+            vert_i = dead_end.pop()
+            if live_counts[vert_i] > 0:
+                fanning_vert_i = vert_i
+
+        while fanning_vert_i == -1 and cursor < vertex_count:
+            if live_counts[cursor] > 0:
+                fanning_vert_i = cursor
+            cursor += 1
+
+    return triangles_order
+
+
+def get_vertices_first_use_map(indices, vertex_count):
+    """Gets new vertex indices for vertices ordered by their first use in triangles.
+    Not used vertices are put at the end, keeping their original order.
+
+    :param indices: flat list of triangles vertex indices
+    :type indices: list[int]
+    :param vertex_count: number of vertices
+    :type vertex_count: int
+    :return: list of new vertex indices indexed by original vertex index
+    :rtype: list[int]
+    """
+    vertices_map = [-1] * vertex_count
+    new_vert_i = 0
+    for vert_i in indices:
+        if vertices_map[vert_i] == -1:
+            vertices_map[vert_i] = new_vert_i
+            new_vert_i += 1
+
+    for vert_i in range(vertex_count):
+        if vertices_map[vert_i] == -1:
+            vertices_map[vert_i] = new_vert_i
+            new_vert_i += 1
+
+    return vertices_map
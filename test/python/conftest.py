@@ -0,0 +1,81 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Copyright (C) 2017: SCS Software
+
+import glob
+import os
+import sys
+import types
+
+ADDON_DIRPATH = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "addon"))
+"""Path of the directory holding "io_scs_tools" package."""
+
+SAMPLE_DATA_DIRPATH = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "data"))
+"""Path of the sample data shipped with the repository."""
+
+TEST_DATA_DIRPATH = os.path.join(os.path.dirname(__file__), "data")
+"""Path of the data used by tests, like golden outputs."""
+
+PIX_EXTENSIONS = ("pim", "pit", "pic", "pip", "pis", "pia")
+"""Extensions of all PIX file types."""
+
+
+def get_sample_filepaths(*extensions):
+    """Gets sorted paths of sample data files with given extensions.
+
+    :param extensions: extensions of the files without leading dot
+    :type extensions: str
+    :return: list of file paths
+    :rtype: list[str]
+    """
+    filepaths = []
+    for ext in extensions:
+        filepaths.extend(glob.glob(os.path.join(SAMPLE_DATA_DIRPATH, "**", "*." + ext), recursive=True))
+    return sorted(filepaths)
+
+
+def get_sample_relpath(filepath):
+    """Gets path of sample data file relative to sample data directory, with forward slashes.
+
+    :param filepath: path of the sample data file
+    :type filepath: str
+    :return: relative path
+    :rtype: str
+    """
+    return os.path.relpath(filepath, SAMPLE_DATA_DIRPATH).replace(os.sep, "/")
+
+
+def __register_package(name):
+    """Registers package by its path only, so that it's "__init__" with add-on registration isn't executed.
+
+    :param name: full name of the package
+    :type name: str
+    """
+    if name in sys.modules:
+        return
+
+    package = types.ModuleType(name)
+    package.__path__ = [os.path.join(ADDON_DIRPATH, *name.split("."))]
+    sys.modules[name] = package
+
+
+# NOTE: add-on modules are tested outside of Blender UI, so packages which only
+# import and register operators, panels and whole import/export pipelines are registered by path
+for package_name in ("io_scs_tools", "io_scs_tools.exp", "io_scs_tools.imp"):
+    __register_package(package_name)
@@ -0,0 +1,77 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Copyright (C) 2017: SCS Software
+
+import struct
+import numpy
+import pytest
+
+pytest.importorskip("bpy")  # Blender as Python module, add-on modules can't be imported without it
+
+from io_scs_tools.internals.containers.writers import pix as _pix_writer
+from io_scs_tools.utils import convert as _convert_utils
+
+
+@pytest.fixture
+def error_messages(monkeypatch):
+    """Collects messages printed by conversion functions, as printing into Blender log needs registered add-on."""
+    messages = []
+    monkeypatch.setattr(_convert_utils, "lprint", lambda msg, args=(), **kwargs: messages.append(msg % args))
+    return messages
+
+
+@pytest.mark.parametrize("values", [
+    [],
+    [0.0, -0.0, 1.0, -2.5],
+    [float("inf"), float("-inf"), 3.4028234663852886e+38, 1e-45],
+    [0.1 * i for i in range(100)],
+])
+def test_floats_to_hex_strings_equals_float_to_hex_string(error_messages, values):
+    assert _convert_utils.floats_to_hex_strings(values) == [_convert_utils.float_to_hex_string(value) for value in values]
+    assert _convert_utils.floats_to_hex_strings(tuple(values)) == [_convert_utils.float_to_hex_string(value) for value in values]
+    assert not error_messages
+
+
+@pytest.mark.parametrize("invalid_value", [1, True, numpy.float32(1.0), numpy.float64(1.0), "&3f800000", None])
+def test_floats_to_hex_strings_reports_invalid_values(error_messages, invalid_value):
+    hex_strings = _convert_utils.floats_to_hex_strings([1.0, invalid_value, 2.0])
+
+    assert hex_strings == ["&3f800000", "Value Error", "&40000000"]
+    assert len(error_messages) == 1 and "is not a float" in error_messages[0]
+
+
+def test_floats_to_hex_strings_raises_on_overflow(error_messages):
+    with pytest.raises(OverflowError):
+        _convert_utils.floats_to_hex_strings([1.0, 1e39])
+
+    with pytest.raises(OverflowError):
+        _convert_utils.float_to_hex_string(1e39)
+
+
+def test_mixed_data_row_is_not_coerced(error_messages):
+    assert _pix_writer._format_data([1.0, 2, 3.0]) == "&3f800000  Value Error  &40400000"
+    assert len(error_messages) == 1
+
+
+def test_hex_strings_to_floats_round_trip():
+    values = [struct.unpack(">f", struct.pack(">f", 0.1 * i))[0] for i in range(-50, 50)]
+    assert list(_convert_utils.hex_strings_to_floats(_convert_utils.floats_to_hex_strings(values))) == values
+
+    with pytest.raises(ValueError):
+        _convert_utils.hex_strings_to_floats(["&3f800000", "3f800000"])
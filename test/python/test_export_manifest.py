@@ -0,0 +1,162 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Copyright (C) 2017: SCS Software
+
+import json
+import os
+import pytest
+from hashlib import sha1
+
+pytest.importorskip("bpy")  # Blender as Python module, add-on modules can't be imported without it
+
+from array import array
+from mathutils import Matrix, Vector
+from io_scs_tools.exp import manifest as _export_manifest
+from io_scs_tools.internals.containers import pix as _pix_container
+from io_scs_tools.internals.containers.writers import pix as _pix_writer
+from io_scs_tools.internals.structure import SectionData as _SectionData
+from io_scs_tools.internals.structure import StreamData as _StreamData
+
+
+class _Named(object):
+    """Object which "repr" is just it's name, like Blender data blocks."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return self.name
+
+
+@pytest.fixture(autouse=True)
+def no_lprint(monkeypatch):
+    """Disables printing into Blender log, as it needs registered add-on."""
+    monkeypatch.setattr(_pix_container, "lprint", lambda *args, **kwargs: None)
+    monkeypatch.setattr(_export_manifest, "lprint", lambda *args, **kwargs: None)
+    monkeypatch.setattr(_pix_writer, "lprint", lambda *args, **kwargs: None)
+
+
+def _get_hash(value):
+    hasher = sha1()
+    if not _export_manifest.__update_hash(hasher, value):
+        return None
+    return hasher.hexdigest()
+
+
+def _make_container(offset=0.0, parent="root"):
+    stream_data = _StreamData()
+    for i in range(10):
+        stream_data.append([float(i) + offset, 1.0, -1.0])
+
+    stream_section = _SectionData("Stream")
+    stream_section.props.append(("Format", "FLOAT3"))
+    stream_section.data = stream_data
+
+    piece_section = _SectionData("Piece")
+    piece_section.props.append(("Index", 0))
+    piece_section.sections.append(stream_section)
+
+    bones_section = _SectionData("Bones")
+    bones_section.data.append(("__bone__", "bone", parent, Matrix.Identity(4)))
+
+    anim_section = _SectionData("BoneChannel")
+    anim_section.data.append(("__time__", 0.5))
+    anim_section.data.append(("__matrix__", Matrix.Translation(Vector((offset, 0.0, 1.0)))))
+
+    return [piece_section, bones_section, anim_section]
+
+
+def test_same_data_has_same_hash():
+    assert _get_hash(_make_container()) is not None
+    assert _get_hash(_make_container()) == _get_hash(_make_container())
+
+
+@pytest.mark.parametrize("value, other_value", [
+    (_make_container(), _make_container(offset=1e-6)),
+    (_make_container(), _make_container(parent="other_root")),
+    ([1.0], [1]),
+    ([1], [True]),
+    ([0.0], [-0.0]),
+    ([1.0, 2.0], (1.0, 2.0)),
+    (["ab", "c"], ["a", "bc"]),
+    ([None], ["None"]),
+    (Vector((1.0, 2.0, 3.0)), [1.0, 2.0, 3.0]),
+    (Matrix.Identity(3), Matrix.Identity(4)),
+])
+def test_different_data_has_different_hash(value, other_value):
+    assert _get_hash(value) != _get_hash(other_value)
+
+
+def test_stream_data_hash_depends_on_row_size():
+    stream_data = _StreamData()
+    stream_data.values, stream_data.row_size = array("f", [1.0] * 6), 3
+    other_stream_data = _StreamData()
+    other_stream_data.values, other_stream_data.row_size = array("f", [1.0] * 6), 2
+
+    assert _get_hash(stream_data) != _get_hash(other_stream_data)
+
+
+@pytest.mark.parametrize("value", [
+    [_Named("bone")],
+    [iter([1.0, 2.0])],
+    [1.0j],
+])
+def test_unknown_data_is_not_hashed(value):
+    assert _get_hash(value) is None
+
+
+def _export_root(dirpath, container):
+    """Exports container as single file root the same way as it's done by batch export with incremental export on.
+
+    :return: True if root was skipped; False otherwise
+    :rtype: bool
+    """
+    _pix_container.begin_deferred_writes()
+    try:
+        assert _pix_container.write_data_to_file(container, os.path.join(dirpath, "root.pim"), "    ", deferrable=True)
+        skipped = _export_manifest.skip_unchanged_root(dirpath, "root", 0)
+    finally:
+        write_results = _pix_container.end_deferred_writes()
+
+    _export_manifest.finish(write_results)
+    return skipped
+
+
+def test_unchanged_root_is_skipped(tmp_path):
+    dirpath = str(tmp_path)
+
+    assert not _export_root(dirpath, _make_container())
+    written_mtime = os.stat(os.path.join(dirpath, "root.pim")).st_mtime_ns
+    with open(os.path.join(dirpath, _export_manifest.MANIFEST_FILENAME), encoding="utf8") as manifest_file:
+        assert "root" in json.load(manifest_file)["roots"]
+
+    assert _export_root(dirpath, _make_container())
+    assert os.stat(os.path.join(dirpath, "root.pim")).st_mtime_ns == written_mtime
+
+    assert not _export_root(dirpath, _make_container(offset=1.0))
+    assert _export_root(dirpath, _make_container(offset=1.0))
+
+
+def test_root_with_unknown_data_is_not_skipped(tmp_path):
+    dirpath = str(tmp_path)
+    container = _make_container()
+    container[1].data = [("__bone__", "bone", _Named("root"), Matrix.Identity(4))]
+
+    assert not _export_root(dirpath, container)
+    assert not _export_root(dirpath, container)
@@ -0,0 +1,247 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Copyright (C) 2017: SCS Software
+
+import time
+import numpy
+import pytest
+
+bpy = pytest.importorskip("bpy")  # Blender as Python module, add-on modules can't be imported without it
+
+import bmesh
+from mathutils import Matrix
+from io_scs_tools.utils import mesh as _mesh_utils
+
+_GRID_SIZE = 200
+"""Number of quads in each row and column of synthetic piece grid used for timing comparison."""
+
+_BACK_FACES_STEP = 8
+"""Every n-th triangle of synthetic piece grid gets its back face."""
+
+_TIMING_REPEATS = 3
+"""Number of times geometry is created by each path in timing comparison, the best time is taken."""
+
+
+@pytest.fixture(autouse=True)
+def mute_lprint(monkeypatch):
+    """Mutes printing of mesh utilities, as printing into Blender log needs registered add-on."""
+    monkeypatch.setattr(_mesh_utils, "lprint", lambda msg, args=(), **kwargs: None)
+
+
+@pytest.fixture
+def mesh():
+    mesh = bpy.data.meshes.new("test_mesh_utils")
+    yield mesh
+    bpy.data.meshes.remove(mesh)
+
+
+def _get_synthetic_piece(grid_size):
+    """Gets synthetic piece as triangulated grid, where each vertex on the second column is duplicated,
+    so it's welded away, and every n-th triangle has its back face.
+
+    :return: vertices, faces and weld map of vertices
+    :rtype: tuple[list[tuple[float]], list[tuple[int]], list[int]]
+    """
+    row_size = grid_size + 1
+    vertices = [(float(x), float(y), 0.0) for y in range(row_size) for x in range(row_size)]
+    weld_map = list(range(len(vertices)))
+
+    duplicates = {}
+    for y in range(row_size):
+        vertex_i = y * row_size + 1
+        duplicates[vertex_i] = len(vertices)
+        weld_map.append(vertex_i)
+        vertices.append(vertices[vertex_i])
+
+    faces = []
+    for y in range(grid_size):
+        for x in range(grid_size):
+            v0 = y * row_size + x
+            v1, v2, v3 = v0 + 1, v0 + row_size + 1, v0 + row_size
+            if x == 0:  # first column uses duplicated vertices
+                v1, v2 = duplicates[v1], duplicates[v2]
+            faces.append((v0, v1, v2))
+            faces.append((v0, v2, v3))
+
+    faces.extend([tuple(reversed(face)) for face in faces[::_BACK_FACES_STEP]])
+    return vertices, faces, weld_map
+
+
+def _get_mesh_loops_positions(mesh):
+    """Gets positions of mesh vertices used by each face, as list of tuples per face."""
+    return [tuple(tuple(mesh.vertices[vert_i].co) for vert_i in poly.vertices) for poly in mesh.polygons]
+
+
+@pytest.mark.parametrize("faces, weld_map, expected_faces, expected_back_faces", [
+    ([(0, 1, 2), (1, 3, 2)], None, [(0, 1, 2), (1, 3, 2)], []),
+    ([(0, 1, 2), (2, 1, 0), (1, 0, 2)], None, [(0, 1, 2)], [(2, 1, 0)]),  # the second reverse face is ignored
+    ([(0, 1, 2), (0, 1, 2)], None, [(0, 1, 2)], []),  # duplicated face isn't back face
+    ([(0, 1, 1), (0, 1, 2)], None, [(0, 1, 2)], []),  # face using the same vertex more times
+    ([(0, 1, 2), (3, 2, 1)], [0, 1, 2, 0], [(0, 1, 2)], []),  # reverse face only after welding isn't back face
+    ([(0, 1, 2), (0, 3, 2)], [0, 1, 2, 1], [(0, 1, 2)], []),  # duplicated face only after welding
+    ([(0, 1, 3), (0, 1, 2)], [0, 1, 2, 1], [(0, 1, 2)], []),  # welding makes vertex used more times
+    ([(0, 1, 2, 3), (0, 3, 2, 1), (3, 2, 1, 0)], None, [(0, 1, 2, 3)], [(0, 3, 2, 1)]),
+])
+def test_get_faces_and_back_faces(faces, weld_map, expected_faces, expected_back_faces):
+    assert _mesh_utils.get_faces_and_back_faces(faces, weld_map) == (expected_faces, expected_back_faces)
+
+
+def test_get_faces_and_back_faces_equals_bmesh_faces_creation():
+    vertices, faces, weld_map = _get_synthetic_piece(8)
+    faces = faces + [(1, 0, 1)] + faces[:4]
+
+    bm = bmesh.new()
+    _mesh_utils.bm_make_vertices(bm, vertices)
+    bm_faces = _mesh_utils.bm_make_faces(bm, faces, weld_map)
+    bm.free()
+
+    assert _mesh_utils.get_faces_and_back_faces(faces, weld_map) == bm_faces
+
+
+def test_make_geometry_maps(mesh):
+    vertices = [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (1.0, 1.0, 0.0), (0.0, 0.0, 0.0), (5.0, 5.0, 5.0)]
+    weld_map = [0, 1, 2, 3, 0, 5]
+    faces = [(4, 1, 2), (1, 3, 2)]
+    back_faces = [(2, 1, 4)]
+
+    vertices_map, back_vertices_map = _mesh_utils.make_geometry(mesh, vertices, faces, weld_map, back_faces)
+
+    # welded vertex isn't created and points to mesh vertex of its weld vertex
+    assert vertices_map == [0, 1, 2, 3, 0, 4]
+    # back vertices are created after all the other vertices, only for vertices used by back faces
+    assert back_vertices_map == [5, 6, 7, -1, 5, -1]
+
+    assert len(mesh.vertices) == 8
+    assert [tuple(mesh.vertices[i].co) for i in range(len(mesh.vertices))] == [vertices[i] for i in (0, 1, 2, 3, 5, 0, 1, 2)]
+    assert [tuple(poly.vertices) for poly in mesh.polygons] == [(0, 1, 2), (1, 3, 2), (7, 6, 5)]
+    assert len(mesh.edges) == 8
+    assert not mesh.validate()
+
+
+def test_make_geometry_without_welding(mesh):
+    vertices = [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (1.0, 1.0, 0.0)]
+
+    vertices_map, back_vertices_map = _mesh_utils.make_geometry(mesh, vertices, [(0, 1, 3, 2)])
+
+    assert vertices_map == [0, 1, 2, 3]
+    assert back_vertices_map == [-1, -1, -1, -1]
+    assert [tuple(poly.vertices) for poly in mesh.polygons] == [(0, 1, 3, 2)]
+
+
+def test_make_geometry_equals_bmesh_creation(mesh):
+    vertices, faces, weld_map = _get_synthetic_piece(8)
+    faces, back_faces = _mesh_utils.get_faces_and_back_faces(faces, weld_map)
+
+    _mesh_utils.make_geometry(mesh, vertices, faces, weld_map, back_faces)
+
+    bm = bmesh.new()
+    _mesh_utils.bm_make_vertices(bm, vertices)
+    _mesh_utils.bm_make_faces(bm, faces + [tuple(face) for face in back_faces], weld_map)
+    # back faces can't be created in bmesh as they would use the same vertices as their reverse faces
+    bm_positions = [tuple(tuple(vert.co) for vert in face.verts) for face in bm.faces]
+    bm.free()
+
+    assert _get_mesh_loops_positions(mesh)[:len(faces)] == bm_positions[:len(faces)]
+    assert len(mesh.polygons) == len(faces) + len(back_faces)
+    assert not mesh.validate()
+
+
+def test_set_custom_normals(mesh):
+    vertices = [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (1.0, 1.0, 0.0), (0.0, 0.0, 0.0), (2.0, 2.0, 0.0)]
+    normals = [(0.0, 0.0, 1.0), (0.0, 0.6, 0.8), (0.6, 0.0, 0.8), (0.8, 0.6, 0.0), (0.0, 0.0, -1.0), (1.0, 0.0, 0.0)]
+    weld_map = [0, 1, 2, 3, 0, 5]
+    faces = [(0, 1, 2), (1, 3, 2), (4, 4, 5)]  # the last face is degenerated, so it's removed by validation
+    back_faces = [(0, 2, 1)]
+
+    vertices_map, back_vertices_map = _mesh_utils.make_geometry(mesh, vertices, faces, weld_map, back_faces)
+    mesh.validate(clean_customdata=False)
+    assert len(mesh.polygons) == 3
+
+    _mesh_utils.set_custom_normals(mesh, normals, Matrix.Identity(4), vertices_map, back_vertices_map, weld_map)
+
+    corner_normals = numpy.empty(len(mesh.loops) * 3, dtype=numpy.float32)
+    mesh.corner_normals.foreach_get("vector", corner_normals)
+
+    # welded vertices are using normals of their weld vertex, back vertices normals of their original vertex
+    expected_normals = [normals[i] for i in (0, 1, 2, 1, 3, 2, 0, 2, 1)]
+    assert numpy.allclose(corner_normals.reshape(-1, 3), expected_normals, atol=1e-3)
+
+
+def _make_bmesh_geometry(vertices, faces, weld_map):
+    """Creates geometry the way it was created before, faces one by one with bmesh and back faces in extra mesh.
+
+    :return: number of created polygons
+    :rtype: int
+    """
+    meshes = (bpy.data.meshes.new("test_mesh_utils_bmesh"), bpy.data.meshes.new("test_mesh_utils_bmesh_back"))
+    for mesh in meshes:
+        bm = bmesh.new()
+        _mesh_utils.bm_make_vertices(bm, vertices)
+        faces = _mesh_utils.bm_make_faces(bm, faces, weld_map)[1]
+        bm.to_mesh(mesh)
+        bm.free()
+        _mesh_utils.bm_delete_loose(mesh)
+
+    polygons_count = sum(len(mesh.polygons) for mesh in meshes)
+    for mesh in meshes:
+        bpy.data.meshes.remove(mesh)
+    return polygons_count
+
+
+def _make_geometry(vertices, faces, weld_map):
+    """Creates geometry with back faces in the same mesh, the way pieces are created on import.
+
+    :return: number of created polygons
+    :rtype: int
+    """
+    mesh = bpy.data.meshes.new("test_mesh_utils_geometry")
+    faces, back_faces = _mesh_utils.get_faces_and_back_faces(faces, weld_map)
+    _mesh_utils.make_geometry(mesh, vertices, faces, weld_map, back_faces)
+
+    polygons_count = len(mesh.polygons)
+    bpy.data.meshes.remove(mesh)
+    return polygons_count
+
+
+def _get_best_time(function, *args):
+    """Gets result and the best time out of few runs of given function.
+
+    :return: result of the function and time in seconds
+    :rtype: tuple[object, float]
+    """
+    result, best_time = None, float("inf")
+    for i in range(_TIMING_REPEATS):
+        start_time = time.perf_counter()
+        result = function(*args)
+        best_time = min(best_time, time.perf_counter() - start_time)
+    return result, best_time
+
+
+def test_make_geometry_timing():
+    vertices, faces, weld_map = _get_synthetic_piece(_GRID_SIZE)
+    back_faces_count = len(_mesh_utils.get_faces_and_back_faces(faces, weld_map)[1])
+
+    bmesh_polygons_count, bmesh_time = _get_best_time(_make_bmesh_geometry, vertices, faces, weld_map)
+    polygons_count, make_geometry_time = _get_best_time(_make_geometry, vertices, faces, weld_map)
+
+    print("Geometry of %s vertices and %s faces (%s back faces): bmesh %.3f seconds, make_geometry %.3f seconds (%.2fx)." %
+          (len(vertices), len(faces), back_faces_count, bmesh_time, make_geometry_time, bmesh_time / make_geometry_time))
+
+    assert polygons_count == bmesh_polygons_count
+    assert make_geometry_time < bmesh_time
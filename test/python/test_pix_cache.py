@@ -0,0 +1,171 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Copyright (C) 2017: SCS Software
+
+import copyreg
+import os
+import pickle
+import pytest
+from conftest import get_sample_filepaths, get_sample_relpath
+
+pytest.importorskip("bpy")  # Blender as Python module, add-on modules can't be imported without it
+
+from mathutils import Matrix
+from io_scs_tools.internals.containers import pix as _pix_container
+from io_scs_tools.internals.containers import pix_cache as _pix_cache
+from io_scs_tools.internals.structure import SectionData as _SectionData
+from io_scs_tools.internals.structure import StreamData as _StreamData
+from io_scs_tools.utils import path as _path_utils
+
+
+@pytest.fixture
+def cache_dirpath(tmp_path, monkeypatch):
+    """Redirects parsed PIX cache into temporary directory and resets cache statistics."""
+    cache_dirpath = str(tmp_path / "parsed_pix_cache")
+    os.makedirs(cache_dirpath)
+    monkeypatch.setattr(_path_utils, "get_parsed_cache_dirpath", lambda: cache_dirpath)
+    _pix_cache.reset_stats()
+    return cache_dirpath
+
+
+def _make_matrix(offset):
+    return Matrix(((1.0, 0.0, 0.0, offset),
+                   (0.0, 0.0, -1.0, offset * 2),
+                   (0.0, 1.0, 0.0, -offset),
+                   (0.0, 0.0, 0.0, 1.0)))
+
+
+def _get_plain_value(value):
+    """Converts container or any of its values to plain lists, tuples and dicts, so containers can be compared."""
+    if isinstance(value, _SectionData):
+        return value.type, _get_plain_value(value.props), _get_plain_value(value.data), _get_plain_value(value.sections)
+    if isinstance(value, _StreamData):
+        return "stream", value.row_size, value.to_list()
+    if isinstance(value, Matrix):
+        return "matrix", tuple(tuple(row) for row in value)
+    if isinstance(value, dict):
+        return dict((key, _get_plain_value(val)) for key, val in value.items())
+    if isinstance(value, (list, tuple)):
+        return [_get_plain_value(item) for item in value]
+    return value
+
+
+def test_container_with_matrices_round_trip(cache_dirpath, tmp_path):
+    pix_filepath = str(tmp_path / "matrices.pia")
+    with open(pix_filepath, mode="w") as pix_file:
+        pix_file.write("Header {\n}\n")
+
+    stream_section = _SectionData("Stream")
+    stream_section.props.append(("Format", "FLOAT4x4"))
+    stream_section.data = [_make_matrix(i * 0.1) for i in range(10)]
+
+    bones_section = _SectionData("Bones")
+    bones_section.data = [{"name": "bone", "parent": "", "matrix": _make_matrix(1.5)}]
+
+    channel_section = _SectionData("BoneChannel")
+    channel_section.sections.append(stream_section)
+
+    container = [channel_section, bones_section]
+    assert _pix_cache.store(pix_filepath, container)
+
+    cached_container = _pix_cache.load(pix_filepath)
+    assert cached_container is not None
+    assert _pix_cache.get_stats() == (1, 0)
+
+    cached_matrices = cached_container[0].sections[0].data
+    assert all(isinstance(matrix, Matrix) for matrix in cached_matrices)
+    assert _get_plain_value(cached_container) == _get_plain_value(container)
+
+
+def test_matrix_pickling_is_not_changed_globally():
+    assert Matrix not in copyreg.dispatch_table
+
+    with pytest.raises(Exception):
+        pickle.dumps(_make_matrix(1.0))
+
+    assert _get_plain_value(pickle.loads(_pix_cache.dumps([_make_matrix(1.0)]))) == _get_plain_value([_make_matrix(1.0)])
+
+
+@pytest.fixture
+def warning_messages(monkeypatch):
+    """Collects messages printed by the cache, as printing into Blender log needs registered add-on."""
+    messages = []
+    monkeypatch.setattr(_pix_cache, "lprint", lambda msg, args=(), **kwargs: messages.append(msg % args))
+    return messages
+
+
+def test_failed_store_leaves_no_temporary_file(cache_dirpath, tmp_path, warning_messages):
+    pix_filepath = str(tmp_path / "unpicklable.pia")
+    with open(pix_filepath, mode="w") as pix_file:
+        pix_file.write("Header {\n}\n")
+
+    unpicklable_section = _SectionData("Header")
+    unpicklable_section.data = [lambda: None]
+
+    assert not _pix_cache.store(pix_filepath, [unpicklable_section])
+    assert os.listdir(cache_dirpath) == []
+    assert warning_messages and warning_messages[0].startswith("W ")
+
+
+def test_left_temporary_files_are_evicted(cache_dirpath, tmp_path, monkeypatch, warning_messages):
+    stale_tmp_filepath = os.path.join(cache_dirpath, "stale" + _pix_cache._CACHE_TMP_FILE_EXT)
+    with open(stale_tmp_filepath, mode="wb") as stale_tmp_file:
+        stale_tmp_file.write(b"\0" * 4096)
+    os.utime(stale_tmp_filepath, (0, 0))
+
+    pix_filepath = str(tmp_path / "small.pia")
+    with open(pix_filepath, mode="w") as pix_file:
+        pix_file.write("Header {\n}\n")
+
+    monkeypatch.setattr(_pix_cache, "_CACHE_SIZE_LIMIT", 2048)
+    assert _pix_cache.store(pix_filepath, [_SectionData("Header")])
+
+    assert not os.path.exists(stale_tmp_filepath)
+    assert _pix_cache.load(pix_filepath) is not None
+
+
+_SAMPLE_FILEPATHS = get_sample_filepaths("pis", "pia")[:8] + get_sample_filepaths("pim")[:4]
+"""Sample files to be cached, covering bone matrices of PIS and PIA as well as PIM streams and skinning."""
+
+
+@pytest.mark.parametrize("pix_filepath", _SAMPLE_FILEPATHS, ids=[get_sample_relpath(filepath) for filepath in _SAMPLE_FILEPATHS])
+def test_sample_file_is_cached(cache_dirpath, pix_filepath):
+    container = _pix_container.get_data_from_file(pix_filepath, "    ", use_cache=True)
+    assert _pix_cache.get_stats() == (0, 1)
+    assert os.listdir(cache_dirpath)
+
+    cached_container = _pix_container.get_data_from_file(pix_filepath, "    ", use_cache=True)
+    assert _pix_cache.get_stats() == (1, 1)
+    assert cached_container is not container
+
+    assert _get_plain_value(list(cached_container)) == _get_plain_value(list(container))
+
+
+def test_changed_file_is_not_loaded_from_cache(cache_dirpath, tmp_path):
+    pix_filepath = str(tmp_path / "changed.pia")
+    with open(pix_filepath, mode="w") as pix_file:
+        pix_file.write("Header {\n}\n")
+
+    assert _pix_cache.store(pix_filepath, [_SectionData("Header")])
+
+    with open(pix_filepath, mode="a") as pix_file:
+        pix_file.write("Global {\n}\n")
+
+    assert _pix_cache.load(pix_filepath) is None
+    assert _pix_cache.get_stats() == (0, 1)
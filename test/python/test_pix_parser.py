@@ -0,0 +1,94 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Copyright (C) 2017: SCS Software
+
+import os
+import time
+import pytest
+from conftest import SAMPLE_DATA_DIRPATH, PIX_EXTENSIONS, get_sample_filepaths, get_sample_relpath
+
+pytest.importorskip("bpy")  # Blender as Python module, add-on modules can't be imported without it
+
+import baseline_pix_parser as _baseline_pix_parser
+from mathutils import Matrix
+from io_scs_tools.internals.containers.parsers import pix as _pix_parser
+from io_scs_tools.internals.structure import SectionData as _SectionData
+from io_scs_tools.internals.structure import StreamData as _StreamData
+
+_BENCHMARK_FILEPATHS = [filepath for filepath in get_sample_filepaths("pim")
+                        if filepath.startswith(os.path.join(SAMPLE_DATA_DIRPATH, "sample_truck_base", ""))]
+"""PIM files of sample truck used for parsing benchmark."""
+
+_BENCHMARK_REPEATS = 3
+"""Number of times files are parsed by each parser in benchmark, the best time is taken."""
+
+
+def _get_plain_value(value):
+    """Converts container or any of its values to plain lists, tuples and dicts, so containers of both parsers can be compared."""
+    if isinstance(value, _SectionData):
+        return value.type, _get_plain_value(value.props), _get_plain_value(value.data), _get_plain_value(value.sections)
+    if isinstance(value, _StreamData):
+        return [_get_plain_value(row) for row in value.to_list()]
+    if isinstance(value, Matrix):
+        return tuple(tuple(row) for row in value)
+    if isinstance(value, dict):
+        return dict((key, _get_plain_value(val)) for key, val in value.items())
+    if isinstance(value, (list, tuple)):
+        return [_get_plain_value(item) for item in value]
+    return value
+
+
+def _get_parse_time(parser, filepaths):
+    """Gets the best time of parsing all given files with given parser module.
+
+    :return: time in seconds
+    :rtype: float
+    """
+    best_time = float("inf")
+    for i in range(_BENCHMARK_REPEATS):
+        start_time = time.perf_counter()
+        for filepath in filepaths:
+            parser.read_data(filepath, "    ")
+        best_time = min(best_time, time.perf_counter() - start_time)
+    return best_time
+
+
+_SAMPLE_FILEPATHS = get_sample_filepaths(*PIX_EXTENSIONS)
+
+
+@pytest.mark.parametrize("pix_filepath", _SAMPLE_FILEPATHS, ids=[get_sample_relpath(filepath) for filepath in _SAMPLE_FILEPATHS])
+def test_parser_equals_baseline_parser(pix_filepath):
+    container, state = _pix_parser.read_data(pix_filepath, "    ")
+    baseline_container, baseline_state = _baseline_pix_parser.read_data(pix_filepath, "    ")
+
+    assert container
+    assert _get_plain_value(container) == _get_plain_value(baseline_container)
+
+
+def test_parser_benchmark():
+    assert _BENCHMARK_FILEPATHS
+
+    size = sum(os.path.getsize(filepath) for filepath in _BENCHMARK_FILEPATHS) / 1024 / 1024
+    baseline_time = _get_parse_time(_baseline_pix_parser, _BENCHMARK_FILEPATHS)
+    parse_time = _get_parse_time(_pix_parser, _BENCHMARK_FILEPATHS)
+
+    print("Parsing of %s PIM file(s), %.2f MB: baseline parser %.3f seconds, parser %.3f seconds (%.2fx)." %
+          (len(_BENCHMARK_FILEPATHS), size, baseline_time, parse_time, baseline_time / parse_time))
+
+    assert parse_time < baseline_time
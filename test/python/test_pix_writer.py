@@ -0,0 +1,55 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Copyright (C) 2017: SCS Software
+
+import hashlib
+import json
+import os
+import pytest
+from conftest import SAMPLE_DATA_DIRPATH, TEST_DATA_DIRPATH, PIX_EXTENSIONS, get_sample_filepaths, get_sample_relpath
+
+pytest.importorskip("bpy")  # Blender as Python module, add-on modules can't be imported without it
+
+from io_scs_tools.internals.containers import pix as _pix_container
+from io_scs_tools.internals.containers.writers import pix as _pix_writer
+
+with open(os.path.join(TEST_DATA_DIRPATH, "pix_writer_golden.json"), encoding="utf8") as golden_file:
+    _GOLDEN_DIGESTS = json.load(golden_file)
+"""SHA1 digests of sample files parsed and written again by the writer before lines were built with joins and written in chunks.
+Files which parsed containers can't be written (skinned PIM and PIS) are not included."""
+
+
+def test_golden_digests_cover_sample_data():
+    sample_relpaths = set(get_sample_relpath(filepath) for filepath in get_sample_filepaths(*PIX_EXTENSIONS))
+
+    assert set(_GOLDEN_DIGESTS) <= sample_relpaths
+    assert len(_GOLDEN_DIGESTS) > 100
+
+
+@pytest.mark.parametrize("relpath", sorted(_GOLDEN_DIGESTS))
+def test_written_sample_file_is_byte_identical(relpath, tmp_path):
+    filepath = os.path.join(SAMPLE_DATA_DIRPATH, *relpath.split("/"))
+    container = _pix_container.get_data_from_file(filepath, "    ")
+    assert container
+
+    out_filepath = str(tmp_path / os.path.basename(relpath))
+    assert _pix_writer.write_data(container, out_filepath, "    ", print_on_success=False) == {'FINISHED'}
+
+    with open(out_filepath, mode="rb") as out_file:
+        assert hashlib.sha1(out_file.read()).hexdigest() == _GOLDEN_DIGESTS[relpath]
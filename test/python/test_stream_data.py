@@ -0,0 +1,88 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Copyright (C) 2017: SCS Software
+
+import pytest
+
+pytest.importorskip("bpy")  # Blender as Python module, add-on modules can't be imported without it
+
+from io_scs_tools.internals.containers.parsers import pix as _pix_parser
+from io_scs_tools.internals.containers.writers import pix as _pix_writer
+from io_scs_tools.internals.structure import StreamData as _StreamData
+from io_scs_tools.exp.pim.piece_stream import Stream as _Stream
+
+_FLOAT_MAX = 3.4028234663852886e+38
+"""Maximum finite single precision float."""
+
+
+@pytest.mark.parametrize("row", [
+    [1.0, 1e39, 0.0],
+    [-1e39, 1.0, 0.0],
+    [float("nan"), 1e39, 0.0],
+    [1.0, float("nan"), -1e300],
+])
+def test_row_out_of_single_precision_range_is_not_appended(row):
+    stream_data = _StreamData()
+    assert stream_data.append([1.0, 2.0, 3.0])
+    assert not stream_data.append(row)
+    assert stream_data.to_list() == [[1.0, 2.0, 3.0]]
+
+    empty_stream_data = _StreamData()
+    assert not empty_stream_data.append(row)
+    assert len(empty_stream_data) == 0
+
+
+@pytest.mark.parametrize("row", [
+    [_FLOAT_MAX, -_FLOAT_MAX, 0.0],
+    [float("inf"), float("-inf"), 1.0],
+])
+def test_row_in_single_precision_range_is_appended(row):
+    stream_data = _StreamData()
+    assert stream_data.append(row)
+    assert stream_data.to_list() == [row]
+
+
+def test_parsed_stream_with_overflowing_value_falls_back_to_list(tmp_path):
+    pix_filepath = str(tmp_path / "overflow.pim")
+    with open(pix_filepath, mode="w") as pix_file:
+        pix_file.write("Stream {\n"
+                       "    Format: FLOAT3\n"
+                       "    Tag: \"_POSITION\"\n"
+                       "    0( 1.5 2.5 3.5 )\n"
+                       "    1( 1.5 1.0e39 3.5 )\n"
+                       "}\n")
+
+    container, state = _pix_parser.read_data(pix_filepath, "    ")
+
+    assert container[0].data == [[1.5, 2.5, 3.5], [1.5, 1e39, 3.5]]
+
+
+def test_exported_stream_with_overflowing_value_is_not_written_as_infinity(tmp_path):
+    stream = _Stream(_Stream.Types.POSITION, 0)
+    assert stream.add_entry((1.0, 2.0, 3.0))
+    assert stream.add_entry((1.0, 1e39, 3.0))
+    assert stream.add_entry((4.0, 5.0, 6.0))
+    stream.reorder_entries([2, 0, 1])
+
+    section = stream.get_as_section()
+    assert stream.get_size() == 3
+    assert section.data == [[4.0, 5.0, 6.0], [1.0, 2.0, 3.0], [1.0, 1e39, 3.0]]
+
+    with pytest.raises(OverflowError):
+        _pix_writer.write_data([section], str(tmp_path / "overflow.pim"), "    ", print_on_success=False)
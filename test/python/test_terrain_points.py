@@ -0,0 +1,161 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Copyright (C) 2017: SCS Software
+
+import math
+import random
+import time
+import numpy
+from io_scs_tools.consts import PrefabLocators as _PL_consts
+from io_scs_tools.exp.transition_structs.terrain_points import TerrainPntsTrans
+
+_POINTS_COUNT = 100000
+"""Number of synthetic terrain points."""
+
+_LINEAR_POINTS_COUNT = 5000
+"""Number of synthetic terrain points used for timing comparison with linear deduplication."""
+
+
+def _get_synthetic_points():
+    """Gets synthetic terrain points of road like strips per variant and node, with lots of near duplicates,
+    offsets right around minimal distance and few not finite positions.
+
+    :return: list of (variant index, node index, position, normal)
+    :rtype: list[(int, int, tuple, tuple)]
+    """
+    rnd = random.Random(5)
+    min_distance = _PL_consts.TERRAIN_POINTS_MIN_DISTANCE
+    offsets = (0.0, 0.0, 0.004, -0.004, min_distance * 0.999, min_distance, min_distance * 1.001, -min_distance)
+
+    points = []
+    for i in range(_POINTS_COUNT):
+        base_i = rnd.randrange(1000)
+        position = (base_i * 0.05 + rnd.choice(offsets),
+                    (base_i % 7) * 0.05 + rnd.choice(offsets),
+                    rnd.choice((0.0, 0.0, 0.005, -0.0001)))
+        points.append((rnd.randrange(-1, 3), rnd.randrange(5), position, (0.0, 0.0, 1.0)))
+
+    for i, value in enumerate((float("nan"), float("inf"), float("-inf"), float("nan"))):
+        points.insert(i * 997, (0, 0, (value, 0.0, 0.0), (0.0, 0.0, 1.0)))
+
+    return points
+
+
+_POINTS = _get_synthetic_points()
+
+
+def _add_points(terrain_points, points):
+    for variant_i, node_i, position, normal in points:
+        terrain_points.add(variant_i, node_i, position, normal)
+
+
+def _get_stored_positions(terrain_points):
+    """Gets stored positions per (variant index, node index), with not finite values as strings, so they can be compared."""
+    stored_positions = {}
+    for node_i in range(5):
+        for variant_i, entries in terrain_points.get(node_i).items():
+            stored_positions[(variant_i, node_i)] = [repr(entry.position) for entry in entries]
+    return stored_positions
+
+
+def _get_linear_stored_positions(points):
+    """Deduplicates points the same way as previous linear implementation, checking each point against all the points
+    already stored for the same variant and node, just with distances computed with numpy.
+    """
+    stored = {}
+    for variant_i, node_i, position, normal in points:
+        key = (variant_i, node_i)
+        if key not in stored:
+            stored[key] = ([], numpy.empty((0, 3)))
+
+        positions, positions_array = stored[key]
+        if len(positions) > 0:
+            with numpy.errstate(invalid="ignore", over="ignore"):
+                deltas = positions_array[:len(positions)] - position
+                distances = numpy.sqrt(deltas[:, 0] ** 2 + deltas[:, 1] ** 2 + deltas[:, 2] ** 2)
+            if numpy.any(distances < _PL_consts.TERRAIN_POINTS_MIN_DISTANCE):
+                continue
+
+        if len(positions) == len(positions_array):
+            positions_array = numpy.resize(positions_array, (len(positions_array) * 2 + 16, 3))
+            stored[key] = (positions, positions_array)
+
+        positions_array[len(positions)] = position
+        positions.append(position)
+
+    return dict((key, [repr(position) for position in positions]) for key, (positions, positions_array) in stored.items())
+
+
+class _LinearTerrainPntsTrans:
+    """Terrain points storage with linear deduplication of previous implementation."""
+
+    def __init__(self):
+        self.storage = {}
+
+    def add(self, variant_index, node_index, position, normal):
+        entries = self.storage.setdefault((variant_index, node_index), [])
+        tp_entry = TerrainPntsTrans.Entry(position, normal)
+        if tp_entry not in entries:
+            entries.append(tp_entry)
+
+    def get(self, node_index):
+        return dict((variant_i, entries) for (variant_i, node_i), entries in self.storage.items() if node_i == node_index)
+
+
+def test_grid_dedup_equals_linear_dedup():
+    terrain_points = TerrainPntsTrans()
+
+    start_time = time.perf_counter()
+    _add_points(terrain_points, _POINTS)
+    grid_time = time.perf_counter() - start_time
+
+    stored_positions = _get_stored_positions(terrain_points)
+    stored_count = sum(len(positions) for positions in stored_positions.values())
+    print("Grid deduplication of %s points: %.3f seconds, %s points stored." % (len(_POINTS), grid_time, stored_count))
+
+    assert 0 < stored_count < len(_POINTS)
+    assert stored_positions == _get_linear_stored_positions(_POINTS)
+    assert grid_time < 30.0  # linear deduplication took more than 10 minutes for this amount of points
+
+
+def test_grid_dedup_keeps_not_finite_points():
+    terrain_points = TerrainPntsTrans()
+    _add_points(terrain_points, _POINTS[:1000])
+
+    positions = [entry.position for entry in terrain_points.get(0)[0]]
+    assert sum(1 for position in positions if not all(math.isfinite(value) for value in position)) == 2
+
+
+def test_grid_dedup_is_faster_than_linear_dedup():
+    points = _POINTS[:_LINEAR_POINTS_COUNT]
+
+    linear_terrain_points = _LinearTerrainPntsTrans()
+    start_time = time.perf_counter()
+    _add_points(linear_terrain_points, points)
+    linear_time = time.perf_counter() - start_time
+
+    terrain_points = TerrainPntsTrans()
+    start_time = time.perf_counter()
+    _add_points(terrain_points, points)
+    grid_time = time.perf_counter() - start_time
+
+    print("Deduplication of %s points: linear %.3f seconds, grid %.3f seconds." % (len(points), linear_time, grid_time))
+
+    assert _get_stored_positions(terrain_points) == _get_stored_positions(linear_terrain_points)
+    assert grid_time < linear_time
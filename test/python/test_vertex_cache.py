@@ -0,0 +1,228 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Copyright (C) 2017: SCS Software
+
+import math
+import random
+import pytest
+from conftest import get_sample_filepaths, get_sample_relpath
+
+pytest.importorskip("bpy")  # Blender as Python module, add-on modules can't be imported without it
+
+from io_scs_tools.exp.pim import piece as _piece_module
+from io_scs_tools.exp.pim.piece import Piece
+from io_scs_tools.exp.pim.skin_stream import SkinStream
+from io_scs_tools.internals.containers import pix as _pix_container
+from io_scs_tools.utils import vertex_cache as _vertex_cache_utils
+
+
+class _Material:
+    """Material of exported piece, only index is needed for piece section."""
+
+    @staticmethod
+    def get_index():
+        return 0
+
+
+def _get_sample_pieces():
+    """Gets piece sections of all sample PIM files.
+
+    :return: list of (piece id, piece section)
+    :rtype: list[(str, io_scs_tools.internals.structure.SectionData)]
+    """
+    pieces = []
+    for filepath in get_sample_filepaths("pim"):
+        for section in _pix_container.get_data_from_file(filepath, "    "):
+            if section.type == "Piece":
+                pieces.append((get_sample_relpath(filepath) + ":" + str(section.get_prop_value("Index")), section))
+    return pieces
+
+
+_SAMPLE_PIECES = _get_sample_pieces()
+
+
+def _get_triangles_indices(piece_section):
+    return [vert_i for triangle in piece_section.get_section("Triangles").data for vert_i in triangle]
+
+
+def _get_stream_rows(piece_section, tag):
+    for stream_section in piece_section.get_sections("Stream"):
+        if stream_section.get_prop_value("Tag") == tag:
+            return [tuple(row) for row in stream_section.data]
+    return None
+
+
+def _make_piece(piece_index, piece_section):
+    """Makes exported piece from imported piece section, with the same vertices and triangles."""
+    piece = Piece(piece_index, _Material())
+
+    positions = _get_stream_rows(piece_section, "_POSITION")
+    normals = _get_stream_rows(piece_section, "_NORMAL")
+    uvs = _get_stream_rows(piece_section, "_UV0") or [(0.0, 0.0)] * len(positions)
+    rgbas = _get_stream_rows(piece_section, "_RGBA") or [(0.5, 0.5, 0.5, 1.0)] * len(positions)
+
+    for vert_i in range(len(positions)):
+        assert piece.add_vertex(vert_i, positions[vert_i], normals[vert_i], [uvs[vert_i]], [[]], rgbas[vert_i], None) == vert_i
+
+    for triangle in piece_section.get_section("Triangles").data:
+        assert piece.add_triangle(tuple(triangle))
+
+    return piece
+
+
+def _get_triangles_positions(piece_section):
+    """Gets triangles as tuples of their vertex positions, which doesn't depend on order of vertices."""
+    positions = _get_stream_rows(piece_section, "_POSITION")
+    indices = _get_triangles_indices(piece_section)
+    return [tuple(positions[vert_i] for vert_i in indices[i:i + 3]) for i in range(0, len(indices), 3)]
+
+
+@pytest.fixture(autouse=True)
+def no_printouts(monkeypatch):
+    """Avoids printouts of pieces, which need SCS globals of registered add-on."""
+    monkeypatch.setattr(_piece_module, "lprint", lambda *args, **kwargs: None)
+
+
+def test_sample_pieces_found():
+    assert len(_SAMPLE_PIECES) > 100
+
+
+@pytest.mark.parametrize("piece_section", [section for piece_id, section in _SAMPLE_PIECES],
+                         ids=[piece_id for piece_id, section in _SAMPLE_PIECES])
+def test_optimized_order_is_triangles_permutation(piece_section):
+    indices = _get_triangles_indices(piece_section)
+    vertex_count = piece_section.get_prop_value("VertexCount")
+
+    triangles_order = _vertex_cache_utils.optimize_triangles_order(indices, vertex_count)
+    assert sorted(triangles_order) == list(range(len(indices) // 3))
+
+    optimized_indices = [vert_i for tri_i in triangles_order for vert_i in indices[tri_i * 3:tri_i * 3 + 3]]
+    vertices_map = _vertex_cache_utils.get_vertices_first_use_map(optimized_indices, vertex_count)
+    assert sorted(vertices_map) == list(range(vertex_count))
+
+    # used vertices get new indices in order of their first use
+    first_used = []
+    for vert_i in optimized_indices:
+        if vertices_map[vert_i] == len(first_used):
+            first_used.append(vert_i)
+    assert len(first_used) == len(set(indices))
+
+
+@pytest.mark.parametrize("piece_section", [section for piece_id, section in _SAMPLE_PIECES],
+                         ids=[piece_id for piece_id, section in _SAMPLE_PIECES])
+def test_optimized_piece_keeps_geometry_and_acmr_does_not_get_worse(piece_section):
+    piece = _make_piece(0, piece_section)
+
+    stream_tags = ("_POSITION", "_NORMAL", "_UV0", "_RGBA")
+    section = piece.get_as_section()
+    vertices = list(zip(*[_get_stream_rows(section, tag) for tag in stream_tags]))
+    triangles_positions = _get_triangles_positions(section)
+    acmr = _vertex_cache_utils.calc_acmr(_get_triangles_indices(section))
+
+    vertices_map = piece.optimize_vertex_cache()
+
+    optimized_section = piece.get_as_section()
+    optimized_acmr = _vertex_cache_utils.calc_acmr(_get_triangles_indices(optimized_section))
+
+    assert optimized_acmr <= acmr
+    if vertices_map is None:
+        assert optimized_acmr == acmr
+    else:
+        # streams are reordered together, so every vertex keeps all of its data
+        optimized_vertices = list(zip(*[_get_stream_rows(optimized_section, tag) for tag in stream_tags]))
+        assert [optimized_vertices[vertices_map[vert_i]] for vert_i in range(len(vertices))] == vertices
+
+    # the same triangles with the same winding, only in different order
+    assert sorted(_get_triangles_positions(optimized_section)) == sorted(triangles_positions)
+
+
+def test_skin_stream_remapping_stays_consistent():
+    piece_sections = [section for piece_id, section in _SAMPLE_PIECES[:6]]
+    pieces = [_make_piece(piece_i, section) for piece_i, section in enumerate(piece_sections)]
+
+    # skin each vertex of all pieces, so that entries share clones across pieces
+    skin_stream = SkinStream(SkinStream.Types.POSITION)
+    for piece_i, piece_section in enumerate(piece_sections):
+        for vert_i, position in enumerate(_get_stream_rows(piece_section, "_POSITION")):
+            bone_weights = {vert_i % 3: 1.0, 3: 0.5}
+            skin_stream.add_entry(SkinStream.Entry(piece_i, vert_i, position, bone_weights, 1.5))
+
+    skin_section = skin_stream.get_as_section()
+    total_clone_count = skin_section.get_prop_value("TotalCloneCount")
+
+    remapped_pieces_count = 0
+    for piece in pieces:
+        vertices_map = piece.optimize_vertex_cache()
+        if vertices_map:
+            skin_stream.remap_piece_vertices(piece.get_index(), vertices_map)
+            remapped_pieces_count += 1
+    assert remapped_pieces_count > 0
+
+    pieces_positions = [_get_stream_rows(piece.get_as_section(), "_POSITION") for piece in pieces]
+
+    skin_section = skin_stream.get_as_section()
+    assert skin_section.get_prop_value("TotalCloneCount") == total_clone_count
+
+    clones_count = 0
+    for data_tag, (position, weights, clones) in skin_section.data:
+        for piece_i, vert_i in clones:
+            assert pieces_positions[piece_i][vert_i] == tuple(position)
+            clones_count += 1
+
+    assert clones_count == total_clone_count
+
+
+_QUANTIZE_SPECIAL_VALUES = [0.0, -0.0, 1e-5, -1e-5, 0.00004999, -0.00004999, 0.00005, -0.00005, 0.00015, 0.00025,
+                            0.12345, -0.12345, 0.12355, 1.00005, 2.5e-5, 1e15, -1e15, 1e30, -1e30,
+                            float("nan"), float("inf"), float("-inf")]
+"""Values which quantization can't be done with simple rounding: halves, negative zeros, huge and not finite values."""
+
+
+def _get_quantize_values():
+    rnd = random.Random(15)
+    values = list(_QUANTIZE_SPECIAL_VALUES)
+    values.extend(rnd.uniform(-2.0, 2.0) for i in range(5000))
+    values.extend(rnd.randint(-30000, 30000) / 10000.0 + 0.00005 for i in range(2000))
+    values.extend(rnd.randint(-30000, 30000) / 20000.0 for i in range(2000))
+    return values
+
+
+def test_quantize_values_equals_quantize_value():
+    values = _get_quantize_values()
+    assert Piece.quantize_values(values) == [Piece.quantize_value(value) for value in values]
+
+
+def test_quantize_value_equal_only_for_equally_formatted_values():
+    values = _get_quantize_values()
+    values.extend(float("%.4f" % value) for value in values[:3000] if math.isfinite(value))
+
+    quantized_per_formatted = {}
+    formatted_per_quantized = {}
+    for value, quantized in zip(values, Piece.quantize_values(values)):
+        formatted = "%.4f" % value
+        assert quantized_per_formatted.setdefault(formatted, quantized) == quantized
+        assert formatted_per_quantized.setdefault(quantized, formatted) == formatted
+
+
+def test_quantize_value_types():
+    assert Piece.quantize_value(0.12344) == 1234
+    assert Piece.quantize_value(-0.00001) == "-0"
+    assert Piece.quantize_value(0.0) == 0
+    assert Piece.quantize_value(float("nan")) == "nan"
+    assert Piece.quantize_values([float("inf"), 1.5]) == ["inf", 15000]